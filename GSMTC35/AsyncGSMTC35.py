@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Asyncio front-end of the GSM TC35 library: Every public function of GSMTC35
+  can be awaited from an asyncio event loop without blocking it.
+
+  Each instance owns a dedicated worker thread (only one function is executed
+  at a time on the serial port of a module) so that one event loop can drive
+  multiple GSM modules and other asyncio services (HTTP handlers, ...).
+
+  Note: This is not an asyncio serial transport, there is one thread per GSM
+        module (the serial port is read by the blocking GSMTC35 functions).
+
+  Example of use:
+  '''
+  import asyncio
+  from GSMTC35.AsyncGSMTC35 import AsyncGSMTC35
+
+  async def main():
+    gsm = AsyncGSMTC35()
+    if await gsm.setup(_port="COM3"):
+      print(await gsm.getSignalStrength())
+      await gsm.sendSMS("+33601020304", "Hello")
+      await gsm.close()
+    gsm.shutdown()
+
+  asyncio.run(main())
+  '''
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.7+"
+__version__ = "1.0 (2019/11/09)"
+__status__ = "Usable for any project"
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+  from .GSMTC35 import GSMTC35
+  from .GSMTC35Wrapper import GSMTC35Wrapper
+except ImportError:
+  from GSMTC35 import GSMTC35
+  from GSMTC35Wrapper import GSMTC35Wrapper
+
+class AsyncGSMTC35(GSMTC35Wrapper):
+  """Asyncio GSM TC35 class
+
+  All public functions of GSMTC35 are available with the same parameters and
+  results but must be awaited (example: 'await gsm.getIMEI()').
+  They are executed by a worker thread dedicated to this GSM module.
+  Generator functions give a list read by the worker thread (example:
+  'await gsm.getNewSMS(waiting_time_sec=10)'), the event loop never reads the serial port.
+  Enums (eSMS, eCall, ...) are directly available (example: 'AsyncGSMTC35.eSMS').
+  """
+  def __init__(self, gsm=None):
+    """Initialize the asyncio GSM module class
+
+    Keyword arguments:
+      gsm -- (GSMTC35, optional) Already created GSMTC35 instance to use (must not be used outside of this class anymore)
+    """
+    self.__executor = ThreadPoolExecutor(max_workers=1)
+    GSMTC35Wrapper.__init__(self, gsm if gsm is not None else GSMTC35(), self.__executor)
+
+  def _wrapFunction(self, name, function):
+    """Get awaitable version of GSMTC35 public function {name}"""
+    @functools.wraps(function)
+    async def awaitableFunction(*args, **kwargs):
+      return await self.run(function, *args, **kwargs)
+
+    return awaitableFunction
+
+  async def run(self, function, *args, **kwargs):
+    """Execute any function using the GSM module without blocking the event loop
+
+    Note: Functions are executed one after the other (in order of call) for
+          each GSM module
+
+    Keyword arguments:
+      function -- (callable) Function to execute (blocking function using the GSMTC35 instance)
+      args, kwargs -- Parameters of {function}
+
+    return: (any) Result of {function}
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
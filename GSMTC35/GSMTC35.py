@@ -20,6 +20,8 @@
     - Get last call duration
     - Check if module is alive
     - Get IDs (manufacturer, model, revision, IMEI, IMSI)
+    - Get multiple information (IDs, operator, signal strength) with only one request
+    - Keep IDs, operators list and phonebook restrictions in cache
     - Set module to manufacturer state
     - Switch off
     - Reboot
@@ -32,6 +34,7 @@
     - Get accumulated call meter and accumulated call meter max (in home units)
     - Get temperature status
     - Change the baudrate mode of the GSM module
+    - Call handlers on unsolicited results (incoming call, new SMS, alarm, temperature, ...)
 """
 __author__ = 'Quentin Comte-Gaz'
 __email__ = "quentin@comte-gaz.com"
@@ -44,11 +47,20 @@ __status__ = "Usable for any project"
 import binascii
 import serial, serial.tools.list_ports
 import time, sys, getopt
+import select
 import logging
+import threading
+import collections
+import concurrent.futures
+import queue
 import datetime
-from math import ceil
 from random import randint
 
+try:
+  from . import pdu
+except ImportError:
+  import pdu
+
 class GSMTC35:
   """GSM TC35 class
 
@@ -65,6 +77,8 @@ class GSMTC35:
   __RETURN_OK = "OK"
   __RETURN_ERROR = "ERROR"
   __CTRL_Z = "\x1a"
+  __ESCAPE = "\x1b"
+  __PROMPT = ">"
   __DATE_FORMAT = "%y/%m/%d,%H:%M:%S"
 
   class eRequiredPin:
@@ -81,6 +95,11 @@ class GSMTC35:
     SENT_SMS = "STO SENT"
     ALL_SMS = "ALL"
 
+  class __eSmsFormat:
+    UNKNOWN = ""
+    PDU = "0"
+    TEXT = "1"
+
   class __eSmsPdu:
     UNREAD_SMS = "0"
     READ_SMS = "1"
@@ -232,6 +251,53 @@ class GSMTC35:
 
     return "UNDEFINED"
 
+  class eUnsolicitedResult:
+    RING = "RING" # Incoming call
+    CALLER_ID = "+CLIP" # Phone number of incoming call
+    NEW_SMS_INDICATION = "+CMTI" # New SMS stored (with storage index)
+    NEW_SMS = "+CMT" # New SMS directly sent to the application (PDU in the next line)
+    ALARM = "+CALA" # Alarm of the internal clock
+    TEMPERATURE = "^SCTM" # Temperature warning
+    STATUS_REPORT = "+CDS" # SMS status report (PDU in the next line in PDU mode)
+
+  # Unsolicited results sent with an additional line of data
+  __MULTILINE_UNSOLICITED_RESULTS = (eUnsolicitedResult.NEW_SMS,)
+  # Unsolicited results sent with an additional line of data in PDU mode only
+  __PDU_MULTILINE_UNSOLICITED_RESULTS = (eUnsolicitedResult.STATUS_REPORT,)
+  # Final results of a command (the command is not in progress anymore)
+  __FINAL_RESULTS = ("OK", "ERROR", "+CME ERROR", "+CMS ERROR")
+  __UNSOLICITED_RESULTS = (eUnsolicitedResult.RING, eUnsolicitedResult.CALLER_ID,
+                           eUnsolicitedResult.NEW_SMS_INDICATION, eUnsolicitedResult.NEW_SMS,
+                           eUnsolicitedResult.ALARM, eUnsolicitedResult.TEMPERATURE,
+                           eUnsolicitedResult.STATUS_REPORT)
+
+  class eSmsSendStatus:
+    SENT = "SENT" # All parts accepted by the GSM module
+    NOT_SENT = "NOT_SENT" # Nothing sent for sure (refused by the GSM module before any part was accepted)
+    UNKNOWN = "UNKNOWN" # Failed once a part may have been sent (sending it again may send it twice)
+
+  class eInformation:
+    MANUFACTURER_ID = "manufacturer_id"
+    MODEL_ID = "model_id"
+    REVISION_ID = "revision_id"
+    IMEI = "imei"
+    IMSI = "imsi"
+    OPERATOR_NAME = "operator_name"
+    SIGNAL_STRENGTH = "signal_strength"
+
+  # Command (without "AT+") and answer prefix (empty if the answer has no prefix) of each information
+  __INFORMATION_COMMANDS = collections.OrderedDict([
+    (eInformation.MANUFACTURER_ID, ("CGMI", "")),
+    (eInformation.MODEL_ID, ("CGMM", "")),
+    (eInformation.REVISION_ID, ("CGMR", "")),
+    (eInformation.IMEI, ("CGSN", "")),
+    (eInformation.IMSI, ("CIMI", "")),
+    (eInformation.OPERATOR_NAME, ("COPS=3,0;+COPS?", "+COPS: ")),
+    (eInformation.SIGNAL_STRENGTH, ("CSQ", "+CSQ: "))])
+  # Information that can be kept in cache (see setCacheTimeToLive())
+  __IDENTIFICATION_INFORMATION = (eInformation.MANUFACTURER_ID, eInformation.MODEL_ID,
+                                  eInformation.REVISION_ID, eInformation.IMEI, eInformation.IMSI)
+
   ############################ STANDALONE FUNCTIONS ############################
   @staticmethod
   def changeBaudrateMode(old_baudrate, new_baudrate, port, pin="", puk="", pin2="", puk2="",
@@ -274,13 +340,31 @@ class GSMTC35:
     self.__initialized = False
     self.__serial = serial.Serial()
     self.__timeout_sec = 0
+    self.__rx_buffer = bytearray()
+    self.__lock = threading.RLock()
+    self.__current_cmd = ""
+    self.__unsolicited_result_handlers = {}
+    self.__pending_unsolicited_result = None
+    self.__unsolicited_result_listener = None
+    self.__unsolicited_result_listener_stop = threading.Event()
+    self.__new_sms = collections.deque()
+    self.__sms_format = GSMTC35.__eSmsFormat.UNKNOWN
+    self.__pdu_session = False
+    self.__selected_phonebook = GSMTC35.ePhonebookType.CURRENT
+    self.__cache = {}
+    self.__cache_time_to_live_sec = 0
+    self.__multipart_references = pdu.MultipartReferenceCounter()
+    self.__last_sms_part_time = None
+    self.__sms_send_queue = None
+    self.__sms_send_queue_worker = None
+    self.__sms_send_queue_lock = threading.Lock()
 
 
   ################################### SETUP ####################################
   def setup(self, _port, _pin="", _puk="", _pin2="", _puk2="",
             _baudrate=115200, _parity=serial.PARITY_NONE,
             _stopbits=serial.STOPBITS_ONE, _bytesize=serial.EIGHTBITS,
-            _timeout_sec=2):
+            _timeout_sec=2, _pdu_session=False):
     """Initialize the class (can be launched multiple time if setup changed or module crashed)
 
     Keyword arguments:
@@ -294,16 +378,22 @@ class GSMTC35:
       _stopbits -- (pySerial stop bits, optional) Serial connection stop bits (STOPBITS_ONE, STOPBITS_ONE_POINT_FIVE, STOPBITS_TWO)
       _bytesize -- (pySerial byte size, optional) Serial connection byte size (FIVEBITS, SIXBITS, SEVENBITS, EIGHTBITS)
       _timeout_sec -- (int, optional) Default timeout in sec for GSM module to answer commands
+      _pdu_session -- (bool, optional) Keep the module in PDU mode during all the session (SMS 'text mode' will never be used)
 
     return: (bool) Module initialized
     """
     # Close potential previous GSM session
     self.__timeout_sec = _timeout_sec
+    self.__pdu_session = _pdu_session
     try:
       self.close()
     except Exception:
       pass
 
+    # Module or SIM may have changed since last session
+    self.invalidateCache()
+    self.__selected_phonebook = GSMTC35.ePhonebookType.CURRENT
+
     # Create new GSM session
     try:
       self.__serial = serial.Serial(
@@ -388,8 +478,13 @@ class GSMTC35:
       #Disable asynchronous triggers (SMS, calls, temperature)
       self.__disableAsynchronousTriggers()
 
-      # Set to text mode
-      if not self.__sendCmdAndCheckResult(GSMTC35.__NORMAL_AT+"CMGF=1"):
+      # Set to text mode (or PDU mode if only PDU mode will be used)
+      self.__sms_format = GSMTC35.__eSmsFormat.UNKNOWN
+      if self.__pdu_session:
+        if not self.__setSmsFormat(GSMTC35.__eSmsFormat.PDU):
+          logging.error("Impossible to set module to PDU mode (CMGF command)")
+          is_init = False
+      elif not self.__setSmsFormat(GSMTC35.__eSmsFormat.TEXT):
         logging.error("Impossible to set module to text mode (CMGF command)")
         is_init = False
       # Select fixed baudrate communication
@@ -409,6 +504,16 @@ class GSMTC35:
 
   def close(self):
     """Close GSM session (free the GSM serial port)"""
+    # Stop reading the serial port in background
+    self.stopUnsolicitedResultListener()
+
+    # SMS waiting to be sent can't be sent anymore
+    self.stopSmsSendQueue(wait=False)
+
+    # SMS format will have to be set again in the next session
+    self.__sms_format = GSMTC35.__eSmsFormat.UNKNOWN
+    self.invalidateCache()
+
     # Try to put auto-baudrate mode back
     self.__selectBaudrateCommunicationType(0)
 
@@ -424,6 +529,7 @@ class GSMTC35:
 
     return: (bool) Reboot successful
     """
+    self.invalidateCache()
     restarted = self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CFUN=1,1",
                                              result="^SYSSTART",
                                              additional_timeout=waiting_time_sec)
@@ -458,46 +564,231 @@ class GSMTC35:
     return quoted_string
 
 
-  def __readLine(self):
-    """Read one line from the serial port (not blocking)
+  def __readAvailableData(self):
+    """Move all data already received by the serial port into the reception buffer (not blocking)
+
+    return: (int) Number of bytes added to the reception buffer
+    """
+    bytesToRead = self.__serial.inWaiting()
+    if bytesToRead <= 0:
+      return 0
+
+    data = self.__serial.read(bytesToRead)
+    if not data:
+      return 0
+
+    self.__rx_buffer += data
+    return len(data)
 
-    Note: Even if the end of line is not found, the data is returned
 
-    return: (string) Line without the end of line (empty if nothing received)
+  def __isLineAvailable(self):
+    """Check if a full line (or the GSM module prompt "> ") can be read (not blocking)
+
+    return: (bool) A line can be read with {__readLine()}
     """
-    eol = '\r\n'
-    leneol = len(eol)
-    line = ""
-    while True:
-      c = self.__serial.read(1)
-      if c:
-        line += c.decode()
-        if line[-leneol:] == eol:
-          line = line[:len(line)-leneol]
-          break
-      else:
-        if str(line).startswith(">"):
-          logging.debug("Reading line while GSM is waiting content")
-        else:
-          logging.warning("Received data without eol: \""+str(line)+"\"")
-        break
+    if self.__rx_buffer.find(b"\r\n") >= 0 or self.__rx_buffer.startswith(b">"):
+      return True
+
+    if self.__readAvailableData() <= 0:
+      return False
+
+    return self.__rx_buffer.find(b"\r\n") >= 0 or self.__rx_buffer.startswith(b">")
+
+
+  def __readRawLine(self):
+    """Read one line from the serial port (not blocking), including unsolicited results
+
+    Note: The GSM module prompt ("> ") is returned even if there is no end of line,
+          any other incomplete line is kept until the end of line is received
+
+    return: (string) Line without the end of line (empty if no full line received)
+    """
+    if not self.__isLineAvailable():
+      return ""
+
+    eol_pos = self.__rx_buffer.find(b"\r\n")
+    if eol_pos >= 0:
+      line = self.__rx_buffer[:eol_pos]
+      del self.__rx_buffer[:eol_pos+2]
+    else:
+      logging.debug("Reading line while GSM is waiting content")
+      line = self.__rx_buffer[:]
+      del self.__rx_buffer[:]
+
+    line = line.decode("utf-8", "replace")
     logging.debug("[IN] "+str(line))
     return line
 
 
+  def __readLine(self):
+    """Read one line from the serial port (not blocking), unsolicited results are
+       sent to their handlers and are never returned
+
+    return: (string) Line without the end of line (empty if no full line received)
+    """
+    with self.__lock:
+      while self.__isLineAvailable():
+        line = self.__readRawLine()
+        if self.__dispatchUnsolicitedResult(line) == "":
+          return line
+    return ""
+
+
+  def __getUnsolicitedResultType(self, line):
+    """Get the unsolicited result type of a line received from the GSM module
+
+    Note: Answer of the command in progress is not an unsolicited result
+          (example: '^SCTM: 0,0' is the answer of 'AT^SCTM?')
+
+    Keyword arguments:
+      line -- (string) Line received from the GSM module (without end of line)
+
+    return: (string) Unsolicited result type (see eUnsolicitedResult), empty if not an unsolicited result
+    """
+    for urc_type in GSMTC35.__UNSOLICITED_RESULTS:
+      if line == urc_type or line.startswith(urc_type+":"):
+        if urc_type.lstrip("+^") in self.__current_cmd:
+          return ""
+        return urc_type
+    return ""
+
+
+  def __dispatchUnsolicitedResult(self, line):
+    """Send line to the registered unsolicited result handlers if it is an unsolicited result
+
+    Note: Unsolicited results with an additional line of data are sent to their
+          handlers once this additional line is received
+
+    Keyword arguments:
+      line -- (string) Line received from the GSM module (without end of line)
+
+    return: (string) Unsolicited result type (see eUnsolicitedResult), empty if {line} is not part of an unsolicited result
+    """
+    if self.__pending_unsolicited_result is not None:
+      urc_type, urc_line = self.__pending_unsolicited_result
+      self.__pending_unsolicited_result = None
+      self.__callUnsolicitedResultHandlers(urc_type, urc_line, line)
+      return urc_type
+
+    urc_type = self.__getUnsolicitedResultType(line)
+    if urc_type == "":
+      if line.startswith(GSMTC35.__FINAL_RESULTS):
+        # Answer of the command is fully received, same results are now unsolicited
+        self.__current_cmd = ""
+      return ""
+
+    if (urc_type in GSMTC35.__MULTILINE_UNSOLICITED_RESULTS) or \
+       (urc_type in GSMTC35.__PDU_MULTILINE_UNSOLICITED_RESULTS and self.__sms_format == GSMTC35.__eSmsFormat.PDU):
+      self.__pending_unsolicited_result = (urc_type, line)
+    else:
+      self.__callUnsolicitedResultHandlers(urc_type, line, "")
+
+    return urc_type
+
+
+  def __callUnsolicitedResultHandlers(self, urc_type, line, data):
+    """Call all handlers registered for a specific unsolicited result
+
+    Keyword arguments:
+      urc_type -- (string) Unsolicited result type (see eUnsolicitedResult)
+      line -- (string) Unsolicited result line
+      data -- (string) Additional line of data (empty if not applicable)
+    """
+    handlers = list(self.__unsolicited_result_handlers.get(urc_type, []))
+    if len(handlers) <= 0:
+      logging.debug("No handler for unsolicited result \""+str(line)+"\"")
+      return
+
+    for handler in handlers:
+      try:
+        handler(urc_type, line, data)
+      except Exception as e:
+        logging.error("Unsolicited result handler failed for \""+str(line)+"\": "+str(e))
+
+
   def __deleteAllRxData(self):
-    """Delete all received data from the serial port
+    """Delete all lines received from the serial port (unsolicited results are sent to their handlers)
+
+    Note: Line not fully received yet is kept (it may be part of an unsolicited result,
+          example: PDU of a '+CMT' being received)
 
     return: (int) Number of deleted bytes
     """
-    bytesToRead = self.__serial.inWaiting()
-    if bytesToRead <= 0:
-      return 0
+    with self.__lock:
+      self.__readAvailableData()
 
-    data = self.__serial.read(bytesToRead)
-    logging.debug("[DELETED]"+str(data))
+      nb_of_bytes = len(self.__rx_buffer)
+      if nb_of_bytes <= 0:
+        return 0
+
+      while self.__isLineAvailable():
+        if self.__rx_buffer.startswith(b">"):
+          # Old GSM module prompt
+          prompt_size = 2 if self.__rx_buffer.startswith(b"> ") else 1
+          logging.debug("[DELETED]"+str(bytes(self.__rx_buffer[:prompt_size])))
+          del self.__rx_buffer[:prompt_size]
+          continue
+
+        line = self.__readRawLine()
+        if self.__dispatchUnsolicitedResult(line) == "":
+          logging.debug("[DELETED]"+str(line))
+
+      if len(self.__rx_buffer) > 0:
+        logging.debug("Keeping line not fully received: "+str(bytes(self.__rx_buffer)))
+
+      return nb_of_bytes - len(self.__rx_buffer)
+
+
+  def __getSerialFileDescriptor(self):
+    """Get the file descriptor of the serial port (if it can be watched with select)
+
+    return: (int) File descriptor or None if not available (Windows, port closed, ...)
+    """
+    try:
+      return self.__serial.fileno()
+    except (AttributeError, ValueError, serial.SerialException):
+      return None
+
+
+  def __waitIncomingData(self, deadline):
+    """Wait (blocking) until a line is received from the serial port or {deadline} is reached
+
+    The function returns as soon as the line is received: select() is used
+    on the serial port file descriptor if possible, else a blocking read of
+    one byte (with serial port timeout) is done.
+
+    Keyword arguments:
+      deadline -- (float) Time (see time.time()) after which there is no need to wait anymore
+
+    return: (bool) Line available (see {__readLine()}) before {deadline}
+    """
+    while True:
+      if self.__isLineAvailable():
+        return True
+
+      remaining_time = deadline - time.time()
+      if remaining_time <= 0:
+        return False
 
-    return bytesToRead
+      fd = self.__getSerialFileDescriptor()
+      if fd is not None:
+        try:
+          select.select([fd], [], [], remaining_time)
+        except (ValueError, OSError, select.error) as e:
+          logging.error("Impossible to wait data from the serial port: "+str(e))
+          return False
+      else:
+        previous_timeout = self.__serial.timeout
+        self.__serial.timeout = remaining_time
+        try:
+          data = self.__serial.read(1)
+        finally:
+          self.__serial.timeout = previous_timeout
+        if data:
+          self.__rx_buffer += data
+        elif time.time() < deadline:
+          # Serial port did not wait the timeout (non blocking port), avoid CPU overload
+          time.sleep(.010)
 
 
   def __waitDataContains(self, content, error_result, additional_timeout=0):
@@ -510,19 +801,17 @@ class GSMTC35:
 
     return: (bool) Is data received before timeout (if {error_result} is received, False is returned)
     """
-    start_time = time.time()
-    while time.time() - start_time < self.__timeout_sec + additional_timeout:
-      while self.__serial.inWaiting() > 0:
+    with self.__lock:
+      deadline = time.time() + self.__timeout_sec + additional_timeout
+      while self.__waitIncomingData(deadline):
         line = self.__readLine()
         if content in line:
           return True
         if len(error_result) > 0 and error_result == line:
           logging.error("GSM module returned error \""+str(error_result)+"\"")
           return False
-      # Wait 100ms if no data in the serial buffer
-      time.sleep(.100)
-    #logging.error("Impossible to get line containing \""+str(content)+"\" on time")
-    return False
+      #logging.error("Impossible to get line containing \""+str(content)+"\" on time")
+      return False
 
 
   def __getNotEmptyLine(self, content="", error_result=__RETURN_ERROR, additional_timeout=0):
@@ -535,35 +824,74 @@ class GSMTC35:
 
     return: (string) Line received (without eol), empty if not found or if an error occured
     """
-    start_time = time.time()
-    while time.time() - start_time < self.__timeout_sec + additional_timeout:
-      while self.__serial.inWaiting() > 0:
+    with self.__lock:
+      deadline = time.time() + self.__timeout_sec + additional_timeout
+      while self.__waitIncomingData(deadline):
         line = self.__readLine()
         if len(error_result) > 0 and (str(error_result) == str(line)):
           logging.error("GSM module returned error \""+str(error_result)+"\"")
           return ""
         elif (content in line) and len(line) > 0:
           return line
-      # Wait 100ms if no data in the serial buffer
-      time.sleep(.100)
-    logging.error("Impossible to get line containing \""+str(content)+"\" on time")
+      logging.error("Impossible to get line containing \""+str(content)+"\" on time")
+      return ""
+
+
+  def __waitPrompt(self, error_result=__RETURN_ERROR):
+    """Wait the GSM module prompt ("> ") asking for content after a command
+
+    Note: If nothing is received on time, the content request is cancelled (in
+          case the prompt is received later)
+
+    Keyword arguments:
+      error_result -- (string) Line meaning an error occured (sent by the module)
+
+    return: (bool) Prompt received (False if an error occured or nothing received on time)
+    """
+    return self.__getPromptAnswer(error_result).startswith(GSMTC35.__PROMPT)
+
+
+  def __getPromptAnswer(self, error_result=__RETURN_ERROR):
+    """Wait the GSM module prompt ("> ") or the error sent instead of it (see {__waitPrompt()})
+
+    Keyword arguments:
+      error_result -- (string) Line meaning an error occured (sent by the module)
+
+    return: (string) Prompt or error line received (empty if nothing received on time)
+    """
+    deadline = time.time() + self.__timeout_sec
+    while self.__waitIncomingData(deadline):
+      line = self.__readLine()
+      if line.startswith(GSMTC35.__PROMPT):
+        return line
+      if len(error_result) > 0 and error_result in line:
+        logging.error("GSM module returned error \""+str(line)+"\" instead of prompt")
+        return line
+
+    logging.error("Impossible to get prompt on time")
+    self.__serial.write(GSMTC35.__ESCAPE.encode())
     return ""
 
 
   def __sendLine(self, before, after=""):
     """Send line to the serial port as followed: {before}\r\n{after}
 
+    Note: {after} is sent as soon as the GSM module prompt ("> ") is received
+          (and is not sent if the prompt is not received)
+
     Keyword arguments:
       before -- (string) Data to send before the end of line
       after -- (string) Data to send after the end of line
 
     return: (bool) Send line worked?
     """
+    self.__current_cmd = before
     if self.__serial.write("{}\r\n".format(before).encode()):
       logging.debug("[OUT] "+str(before))
       if after != "":
-        time.sleep(0.100)
-        if self.__serial.write(after.encode()) > 0:
+        if not self.__waitPrompt():
+          logging.warning("GSM module did not ask to write \""+str(after)+"\" (after).")
+        elif self.__serial.write(after.encode()) > 0:
           logging.debug("[OUT] "+str(after))
           return True
         else:
@@ -587,10 +915,11 @@ class GSMTC35:
 
     return: (string) Line without the end of line containing {content} (empty if nothing received or if an error occured)
     """
-    self.__deleteAllRxData()
-    if self.__sendLine(cmd, after):
-      return self.__getNotEmptyLine(content, error_result, additional_timeout)
-    return ""
+    with self.__lock:
+      self.__deleteAllRxData()
+      if self.__sendLine(cmd, after):
+        return self.__getNotEmptyLine(content, error_result, additional_timeout)
+      return ""
 
 
   def __sendCmdAndGetFullResult(self, cmd, after="", additional_timeout=0,
@@ -606,15 +935,15 @@ class GSMTC35:
 
     return: ([string,]) All lines without the end of line (empty if nothing received or if an error occured)
     """
-    val_result = []
+    with self.__lock:
+      val_result = []
 
-    self.__deleteAllRxData()
-    if not self.__sendLine(cmd, after):
-      return val_result
+      self.__deleteAllRxData()
+      if not self.__sendLine(cmd, after):
+        return val_result
 
-    start_time = time.time()
-    while time.time() - start_time < self.__timeout_sec + additional_timeout:
-      while self.__serial.inWaiting() > 0:
+      deadline = time.time() + self.__timeout_sec + additional_timeout
+      while self.__waitIncomingData(deadline):
         line = self.__readLine()
         if (result == line) and len(line) > 0:
           return val_result
@@ -623,11 +952,9 @@ class GSMTC35:
           return []
         elif line != "":
           val_result.append(line)
-      # Wait 100ms if no data in the serial buffer
-      time.sleep(.100)
 
-    logging.error("Impossible to get line equal to \""+str(result)+"\" on time")
-    return val_result
+      logging.error("Impossible to get line equal to \""+str(result)+"\" on time")
+      return val_result
 
 
   def __sendCmdAndCheckResult(self, cmd, after="", additional_timeout=0,
@@ -643,16 +970,53 @@ class GSMTC35:
 
     return: (bool) Command successful (result returned from the GSM module)
     """
-    self.__deleteAllRxData()
-    if not self.__sendLine(cmd, after):
-      return False
+    with self.__lock:
+      self.__deleteAllRxData()
+      if not self.__sendLine(cmd, after):
+        return False
 
-    result = self.__waitDataContains(result, error_result, additional_timeout)
+      result = self.__waitDataContains(result, error_result, additional_timeout)
 
-    if not result:
-      logging.error("Sending \""+str(cmd)+"\" and \""+str(after)+"\" failed")
+      if not result:
+        logging.error("Sending \""+str(cmd)+"\" and \""+str(after)+"\" failed")
 
-    return result
+      return result
+
+
+  def __getCachedResult(self, key):
+    """Get result of a request from the cache (see setCacheTimeToLive())
+
+    Keyword arguments:
+      key -- (string) Request identifier
+
+    return: (bool, any) Result found in the cache (and not expired), Result
+    """
+    cached = self.__cache.get(key)
+    if cached is None:
+      return False, None
+
+    expiration_time, result = cached
+    if time.time() >= expiration_time:
+      del self.__cache[key]
+      return False, None
+
+    return True, result
+
+
+  def __addResultToCache(self, key, result):
+    """Keep valid result of a request in the cache (if cache is enabled)
+
+    Keyword arguments:
+      key -- (string) Request identifier
+      result -- (any) Valid result of the request
+    """
+    if self.__cache_time_to_live_sec == 0:
+      return
+
+    if self.__cache_time_to_live_sec < 0:
+      self.__cache[key] = (float("inf"), result)
+    else:
+      self.__cache[key] = (time.time() + self.__cache_time_to_live_sec, result)
 
 
   def __deleteSpecificSMS(self, index):
@@ -670,6 +1034,28 @@ class GSMTC35:
     return self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGD="+str(index))
 
 
+  def __setSmsFormat(self, sms_format):
+    """Set the SMS format (PDU or text mode) used by the GSM module (only if not already used)
+
+    Keyword arguments:
+      sms_format -- (GSMTC35.__eSmsFormat) SMS format to use
+
+    return: (bool) SMS format in use
+    """
+    if self.__sms_format == sms_format:
+      return True
+
+    if self.__pdu_session and sms_format != GSMTC35.__eSmsFormat.PDU:
+      logging.error("Text mode can't be used (only PDU mode is used during this session)")
+      return False
+
+    if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGF="+str(sms_format)):
+      return False
+
+    self.__sms_format = sms_format
+    return True
+
+
   @staticmethod
   def __guessPhoneNumberType(phone_number):
     """Guess phone number type from phone number
@@ -708,8 +1094,12 @@ class GSMTC35:
     if phonebook_type == GSMTC35.ePhonebookType.CURRENT:
       return True
 
-    return self.__sendCmdAndCheckResult(GSMTC35.__NORMAL_AT+"CPBS=\""
-                                        +str(phonebook_type)+"\"")
+    if not self.__sendCmdAndCheckResult(GSMTC35.__NORMAL_AT+"CPBS=\""
+                                        +str(phonebook_type)+"\""):
+      return False
+
+    self.__selected_phonebook = phonebook_type
+    return True
 
 
   def __getCurrentPhonebookRange(self):
@@ -719,6 +1109,11 @@ class GSMTC35:
     return: (int, int, int, int) First entry index, Last entry index, max phone
       number length, max contact name length (for all elements: -1 if data is invalid)
     """
+    cache_key = "phonebook_range_"+str(self.__selected_phonebook)
+    cached, phonebook_range = self.__getCachedResult(cache_key)
+    if cached:
+      return phonebook_range
+
     # Send the command to get all info
     result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CPBR=?",
                                               content="+CPBR: ")
@@ -788,7 +1183,10 @@ class GSMTC35:
     self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
 
     # Return final result
-    return index_min, index_max, index_max_phone_length, max_contact_name_length
+    phonebook_range = (index_min, index_max, index_max_phone_length, max_contact_name_length)
+    if not -1 in phonebook_range:
+      self.__addResultToCache(cache_key, phonebook_range)
+    return phonebook_range
 
 
   def __selectBaudrateCommunicationType(self, baudrate):
@@ -875,130 +1273,13 @@ class GSMTC35:
 
     return all_disable
 
-  __gsm0338_base_table = u"@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞ\x1bÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
-  __gsm0338_extra_table = u"````````````````````^```````````````````{}`````\\````````````[~]`|````````````````````````````````````€``````````````````````````"
-
-  @staticmethod
-  def __gsm0338Encode(plaintext):
-    res = ""
-    for c in plaintext:
-      idx = GSMTC35.__gsm0338_base_table.find(c)
-      if idx != -1:
-        res += chr(int(idx))
-        continue
-      idx = GSMTC35.__gsm0338_extra_table.find(c)
-      if idx != -1:
-        res += chr(27) + chr(int(idx))
-    return res
-
-  @staticmethod
-  def __gsm0338Decode(text):
-    result = []
-    normal_table = True
-    for i in text:
-      if int(i) == 27:
-        normal_table = False
-      else:
-        if normal_table:
-          result += GSMTC35.__gsm0338_base_table[int(i)]
-        else:
-          result += GSMTC35.__gsm0338_extra_table[int(i)]
-        normal_table = True
-
-    return "".join(result)
-
-  @staticmethod
-  def __is7BitCompatible(plaintext):
-    """Check that the data can be encoded in GSM03.38 (extra table included)
-
-    Keyword arguments:
-      plaintext -- (bytes) Content to check if can be encoded into 7bit
-
-    return: (bool) Data can be encoded into 7Bit
-    """
-    try:
-      # Do not encode data if not 7bit compatible
-      for c in str(plaintext):
-        if (c == '`') or ((not (c in GSMTC35.__gsm0338_base_table)) and (not (c in GSMTC35.__gsm0338_extra_table))):
-          return False
-    except (UnicodeEncodeError, UnicodeDecodeError):
-      logging.debug("Unicode detected so data not 7bit compatible")
-      return False
-
-    return True
-
-  @staticmethod
-  def __unpack7bit(content, header_length=0, message_length=0):
-    """Decode byte with Default Alphabet encoding ('7bit')
-
-    Function logic inspired from https://github.com/pmarti/python-messaging/blob/master/messaging/utils.py#L173
-
-    Keyword arguments:
-      content -- (bytes) Content to decode as hexa
-
-    return: (bytes) Decoded content
-    """
-    try:
-      unichr
-    except NameError:
-      unichr = chr
-
-    count = last = 0
-    result = []
-    try:
-      for i in range(0, len(content), 2):
-        byte = int(content[i:i + 2], 16)
-        mask = 0x7F >> count
-        out = ((byte & mask) << count) + last
-        last = byte >> (7 - count)
-        result.append(out)
-
-        if len(result) >= 0xa0:
-          break
-
-        if count == 6:
-          result.append(last)
-          last = 0
-
-        count = (count + 1) % 7
-
-      result = ''.join(map(unichr, result))
-
-      # Convert GSM 7bit encodage (GSM03.38) into normal string
-      return GSMTC35.__gsm0338Decode(result[:message_length].encode())
-    except ValueError:
-      return ''
-
-  @staticmethod
-  def __unpack8bit(encoded_data):
-    """Decode hexa byte encoded with 8bit encoding
-
-    Keyword arguments:
-      encoded_data -- (bytes) Content to decode
-
-    return: (bytes) Decoded content
-    """
-    encoded_data = [ord(x) for x in encoded_data]
-    return ''.join([chr(x) for x in encoded_data])
-
-  @staticmethod
-  def __unpackUCS2(encoded_data):
-    """Decode hexa byte encoded with extended encoding (UTF-16 / UCS2)
-
-    Keyword arguments:
-      encoded_data -- (bytes) Content to decode
-
-    return: (bytes) Decoded content
-    """
-    return encoded_data.decode('utf-16be')
-
   @staticmethod
-  def __packUCS2(content, user_data_id=0):
+  def __packUCS2(content, user_data_id):
     """Encode bytes into hexadecimal representation of extended encoded User Data with User Data Length (UTF-16 / UCS2)
 
     Keyword arguments:
       content -- (bytes) Content to encode
-      user_data_id -- (int[1:255] or 0 for random, optional, default: random) ID of the potential multipart message
+      user_data_id -- (int[0:65535]) ID of the potential multipart message (16 bit reference)
 
     return: ([bytes]) List of Hexadecimal representation of extended encoded User Data with User Data Length (UTF-16 / UCS2)
     """
@@ -1006,29 +1287,16 @@ class GSMTC35:
     if (len(content) > 70):
       logging.debug("Encoding multipart message in UCS-2 (Utf-16)")
       # Get all parts
-      n = 67 # Max number of unicode char in multipart message (excepting header)
+      n = 66 # Max number of unicode char in multipart message (excepting header)
       all_msg_to_encode = [content[i:i+n] for i in range(0, len(content), n)]
       logging.debug("Messages to encode:\n - "+'\n - '.join(all_msg_to_encode))
       all_encoded_msg = []
       nb_of_parts = len(all_msg_to_encode)
-      # Have same user data ID for all message parts
-      if user_data_id == 0:
-        user_data_id = randint(0, 255)
-      # Encode data as multipart messages
+      # Encode data as multipart messages (same user data ID for all message parts)
       for current_id in range(nb_of_parts):
-        encoded_message = binascii.hexlify(all_msg_to_encode[current_id].encode('utf-16be')).decode()
-        if len(encoded_message) % 4 != 0:
-          encoded_message = str("00") + str(encoded_message)
-
-        encoded_message = GSMTC35.__generateMultipartUDH(user_data_id, current_id+1, nb_of_parts, True) + encoded_message
-
-        encoded_message_length = format(int(ceil(len(encoded_message)/2)), 'x')
-        if len(encoded_message_length) % 2 != 0:
-          encoded_message_length = "0" + encoded_message_length
-
-        encoded_message = str(str(encoded_message_length) + str(encoded_message)).upper().replace("'", "")
-
-        all_encoded_msg.append(encoded_message)
+        header = pdu.encodeUserDataHeader([pdu.encodeConcatenationElement(user_data_id, nb_of_parts, current_id+1)])
+        user_data = header + all_msg_to_encode[current_id].encode('utf-16be')
+        all_encoded_msg.append('{:02X}'.format(len(user_data)) + binascii.hexlify(user_data).decode().upper())
 
       return all_encoded_msg
     else:
@@ -1043,374 +1311,94 @@ class GSMTC35:
       return [str(str(encoded_message_length) + str(encoded_message)).upper().replace("'", "")]
 
   @staticmethod
-  def __generateMultipartUDH(user_data_id, current_part, nb_of_parts, string_mode=False):
-    """Generate User Data Header for multipart message purpose
-
-    Keyword arguments:
-      user_data_id -- (int[0:255]) ID of the multipart message
-      current_part -- (int) Current part of the multipart message
-      nb_of_parts -- (int) Number of parts of the full multipart message
-      string_mode -- (bool) Returning the UDH as string or as unicode?
-
-    return: (string) User Data Header
-    """
-    if string_mode:
-      # UDHL (User Data Header Length, not including UDHL byte)
-      result = "05"
-      # Information element identifier (not used)
-      result += "00"
-      # Header Length, not including this byte
-      result += "03"
-      # User Data ID (reference)
-      result += '{:02X}'.format(user_data_id)
-      # Number of parts
-      result += '{:02X}'.format(nb_of_parts)
-      # Current part
-      result += '{:02X}'.format(current_part)
-    else:
-      # UDHL (User Data Header Length, not including UDHL byte)
-      result = "\x05"
-      # Information element identifier (not used)
-      result += "\x00"
-      # Header Length, not including this byte
-      result += "\x03"
-      # User Data ID (reference)
-      result += chr(user_data_id)
-      # Number of parts
-      result += chr(nb_of_parts)
-      # Current part
-      result += chr(current_part)
-
-    return result
-
-  @staticmethod
-  def __pack7Bit(plaintext, user_data_id=0):
+  def __pack7Bit(plaintext, user_data_id):
     """Encode bytes into hexadecimal representation of 7bit GSM encoding with length (very basic UTF-8)
 
     Function logic inspired from https://github.com/pmarti/python-messaging/blob/master/messaging/utils.py#L98
 
     Keyword arguments:
       plaintext -- (bytes) Content to encode
-      user_data_id -- (int[1:255] or 0 for random, optional, default: random) ID of the potential multipart message
+      user_data_id -- (int[0:65535]) ID of the potential multipart message (16 bit reference)
 
     return: (bool, [bytes]) (Successfully encoded, List of Hexadecimal representation of 7bit GSM encoded User Data with User Data Length (very basic UTF-8))
     """
     # Do not encode data if not 7bit compatible
-    if not GSMTC35.__is7BitCompatible(plaintext):
+    if not pdu.isGsm0338Compatible(plaintext):
       return False, []
 
-    encoded_message = ""
-
-    # Be sure that message is a string
-    if sys.version_info >= (3,):
-      txt = plaintext.encode().decode('latin1')
-    else:
-      txt = plaintext
-
     # Encode string in GSM 03.38 encoding
-    txt = GSMTC35.__gsm0338Encode(plaintext)
+    septets = pdu.encodeGsm0338(plaintext)
 
     # Check if message can be sent in one part or is multipart
-    if (len(txt) > 140):
+    if (len(septets) > 140):
       logging.debug("Encoding multipart message in 7bit")
       # Get all parts that needs to be encoded
       n = 138 # Max number of 7 bit chars in multipart message (excepting header)
-      all_msg_to_encode = [txt[i:i+n] for i in range(0, len(txt), n)]
-      logging.debug("Messages to encode:\n - "+'\n - '.join(all_msg_to_encode))
+      all_msg_to_encode = [septets[i:i+n] for i in range(0, len(septets), n)]
+      logging.debug("Messages to encode:\n - "+'\n - '.join([pdu.decodeGsm0338(msg) for msg in all_msg_to_encode]))
       all_encoded_msg = []
       nb_of_parts = len(all_msg_to_encode)
-      # Have same user data ID for all message parts
-      if user_data_id == 0:
-        user_data_id = randint(0, 255)
-      # Encode data as multipart messages
+      # Encode data as multipart messages (same user data ID for all message parts)
       for current_id in range(nb_of_parts):
-        txt = "\x00\x00\x00\x00\x00\x00" + "\x00"+ all_msg_to_encode[current_id]
-        tl = len(txt)
-        txt += '\x00'
-        msgl = int(len(txt) * 7 / 8)
-        op = [-1] * msgl
-        c = shift = 0
-
-        for n in range(msgl):
-          if shift == 6:
-            c += 1
-
-          shift = n % 7
-          lb = ord(txt[c]) >> shift
-          hb = (ord(txt[c + 1]) << (7 - shift) & 255)
-          op[n] = lb + hb
-          c += 1
-
-        for i, char in enumerate(GSMTC35.__generateMultipartUDH(user_data_id, current_id+1, nb_of_parts)):
-          op[i] = ord(char)
-
-        encoded_message = chr(tl) + ''.join(map(chr, op))
-
-        all_encoded_msg.append(str(''.join(["%02x" % ord(n) for n in encoded_message])).upper().replace("'", ""))
+        header = pdu.encodeUserDataHeader([pdu.encodeConcatenationElement(user_data_id, nb_of_parts, current_id+1)])
+        encoded_message = pdu.packSeptets(all_msg_to_encode[current_id], header)
+        all_encoded_msg.append(binascii.hexlify(encoded_message).decode().upper())
 
       return True, all_encoded_msg
     else:
       # Encode data as normal message
       logging.debug("Encoding one SMS in 7bit")
-      tl = len(txt)
-      txt += '\x00'
-      msgl = int(len(txt) * 7 / 8)
-      op = [-1] * msgl
-      c = shift = 0
+      return True, [binascii.hexlify(pdu.packSeptets(septets)).decode().upper()]
 
-      for n in range(msgl):
-        if shift == 6:
-          c += 1
+  @staticmethod
+  def __decodeValidPduSms(msg, decode_sms):
+    """Decode PDU SMS and check that all mandatory SMS fields are there
 
-        shift = n % 7
-        lb = ord(txt[c]) >> shift
-        hb = (ord(txt[c + 1]) << (7 - shift) & 255)
-        op[n] = lb + hb
-        c += 1
+    Note: Invalid SMS is logged but does not throw (for reliability)
 
-      encoded_message = chr(tl) + ''.join(map(chr, op))
+    Keyword arguments:
+      msg -- (string) PDU SMS (hexadecimal readable format)
+      decode_sms -- (bool) Decode SMS content or keep it in encoded format
 
-      return True, [str(''.join(["%02x" % ord(n) for n in encoded_message])).upper().replace("'", "")]
+    return: ({}) SMS data (see {pdu.SmsRecord}), empty if not valid
+    """
+    decoded_data = pdu.decodeSms(msg, decode_sms)
+    if decoded_data.isValid():
+      return decoded_data.toDict()
 
-  @staticmethod
-  def __decodePduSms(msg, decode_sms):
-    """Decode PDU SMS content
+    return {}
 
-    Keyword arguments:
-      msg -- (string) PDU hexa string to decoded
-      decode_sms -- (bool) Is it needed to decode SMS content ?
+  ######################## INFO AND UTILITY FUNCTIONS ##########################
+  def isAlive(self):
+    """Check if the GSM module is alive (answers to AT commands)
 
-    return: (list) List of decoded content containing potentially 'phone_number', 'date', 'time', 'sms',
-                   'sms_encoded', 'service_center_type', 'service_center_phone_number', 'phone_number_type',
-                   'charset'
-                   if message has an header: 'header_iei', 'header_ie_data'
-                   if message is a multipart message (MMS): 'header_multipart_ref_id',
-                     'header_multipart_current_part_nb', 'header_multipart_nb_of_part'
+    return: (bool) Is GSM module alive
     """
-    result = {}
+    return self.__sendCmdAndCheckResult(GSMTC35.__BASE_AT)
 
-    # Be sure message is of hexa type
-    try:
-      int(str(msg), 16)
-    except ValueError:
-      logging.error("Can't decode PDU SMS because is not hexadecimal content: \""+str(msg)+"\"")
-      return result
 
-    # Service center data (type and phone number)
-    lengthServiceCenter = int(msg[:2], 16)
-    msg = msg[2:]
+  def getManufacturerId(self):
+    """Get the GSM module manufacturer identification
 
-    serviceCenterType = int(msg[:2], 16)
-    result["service_center_type"] = serviceCenterType
-    msg = msg[2:]
+    return: (string) Manufacturer identification
+    """
+    return self.__getIdentification(GSMTC35.eInformation.MANUFACTURER_ID)
 
-    serviceCenterEncodedPhone = msg[:lengthServiceCenter*2-2]
-    if (lengthServiceCenter%2 != 0):
-      serviceCenterEncodedPhone = serviceCenterEncodedPhone[0:len(serviceCenterEncodedPhone)-2] + serviceCenterEncodedPhone[len(serviceCenterEncodedPhone)-1:]
-    msg = msg[lengthServiceCenter*2-2:]
 
-    serviceCenterDecodedPhone = ""
-    for number in range(0,lengthServiceCenter*2-3):
-      if number %2 == 0:
-        serviceCenterDecodedPhone = serviceCenterDecodedPhone + serviceCenterEncodedPhone[number]
-      else:
-        serviceCenterDecodedPhone = serviceCenterDecodedPhone[:len(serviceCenterDecodedPhone) - 1] + str(serviceCenterEncodedPhone[number]) + serviceCenterDecodedPhone[len(serviceCenterDecodedPhone) - 1:]
-    result["service_center_phone_number"] = str(serviceCenterDecodedPhone)
+  def getModelId(self):
+    """Get the GSM module model identification
 
-    # First byte
-    firstByte = int(msg[:2], 16)
-    if firstByte & 0b1000000:
-      contentContainsHeader = True
-    else:
-      contentContainsHeader = False
-    msg = msg[2:]
+    return: (string) Model identification
+    """
+    return self.__getIdentification(GSMTC35.eInformation.MODEL_ID)
 
-    # Sender Phone data (type and number)
-    lengthSenderPhoneNumber = int(msg[:2], 16)
-    msg = msg[2:]
 
-    senderType = int(msg[:2], 16)
-    msg = msg[2:]
-    result["phone_number_type"] = senderType
+  def getRevisionId(self):
+    """Get the GSM module revision identification of software status
 
-    phoneNumberEncoded = msg[:lengthSenderPhoneNumber+1]
-    if (lengthSenderPhoneNumber%2 != 0):
-      phoneNumberEncoded = phoneNumberEncoded[0:len(phoneNumberEncoded)-2] + phoneNumberEncoded[len(phoneNumberEncoded)-1:]
-    msg = msg[lengthSenderPhoneNumber+1:]
-
-    phoneNumberDecoded = ""
-    if senderType == GSMTC35.__ePhoneNumberType.INTERNATIONAL:
-      phoneNumberDecoded = "+" + phoneNumberDecoded
-
-    for number in range(0,lengthSenderPhoneNumber):
-      if number %2 == 0:
-        phoneNumberDecoded = phoneNumberDecoded + phoneNumberEncoded[number]
-      else:
-        phoneNumberDecoded = phoneNumberDecoded[:len(phoneNumberDecoded) - 1] + str(phoneNumberEncoded[number]) + phoneNumberDecoded[len(phoneNumberDecoded) - 1:]
-
-    result["phone_number"] = str(phoneNumberDecoded)
-
-    # Protocol ID / TP-PID
-    # protocolId = int(msg[:2], 16)
-    msg = msg[2:]
-
-    # Data coding scheme / TP-DCS
-    dataCodingScheme = int(msg[:2], 16)
-    msg = msg[2:]
-
-    # Timestamp
-    timestampEncoded = msg[:14]
-    msg = msg[14:]
-    dateDecoded = timestampEncoded[1] + timestampEncoded[0] + "/" \
-                       + timestampEncoded[3] + timestampEncoded[2] + "/" \
-                       + timestampEncoded[5] + timestampEncoded[4]
-    timeDecoded = timestampEncoded[7] + timestampEncoded[6] + ":" \
-                       + timestampEncoded[9] + timestampEncoded[8] + ":" \
-                       + timestampEncoded[11] + timestampEncoded[10] + ""
-    gmt = timestampEncoded[13] + timestampEncoded[12]
-    gmtDecoded = ""
-    if (int(gmt[1], 16) >= 8):
-      gmtDecoded = "GMT-"
-      gmt = gmt[0] + str(int(gmt[1], 16) - 8)
-    else:
-      gmtDecoded += "GMT+"
-    gmtDecoded += str(int(gmt, 10)/4)
-    result["date"] = str(dateDecoded)
-    result["time"] = str(str(timeDecoded)+" "+str(gmtDecoded))
-
-    # Message content
-    messageLength = int(msg[:2], 16)
-    msg = msg[2:]
-
-    # Charset
-    if (dataCodingScheme & 0xc0) == 0:
-      if dataCodingScheme & 0x20:
-        logging.error("Not possible to find correct encoding")
-        if decode_sms:
-          return result
-        else:
-          charset = "unknown"
-      try:
-        charset = {0x00: '7bit', 0x04: '8bit', 0x08: 'utf16-be'}[dataCodingScheme & 0x0c]
-      except KeyError:
-        logging.error("Not possible to find correct encoding")
-        if decode_sms:
-          return result
-        else:
-          charset = "unknown"
-    elif (dataCodingScheme & 0xf0) in (0xc0, 0xd0):
-      charset = '7bit'
-    elif (dataCodingScheme & 0xf0) == 0xe0:
-      charset = 'utf16-be'
-    elif (dataCodingScheme & 0xf0) == 0xf0:
-      charset = {0x00: '7bit', 0x04: '8bit'}[dataCodingScheme & 0x04]
-    else:
-      logging.error("Not possible to find correct encoding")
-      if decode_sms:
-        return result
-      else:
-        charset = "unknown"
-
-    result["charset"] = str(charset)
-
-    # SMS content header
-    headerLength = 0
-    if contentContainsHeader:
-      headerLength = int(msg[:2], 16)
-      if headerLength > 0:
-        if charset == '7bit':
-          headerLength = int(ceil(headerLength * 7.0 / 8.0))
-          if ((headerLength % 2) != 0):
-            headerLength = headerLength + 1
-        result["header_iei"] = int(msg[2:4], 16)
-        headerIeLength = int(msg[4:6], 16)
-        result["header_ie_data"] = msg[6:6+headerIeLength*2]
-        # Add multipart information if IEI is of type 'Concatenated short message' (0x00 or 0x08)
-        if result["header_iei"] == 0 or result["header_iei"] == 8:
-          result["header_multipart_ref_id"] = int(result["header_ie_data"][:2], 16)
-          result["header_multipart_nb_of_part"] = int(result["header_ie_data"][2:4], 16)
-          result["header_multipart_current_part_nb"] = int(result["header_ie_data"][4:6], 16)
-
-    # SMS Content
-    user_data = ""
-    logging.debug("Encoded "+str(charset)+" SMS content: "+str(msg))
-    if charset == '7bit':  # Default Alphabet aka basic 7 bit coding - 03.38 S6.2.1
-      user_data = GSMTC35.__unpack7bit(msg, headerLength, messageLength)
-      # Remove header (+ header size byte) from the message
-      if contentContainsHeader:
-        user_data = user_data[headerLength+1:]
-      user_data_encoded = binascii.hexlify(user_data.encode()).decode()
-    elif charset == '8bit':  # 8 bit coding is "user defined". S6.2.2
-      # TODO: Handle header message (please provide me an example full --debug log to help me)
-      user_data = GSMTC35.__unpack8bit(binascii.unhexlify(msg))
-      user_data_encoded = msg
-    elif charset == 'utf16-be':  # UTF-16 aka UCS2, S6.2.3
-      user_data = GSMTC35.__unpackUCS2(binascii.unhexlify(msg))
-      if contentContainsHeader:
-        user_data = user_data[int(ceil((headerLength+1)/2)):]
-      user_data_encoded = msg[int((headerLength+1)*2):]
-
-    else:
-      logging.error("Not possible to find correct encoding")
-      if decode_sms:
-        return result
-      else:
-        user_data_encoded = msg
-
-    result["sms"] = user_data
-    logging.debug("Decoded SMS content: "+user_data)
-    user_data_encoded = user_data_encoded.upper()
-    result["sms_encoded"] = user_data_encoded
-    logging.debug("Re-encoded SMS content: "+user_data_encoded)
-
-    return result
-
-  ######################## INFO AND UTILITY FUNCTIONS ##########################
-  def isAlive(self):
-    """Check if the GSM module is alive (answers to AT commands)
-
-    return: (bool) Is GSM module alive
-    """
-    return self.__sendCmdAndCheckResult(GSMTC35.__BASE_AT)
-
-
-  def getManufacturerId(self):
-    """Get the GSM module manufacturer identification
-
-    return: (string) Manufacturer identification
-    """
-    # Send request and get data
-    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CGMI")
-    # Delete the "OK" of the request from the buffer
-    if result != "":
-      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
-    return result
-
-
-  def getModelId(self):
-    """Get the GSM module model identification
-
-    return: (string) Model identification
-    """
-    # Send request and get data
-    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CGMM")
-    # Delete the "OK" of the request from the buffer
-    if result != "":
-      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
-    return result
-
-
-  def getRevisionId(self):
-    """Get the GSM module revision identification of software status
-
-    return: (string) Revision identification
-    """
-    # Send request and get data
-    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CGMR")
-    # Delete the "OK" of the request from the buffer
-    if result != "":
-      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
-    return result
+    return: (string) Revision identification
+    """
+    return self.__getIdentification(GSMTC35.eInformation.REVISION_ID)
 
 
   def getIMEI(self):
@@ -1418,12 +1406,7 @@ class GSMTC35:
 
     return: (string) Product serial number ID (IMEI)
     """
-    # Send request and get data
-    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CGSN")
-    # Delete the "OK" of the request from the buffer
-    if result != "":
-      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
-    return result
+    return self.__getIdentification(GSMTC35.eInformation.IMEI)
 
 
   def getIMSI(self):
@@ -1431,11 +1414,27 @@ class GSMTC35:
 
     return: (string) International Mobile Subscriber Identity (IMSI)
     """
+    return self.__getIdentification(GSMTC35.eInformation.IMSI)
+
+
+  def __getIdentification(self, information):
+    """Get identification of the module or SIM (from the cache if possible)
+
+    Keyword arguments:
+      information -- (eInformation) Identification information (see __IDENTIFICATION_INFORMATION)
+
+    return: (string) Identification (empty if an error occured)
+    """
+    cached, result = self.__getCachedResult(information)
+    if cached:
+      return result
+
     # Send request and get data
-    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CIMI")
+    result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+GSMTC35.__INFORMATION_COMMANDS[information][0])
     # Delete the "OK" of the request from the buffer
     if result != "":
       self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
+      self.__addResultToCache(information, result)
     return result
 
 
@@ -1444,6 +1443,10 @@ class GSMTC35:
 
     return: (bool) Reset successful
     """
+    # SMS format and selected phonebook are also reset
+    self.__sms_format = GSMTC35.__eSmsFormat.UNKNOWN
+    self.__selected_phonebook = GSMTC35.ePhonebookType.CURRENT
+    self.invalidateCache()
     return self.__sendCmdAndCheckResult(cmd=GSMTC35.__BASE_AT+"&F0")
 
 
@@ -1474,36 +1477,44 @@ class GSMTC35:
 
     return: (string) Operator name
     """
-    operator = ""
-
     # Set the COPS command correctly
     if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"COPS=3,0"):
       logging.error("Impossible to set the COPS command")
-      return operator
+      return ""
 
     # Send the command to get the operator name
     result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"COPS?",
                                               content="+COPS: ")
-    if result == "" or len(result) <= 8 or result[0:7] != "+COPS: ":
-      logging.error("Command to get the operator name failed")
-      return operator
+    operator = GSMTC35.__parseOperatorName(result)
 
-    # Get result without "+COPS: "
-    result = result[7:]
+    # Delete last "OK" from buffer
+    if operator != "":
+      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
 
-    # Split remaining data from the line
-    split_list = result.split(",")
+    return operator
+
+
+  @staticmethod
+  def __parseOperatorName(line):
+    """Get operator name from the answer of 'AT+COPS?' (with 'AT+COPS=3,0' format)
+
+    Keyword arguments:
+      line -- (string) Line starting with "+COPS: "
+
+    return: (string) Operator name (empty if invalid line)
+    """
+    if line == "" or len(line) <= 8 or line[0:7] != "+COPS: ":
+      logging.error("Command to get the operator name failed")
+      return ""
+
+    # Split data from the line without "+COPS: "
+    split_list = line[7:].split(",")
     if len(split_list) < 3:
       logging.error("Impossible to split operator information")
-      return operator
+      return ""
 
     # Get the operator name without quote (3th element from the list)
-    operator = GSMTC35.__deleteQuote(split_list[2])
-
-    # Delete last "OK" from buffer
-    self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
-
-    return operator
+    return GSMTC35.__deleteQuote(split_list[2])
 
 
   def getSignalStrength(self):
@@ -1512,45 +1523,157 @@ class GSMTC35:
 
     return: (int) -1 if not valid, else signal strength in dBm
     """
-    sig_strength = -1
-
     # Send the command to get the signal power
     result = self.__sendCmdAndGetNotEmptyLine(cmd=GSMTC35.__NORMAL_AT+"CSQ",
                                               content="+CSQ: ")
-    #Check result:
-    if result == "" or len(result) <= 8 or result[:6] != "+CSQ: ":
-      logging.error("Command to get signal strength failed")
+    sig_strength = GSMTC35.__parseSignalStrength(result)
+
+    # Delete last "OK" from buffer
+    if sig_strength is not None:
+      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
       return sig_strength
 
-    # Get result without "+CSQ: "
-    result = result[6:]
+    return -1
+
+
+  @staticmethod
+  def __parseSignalStrength(line):
+    """Get signal strength in dBm from the answer of 'AT+CSQ'
+
+    Keyword arguments:
+      line -- (string) Line starting with "+CSQ: "
 
-    # Split remaining data from the line
+    return: (int) None if invalid line, -1 if invalid value, else signal strength in dBm
+    """
+    #Check result:
+    if line == "" or len(line) <= 8 or line[:6] != "+CSQ: ":
+      logging.error("Command to get signal strength failed")
+      return None
+
+    # Split remaining data from the line without "+CSQ: "
     # (at least one element is in it due to previous check)
-    split_list = result.split(",")
+    split_list = line[6:].split(",")
 
     # Get the received signal strength (1st element)
     try:
       sig_strength = int(split_list[0])
     except ValueError:
       logging.error("Impossible to convert \""+str(split_list[0])+"\" into integer")
-      return sig_strength
-
-    # Delete last "OK" from buffer
-    if sig_strength != -1:
-      self.__waitDataContains(self.__RETURN_OK, self.__RETURN_ERROR)
+      return None
 
     # 99 means the GSM couldn't get the information, negative values are invalid
     if sig_strength >= 99 or sig_strength < 0:
-      sig_strength = -1
+      return -1
 
     # Convert received data to dBm
-    if sig_strength != -1:
-      #(0, <=-113dBm), (1, -111dBm), (2, -109dBm), (30, -53dBm), (31, >=-51dBm)
-      # --> strength (dBm) = 2* received data from module - 113
-      sig_strength = 2*sig_strength - 113
+    #(0, <=-113dBm), (1, -111dBm), (2, -109dBm), (30, -53dBm), (31, >=-51dBm)
+    # --> strength (dBm) = 2* received data from module - 113
+    return 2*sig_strength - 113
+
+
+  def getInformation(self, informations=None, pipelined=True):
+    """Get multiple information on the GSM module and SIM (with only one request if possible)
 
-    return sig_strength
+    Note: If the GSM module does not answer correctly to all chained commands
+          (one command failed or chaining not supported), information are
+          requested one after the other
+
+    Keyword arguments:
+      informations -- ([eInformation,], optional) Information to get (all information if not specified)
+      pipelined -- (bool, optional) Chain all commands in one request (else, send them one after the other)
+
+    return: ({eInformation: string or int}) Value of each information, same as their specific function
+            (example: Same as 'getIMEI()' for 'eInformation.IMEI'), empty if invalid information requested
+    """
+    if informations is None:
+      informations = list(GSMTC35.__INFORMATION_COMMANDS.keys())
+
+    for information in informations:
+      if not information in GSMTC35.__INFORMATION_COMMANDS:
+        logging.error("Invalid information \""+str(information)+"\" requested")
+        return {}
+
+    # Identification already in the cache will not be requested
+    result = {}
+    for information in informations:
+      if information in GSMTC35.__IDENTIFICATION_INFORMATION:
+        cached, value = self.__getCachedResult(information)
+        if cached:
+          result[information] = value
+    informations = [information for information in informations if not information in result]
+
+    if pipelined and len(informations) > 0:
+      pipelined_result = self.__getPipelinedInformation(informations)
+      for information, value in pipelined_result.items():
+        if information in GSMTC35.__IDENTIFICATION_INFORMATION and value != "":
+          self.__addResultToCache(information, value)
+        result[information] = value
+      if len(pipelined_result) > 0:
+        informations = []
+
+    if len(informations) > 0:
+      getters = {GSMTC35.eInformation.MANUFACTURER_ID: self.getManufacturerId,
+                 GSMTC35.eInformation.MODEL_ID: self.getModelId,
+                 GSMTC35.eInformation.REVISION_ID: self.getRevisionId,
+                 GSMTC35.eInformation.IMEI: self.getIMEI,
+                 GSMTC35.eInformation.IMSI: self.getIMSI,
+                 GSMTC35.eInformation.OPERATOR_NAME: self.getOperatorName,
+                 GSMTC35.eInformation.SIGNAL_STRENGTH: self.getSignalStrength}
+      for information in informations:
+        result[information] = getters[information]()
+
+    return result
+
+
+  def __getPipelinedInformation(self, informations):
+    """Get multiple information on the GSM module and SIM with only one request
+
+    Keyword arguments:
+      informations -- ([eInformation,]) Valid information to get
+
+    return: ({eInformation: string or int}) Value of each information (empty if failed)
+    """
+    # Chain all commands: AT+CMD1;+CMD2;...
+    cmd = GSMTC35.__NORMAL_AT+";+".join(GSMTC35.__INFORMATION_COMMANDS[information][0]
+                                         for information in informations)
+    lines = self.__sendCmdAndGetFullResult(cmd=cmd)
+    if len(lines) <= 0:
+      logging.warning("GSM module failed to answer to chained commands")
+      return {}
+
+    # Answers with prefix can be found directly, other ones are in order of the request
+    prefixes = [prefix for _, prefix in GSMTC35.__INFORMATION_COMMANDS.values() if prefix != ""]
+    unprefixed_lines = collections.deque(line for line in lines
+                                         if not any(line.startswith(prefix) for prefix in prefixes))
+    prefixed_lines = [line for line in lines if any(line.startswith(prefix) for prefix in prefixes)]
+
+    result = {}
+    for information in informations:
+      prefix = GSMTC35.__INFORMATION_COMMANDS[information][1]
+      if prefix == "":
+        if len(unprefixed_lines) <= 0:
+          logging.warning("Missing answer for \""+str(information)+"\" in chained commands")
+          return {}
+        result[information] = unprefixed_lines.popleft()
+        continue
+
+      matching_lines = [line for line in prefixed_lines if line.startswith(prefix)]
+      if len(matching_lines) <= 0:
+        logging.warning("Missing answer for \""+str(information)+"\" in chained commands")
+        return {}
+      prefixed_lines.remove(matching_lines[0])
+
+      if information == GSMTC35.eInformation.OPERATOR_NAME:
+        result[information] = GSMTC35.__parseOperatorName(matching_lines[0])
+      elif information == GSMTC35.eInformation.SIGNAL_STRENGTH:
+        sig_strength = GSMTC35.__parseSignalStrength(matching_lines[0])
+        result[information] = sig_strength if sig_strength is not None else -1
+
+    if len(unprefixed_lines) > 0 or len(prefixed_lines) > 0:
+      logging.warning("Unexpected answers in chained commands: "+str(list(unprefixed_lines)+prefixed_lines))
+      return {}
+
+    return result
 
 
   def getOperatorNames(self):
@@ -1558,6 +1681,10 @@ class GSMTC35:
 
     return: ([string,]) List of operator names or empty list if an error occured
     """
+    cached, result = self.__getCachedResult("operator_names")
+    if cached:
+      return list(result)
+
     operators = self.__sendCmdAndGetFullResult(cmd=GSMTC35.__NORMAL_AT+"COPN")
     result = []
 
@@ -1581,6 +1708,9 @@ class GSMTC35:
       if operator_name != "":
         result.append(operator_name)
 
+    if len(result) > 0:
+      self.__addResultToCache("operator_names", tuple(result))
+
     return result
 
 
@@ -1913,27 +2043,205 @@ class GSMTC35:
 
     return: (bool) SMS sent
     """
-    result = False
+    all_parts = self.__getSmsPartsToSend(phone_number, msg, force_text_mode)
+    if len(all_parts) <= 0:
+      return False
+
+    # Parts of a multipart message (MMS) are only sent in PDU mode (text mode sends independent SMS)
+    is_multipart = (len(all_parts) > 1) and (self.__sms_format == GSMTC35.__eSmsFormat.PDU)
+    result = True
+    count = 0
+    for cmd, content in all_parts:
+      # Wait a bit every time a part of the message is sent
+      if is_multipart and (count > 0):
+        logging.debug("Wait a bit before send next message part")
+        time.sleep(network_delay_sec)
+      count += 1
+
+      # Send the SMS or all multipart messages (MMS)
+      if not self.__sendCmdAndCheckResult(cmd=cmd, after=content, additional_timeout=network_delay_sec):
+        result = False
+
+    return result
+
+
+  def sendSMSAndGetReferences(self, phone_number, msg, force_text_mode=False, network_delay_sec=5, min_part_interval_sec=0):
+    """Send SMS/MMS to specific phone number and get message reference of each part
+
+    Contrary to {sendSMS()}, each part of a MMS is sent as soon as the previous
+    part is accepted by the GSM module ('+CMGS: <mr>' received), there is no
+    fixed delay between parts.
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send (sent as MMS if it does not fit in one SMS)
+      force_text_mode -- (bool, default: PDU mode used) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+      network_delay_sec -- (int, default: 5sec) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float, optional, default: no rate limit) Minimum time between sending of 2 parts (rate limit, also applied
+                                                                         with the parts of the previously sent message)
+
+    return: (bool, [int]) (All parts sent, Message reference of each sent part (in sending order, stop at first failed part))
+    """
+    status, all_references = self.sendSMSAndGetStatus(phone_number, msg, force_text_mode, network_delay_sec, min_part_interval_sec)
+    return status == GSMTC35.eSmsSendStatus.SENT, all_references
+
+
+  def sendSMSAndGetStatus(self, phone_number, msg, force_text_mode=False, network_delay_sec=5, min_part_interval_sec=0):
+    """Send SMS/MMS to specific phone number and get sending status and message reference of each part
+
+    Same as {sendSMSAndGetReferences()} but tells if a SMS which was not sent can be sent again
+    (nothing was sent) or not (some parts may have been sent).
+
+    Keyword arguments:
+      phone_number, msg, force_text_mode, network_delay_sec, min_part_interval_sec -- See {sendSMSAndGetReferences()}
+
+    return: (GSMTC35.eSmsSendStatus, [int]) (Sending status, Message reference of each sent part (in sending order,
+                                             stop at first failed part))
+    """
+    all_parts = self.__getSmsPartsToSend(phone_number, msg, force_text_mode)
+    if len(all_parts) <= 0:
+      return GSMTC35.eSmsSendStatus.NOT_SENT, []
+
+    return self.__sendSmsParts(all_parts, self.__sms_format, network_delay_sec, min_part_interval_sec)
+
+
+  def __sendSmsParts(self, all_parts, sms_format, network_delay_sec, min_part_interval_sec, max_retries=0, retry_delay_sec=0):
+    """Send all parts of a SMS/MMS one after the other (see {__getSmsPartsToSend()})
+
+    Note: The GSM module is only locked while sending each part (other functions
+          can use the GSM module between parts and while waiting to send a part again)
+
+    Keyword arguments:
+      all_parts -- ([(string, string)]) Command and content of each part to send
+      sms_format -- (GSMTC35.__eSmsFormat) SMS format used to encode the parts
+      network_delay_sec -- (int) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float) Minimum time between sending of 2 parts (rate limit, 0 if not used)
+      max_retries -- (int, optional) Number of times a part refused by the GSM module ('ERROR' or '+CMS ERROR') is sent again
+      retry_delay_sec -- (float, optional) Time to wait before sending a refused part again (doubled at each retry)
+
+    return: (GSMTC35.eSmsSendStatus, [int]) (Sending status, Message reference of each sent part (in sending order,
+                                             stop at first failed part))
+    """
+    all_references = []
+    for cmd, content in all_parts:
+      for retry in range(max_retries + 1):
+        if retry > 0:
+          logging.warning("Sending part "+str(len(all_references)+1)+" again (retry "+str(retry)+"/"+str(max_retries)+")")
+          time.sleep(retry_delay_sec * (2 ** (retry - 1)))
+
+        # Rate limit (if needed)
+        if (self.__last_sms_part_time is not None) and (min_part_interval_sec > 0):
+          remaining_time = self.__last_sms_part_time + min_part_interval_sec - time.monotonic()
+          if remaining_time > 0:
+            logging.debug("Wait "+str(remaining_time)+"sec before sending next message part (rate limit)")
+            time.sleep(remaining_time)
+        self.__last_sms_part_time = time.monotonic()
+
+        reference, is_refused = self.__sendSmsPart(cmd, content, sms_format, network_delay_sec)
+        if reference is not None:
+          all_references.append(reference)
+          break
+        if not is_refused:
+          # Part may have been sent (sending it again could send the same SMS twice)
+          break
+      if reference is None:
+        logging.error("Failed to send part "+str(len(all_references)+1)+"/"+str(len(all_parts))+" of the message")
+        if is_refused and len(all_references) <= 0:
+          return GSMTC35.eSmsSendStatus.NOT_SENT, all_references
+        return GSMTC35.eSmsSendStatus.UNKNOWN, all_references
+
+    return GSMTC35.eSmsSendStatus.SENT, all_references
+
+
+  def __sendSmsPart(self, cmd, content, sms_format, network_delay_sec):
+    """Send one SMS (or one part of a MMS) and get its message reference
+
+    Keyword arguments:
+      cmd -- (string) Send command ('AT+CMGS=...')
+      content -- (string) Content to send once the GSM module asks for it
+      sms_format -- (GSMTC35.__eSmsFormat) SMS format used to encode the part
+      network_delay_sec -- (int) Maximum network delay to add when waiting the SMS to be sent
+
+    return: (int, bool) Message reference of the SMS (None if an error occured),
+                        SMS refused by the GSM module ('ERROR' or '+CMS ERROR', not waited until timeout, SMS not sent for sure)
+    """
+    with self.__lock:
+      # SMS format may have been changed by another function since the part was encoded
+      if not self.__setSmsFormat(sms_format):
+        return None, True
+
+      self.__deleteAllRxData()
+      if not self.__sendLine(cmd):
+        return None, False
+
+      # Content is not written if the GSM module answers an error instead of the prompt (SMS not sent for sure)
+      prompt_answer = self.__getPromptAnswer()
+      if not prompt_answer.startswith(GSMTC35.__PROMPT):
+        return None, len(prompt_answer) > 0
+      if self.__serial.write(content.encode()) <= 0:
+        logging.warning("Failed to write \""+str(content)+"\" to GSM (after).")
+        return None, False
+      logging.debug("[OUT] "+str(content))
+
+      reference = None
+      deadline = time.time() + self.__timeout_sec + network_delay_sec
+      while self.__waitIncomingData(deadline):
+        line = self.__readLine()
+        if line.startswith("+CMGS:"):
+          try:
+            reference = int(line[6:].split(",")[0])
+          except ValueError:
+            logging.error("Invalid message reference: \""+str(line)+"\"")
+        elif line == GSMTC35.__RETURN_OK:
+          return reference, False
+        elif line == GSMTC35.__RETURN_ERROR or line.startswith("+CMS ERROR"):
+          logging.error("GSM module failed to send SMS: \""+str(line)+"\"")
+          return None, True
+
+      logging.error("Impossible to get SMS sending result on time")
+      return None, False
+
+
+  def __getSmsPartsToSend(self, phone_number, msg, force_text_mode):
+    """Encode SMS/MMS and get all commands needed to send it (SMS format is changed if needed)
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send
+      force_text_mode -- (bool) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+
+    return: ([(string, string)]) Command and content of each part to send (empty if failed)
+    """
     if len(msg) <= 0 or len(phone_number) <= 0:
       logging.error("Message to send or phone number can't be empty")
-      return False
+      return []
 
     using_text_mode = force_text_mode
     if not using_text_mode:
-      using_text_mode = not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGF=0")
+      using_text_mode = not self.__setSmsFormat(GSMTC35.__eSmsFormat.PDU)
 
     if not using_text_mode:
-      use_7bit, all_encoded_user_data_and_length = GSMTC35.__pack7Bit(msg)
+      use_7bit, all_encoded_user_data_and_length = GSMTC35.__pack7Bit(msg, 0)
+      if not use_7bit:
+        # Encode message into UCS-2 (UTF16)
+        all_encoded_user_data_and_length = GSMTC35.__packUCS2(msg, 0)
+
+      if len(all_encoded_user_data_and_length) > 1:
+        # Reference of the multipart message (only allocated if the message really needs several parts)
+        user_data_id = self.__multipart_references.getNextReference()
+        if use_7bit:
+          all_encoded_user_data_and_length = GSMTC35.__pack7Bit(msg, user_data_id)[1]
+        else:
+          all_encoded_user_data_and_length = GSMTC35.__packUCS2(msg, user_data_id)
+
       if use_7bit:
         logging.debug("Message will be sent in 7bit mode (default GSM alphabet)")
       else:
-        # Encode message into UCS-2 (UTF16)
         logging.debug("Message will be sent in UCS-2 mode (Utf16)")
-        all_encoded_user_data_and_length = GSMTC35.__packUCS2(msg)
 
       if len(all_encoded_user_data_and_length) <= 0:
         logging.error("Failed to encode SMS content")
-        return False
+        return []
 
       logging.debug("all_encoded_user_data_and_length:\n - "+str('\n - '.join(all_encoded_user_data_and_length)))
 
@@ -1986,38 +2294,29 @@ class GSMTC35:
         base_encoded_message += "08"
 
       # User data length (UDL, 1 byte) + User data (UD)
-      result = True
-      count = 0
+      all_parts = []
       for encoded_user_data_and_length in all_encoded_user_data_and_length:
         fully_encoded_message = base_encoded_message + encoded_user_data_and_length
         fully_encoded_message = fully_encoded_message.upper()
         logging.debug("fully encoded message="+str(fully_encoded_message))
 
-        # Wait a bit every time a part of the message is sent
-        if (len(all_encoded_user_data_and_length) > 1) and (count > 0):
-          logging.debug("Wait a bit before send next message part")
-          time.sleep(network_delay_sec)
-        count += 1
-
-        # Send the SMS or all multipart messages (MMS)
         # AT+CMGS=SIZE with SIZE = message size - service center length and content (1 byte)
-        if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGS=" \
-                                            +str(int((len(fully_encoded_message)-2)/2)), \
-                                            after=fully_encoded_message+GSMTC35.__CTRL_Z, \
-                                            additional_timeout=network_delay_sec):
-          result = False
-
-      if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGF=1"):
-        logging.warning("Could not go back to text mode")
+        all_parts.append((GSMTC35.__NORMAL_AT+"CMGS="+str(int((len(fully_encoded_message)-2)/2)),
+                          fully_encoded_message+GSMTC35.__CTRL_Z))
+      return all_parts
     else:
       if using_text_mode and (not force_text_mode):
         logging.warning("Could not go to PDU mode, trying to send message in normal mode, some character may be missing")
 
+      if not self.__setSmsFormat(GSMTC35.__eSmsFormat.TEXT):
+        logging.error("Could not go to text mode")
+        return []
+
       msg_length = len(msg)
       # Check if must be sent in multiple SMS or not (separate SMS since Text mode can't handle multipart SMS)
       n = 140
       if msg_length > 70:
-        if GSMTC35.__is7BitCompatible(msg):
+        if pdu.isGsm0338Compatible(msg):
           if msg_length > 140:
             logging.warning("Message will be sent in multiple <=140 char SMS (not multipart SMS because Text Mode is used)")
           else:
@@ -2028,20 +2327,12 @@ class GSMTC35:
       else:
         logging.debug("SMS can be sent in one unicode or basic part")
 
-      # Sending all SMS
-      all_sms_to_send = [msg[i:i+n] for i in range(0, len(msg), n)]
-      result = True
-      for sms_to_send in all_sms_to_send:
-        if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGS=\"" \
-                                            +phone_number+"\"", \
-                                            after=sms_to_send+GSMTC35.__CTRL_Z, \
-                                            additional_timeout=network_delay_sec):
-          result = False
-
-    return result
+      # All SMS to send
+      return [(GSMTC35.__NORMAL_AT+"CMGS=\""+phone_number+"\"", msg[i:i+n]+GSMTC35.__CTRL_Z)
+              for i in range(0, len(msg), n)]
 
 
-  def getSMS(self, sms_type=eSMS.ALL_SMS, decode_sms=True, force_text_mode=False, waiting_time_sec=10):
+  def getSMS(self, sms_type=eSMS.ALL_SMS, decode_sms=True, force_text_mode=False, waiting_time_sec=10, use_sms_record=False):
     """Get SMS (using PDU mode, fallback with Text mode if failed)
 
     Keyword arguments:
@@ -2050,6 +2341,8 @@ class GSMTC35:
       decode_sms -- (bool, optional, default: True) Decode SMS content or keep it in encoded format (+ charset)
       force_text_mode -- (bool, optional, default: False) Force to use 'text mode' instead of 'pdu mode' to get sms (may lead to inconsistent sms content)
       waiting_time_sec -- (int, optional) Time to wait SMS to be displayed by GSM module
+      use_sms_record -- (bool, optional, default: False) Get list of {pdu.SmsRecord} (same fields as dictionaries,
+                                                          lighter if a lot of SMS are retrieved) instead of list of dictionaries
 
     return: ([{"index":, "status":, "phone_number":, "date":, "time":, "sms", "sms_encoded":},]) List of requested SMS (list of dictionaries)
             Explanation of dictionaries content:
@@ -2068,8 +2361,9 @@ class GSMTC35:
               If PDU mode worked and that the SMS has an header:
               - header_iei (int) Header IEI of the SMS
               - header_ie_data (string) Header IE data of the SMS (encoded in hexadecimal readable format)
+              - header_elements ([(int, string)]) All information elements (IEI and IE data in hexadecimal readable format) of the header
               If PDU mode worked and that the SMS has an header and is multipart (MMS):
-              - header_multipart_ref_id (int) ID of the MMS
+              - header_multipart_ref_id (int) ID of the MMS (8 or 16 bit reference)
               - header_multipart_current_part_nb (int) Current part of the MMS
               - header_multipart_nb_of_part (int) Total number of part of the MMS
     """
@@ -2078,7 +2372,7 @@ class GSMTC35:
     using_text_mode = force_text_mode
     if not force_text_mode:
       # Trying to go in PDU mode (if fails, use text mode)
-      using_text_mode = not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGF=0")
+      using_text_mode = not self.__setSmsFormat(GSMTC35.__eSmsFormat.PDU)
 
     if not using_text_mode:
       # Getting SMS using PDU mode
@@ -2100,23 +2394,19 @@ class GSMTC35:
               sms = {}
         elif "index" in sms:
           # Content of the previously detected SMS should be there
-          # Do not throw if SMS is not decoded successfully (for reliability)
-          is_decoded = False
-          try:
-            decoded_data = GSMTC35.__decodePduSms(line, decode_sms)
-            is_decoded = True
-          except ValueError as e:
-            logging.error("One of the SMS is not valid, sms hexa content: \""+str(line)+"\": "+str(e))
-            decoded_data = {}
-          except IndexError as e:
-            logging.error("One of the SMS is not valid, sms hexa content: \""+str(line)+"\": "+str(e))
-            decoded_data = {}
-
-          if is_decoded and ("sms" in decoded_data) and ("phone_number" in decoded_data) \
-             and ("date" in decoded_data) and ("time" in decoded_data) and ("charset" in decoded_data):
-            # SMS is valid (merge sms data and add sms to all sms)
-            sms.update(decoded_data)
-            all_sms.append(sms)
+          if use_sms_record:
+            decoded_data = pdu.decodeSms(line, decode_sms)
+            if decoded_data.isValid():
+              # SMS is valid (add sms index and status to the record)
+              decoded_data.index = sms["index"]
+              decoded_data.status = sms["status"]
+              all_sms.append(decoded_data)
+          else:
+            decoded_data = GSMTC35.__decodeValidPduSms(line, decode_sms)
+            if bool(decoded_data):
+              # SMS is valid (merge sms data and add sms to all sms)
+              sms.update(decoded_data)
+              all_sms.append(sms)
 
           # Let's check if there is other sms !
           sms = {}
@@ -2124,13 +2414,14 @@ class GSMTC35:
           # Inconsistent data, continue
           logging.warning("One of the SMS is not valid, command options (2): \""+str(line)+"\"")
           sms = {}
-      # Go back to text mode
-      if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CMGF=1"):
-        logging.warning("Could not go back to text mode")
     else:
       # Getting SMS using text mode
       if using_text_mode and (not force_text_mode):
         logging.warning("Could not go to PDU mode, trying to get sms with normal mode, some character may not be displayed")
+
+      if not self.__setSmsFormat(GSMTC35.__eSmsFormat.TEXT):
+        logging.error("Could not go to text mode")
+        return all_sms
       all_lines_retrieved = False
       lines = self.__sendCmdAndGetFullResult(cmd=GSMTC35.__NORMAL_AT+"CMGL=\""+str(sms_type)+"\"", error_result="",
                                              additional_timeout=waiting_time_sec)
@@ -2183,6 +2474,9 @@ class GSMTC35:
           sms["sms"] = sms["sms"][:len(sms["sms"])-1]
         all_sms.append(sms)
 
+      if use_sms_record:
+        all_sms = [pdu.SmsRecord.fromDict(sms) for sms in all_sms]
+
     return all_sms
 
 
@@ -2213,6 +2507,339 @@ class GSMTC35:
     return all_delete_ok
 
 
+  def readSMS(self, index, decode_sms=True, waiting_time_sec=0):
+    """Get one SMS from its index (using PDU mode)
+
+    Keyword arguments:
+      index -- (int) Index of the SMS in the GSM module storage
+      decode_sms -- (bool, optional, default: True) Decode SMS content or keep it in encoded format (+ charset)
+      waiting_time_sec -- (int, optional) Time to wait SMS to be displayed by GSM module
+
+    return: ({"index":, "status":, "phone_number":, "date":, "time":, "sms", "sms_encoded":, ...}) Requested SMS
+            (see {getSMS()} for dictionary content), empty if SMS not found or invalid
+    """
+    try:
+      index = int(index)
+    except ValueError:
+      logging.error("Invalid SMS index \""+str(index)+"\"")
+      return {}
+
+    if not self.__setSmsFormat(GSMTC35.__eSmsFormat.PDU):
+      logging.error("Could not go to PDU mode to read SMS")
+      return {}
+
+    lines = self.__sendCmdAndGetFullResult(cmd=GSMTC35.__NORMAL_AT+"CMGR="+str(index),
+                                           additional_timeout=waiting_time_sec)
+
+    if len(lines) < 2 or lines[0][:7] != "+CMGR: ":
+      logging.warning("No SMS at index "+str(index))
+      return {}
+
+    decoded_data = GSMTC35.__decodeValidPduSms(lines[1], decode_sms)
+    if not bool(decoded_data):
+      return {}
+
+    sms = {}
+    sms["index"] = index
+    sms["status"] = GSMTC35.__smsTypePduToText(lines[0][7:].split(",")[0])
+    sms.update(decoded_data)
+    return sms
+
+
+  def enableNewSmsIndication(self, direct_delivery=False):
+    """Ask the GSM module to notify new SMS (received SMS are then available with {getNewSMS()})
+
+    Keyword arguments:
+      direct_delivery -- (bool, optional, default: False) Send new SMS content directly (+CMT)
+                         instead of storing it in the GSM module and sending its index (+CMTI)
+
+    return: (bool) New SMS indication enabled
+    """
+    with self.__lock:
+      for urc_type in [GSMTC35.eUnsolicitedResult.NEW_SMS_INDICATION, GSMTC35.eUnsolicitedResult.NEW_SMS]:
+        if not self.__onNewSmsUnsolicitedResult in self.__unsolicited_result_handlers.get(urc_type, []):
+          self.addUnsolicitedResultHandler(urc_type, self.__onNewSmsUnsolicitedResult)
+
+    cmd = GSMTC35.__NORMAL_AT+"CNMI=1,1"
+    if direct_delivery:
+      cmd = GSMTC35.__NORMAL_AT+"CNMI=1,2"
+
+    if not self.__sendCmdAndCheckResult(cmd=cmd):
+      logging.error("Can't enable mode showing received SMS (CNMI command)")
+      return False
+
+    return True
+
+
+  def disableNewSmsIndication(self):
+    """Ask the GSM module to not notify new SMS anymore (default state after {setup()})
+
+    return: (bool) New SMS indication disabled
+    """
+    with self.__lock:
+      for urc_type in [GSMTC35.eUnsolicitedResult.NEW_SMS_INDICATION, GSMTC35.eUnsolicitedResult.NEW_SMS]:
+        if self.__onNewSmsUnsolicitedResult in self.__unsolicited_result_handlers.get(urc_type, []):
+          self.removeUnsolicitedResultHandler(urc_type, self.__onNewSmsUnsolicitedResult)
+
+    if not self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CNMI=0,0"):
+      logging.error("Can't disable mode showing received SMS (CNMI command)")
+      return False
+
+    return True
+
+
+  def getNewSMS(self, waiting_time_sec=0, decode_sms=True, delete_sms=False):
+    """Generator of SMS received since new SMS indication is enabled (see {enableNewSmsIndication()})
+
+    Only new SMS are read (one by one) so that the time to get a SMS does not
+    depend on the number of SMS stored in the GSM module.
+
+    Example:
+    '''
+    for sms in gsm.getNewSMS(waiting_time_sec=60, delete_sms=True):
+      print(str(sms["phone_number"])+": "+str(sms["sms"]))
+    '''
+
+    Keyword arguments:
+      waiting_time_sec -- (int, optional, default: 0) Max time to wait new SMS (-1 for indefinitly)
+      decode_sms -- (bool, optional, default: True) Decode SMS content or keep it in encoded format (+ charset)
+      delete_sms -- (bool, optional, default: False) Delete SMS from the GSM module once read
+
+    return: (generator of {"index":, "status":, "phone_number":, "date":, "time":, "sms", "sms_encoded":, ...})
+            New SMS (see {getSMS()} for dictionary content, index is -1 if SMS was directly sent (+CMT))
+    """
+    deadline = time.time() + waiting_time_sec
+    while True:
+      # Wait by steps of one hour if waiting indefinitly
+      if waiting_time_sec < 0:
+        deadline = time.time() + 3600
+
+      if len(self.__new_sms) <= 0:
+        self.processUnsolicitedResults(max(0, deadline - time.time()))
+
+      while len(self.__new_sms) > 0:
+        new_sms = self.__new_sms.popleft()
+        if isinstance(new_sms, tuple):
+          # SMS directly sent by the GSM module
+          sms = GSMTC35.__parseNewSms(new_sms[0], new_sms[1], new_sms[2], decode_sms)
+        else:
+          # SMS stored in the GSM module
+          sms = self.readSMS(new_sms, decode_sms)
+          if bool(sms) and delete_sms and (not self.__deleteSpecificSMS(new_sms)):
+            logging.warning("Failed to delete SMS at index "+str(new_sms))
+
+        if bool(sms):
+          yield sms
+
+      if waiting_time_sec >= 0 and time.time() >= deadline:
+        return
+
+
+  @staticmethod
+  def __parseNewSms(line, data, sms_format, decode_sms):
+    """Parse SMS directly sent by the GSM module (+CMT)
+
+    Keyword arguments:
+      line -- (string) Unsolicited result line (example: '+CMT: ,24' in PDU mode)
+      data -- (string) Content of the SMS (PDU in PDU mode)
+      sms_format -- (GSMTC35.__eSmsFormat) SMS format of the GSM module when the SMS was received
+      decode_sms -- (bool) Decode SMS content or keep it in encoded format (+ charset)
+
+    return: ({}) SMS data (see {getSMS()} for dictionary content), empty if not valid
+    """
+    sms = {}
+    sms["index"] = -1
+    sms["status"] = GSMTC35.eSMS.UNREAD_SMS
+
+    if sms_format == GSMTC35.__eSmsFormat.TEXT:
+      # SMS sent in text mode (example: '+CMT: "+33601020304",,"19/11/09,10:10:10+04"')
+      split_list = line[6:].split(",")
+      if len(split_list) < 4:
+        logging.error("Invalid new SMS \""+str(line)+"\"")
+        return {}
+      sms["phone_number"] = GSMTC35.__deleteQuote(split_list[0].strip())
+      sms["date"] = GSMTC35.__deleteQuote(split_list[2])
+      sms["time"] = GSMTC35.__deleteQuote(split_list[3])
+      sms["sms"] = data
+      sms["charset"] = "TC35TextModeInconsistentCharset"
+      return sms
+
+    decoded_data = GSMTC35.__decodeValidPduSms(data, decode_sms)
+    if not bool(decoded_data):
+      return {}
+
+    sms.update(decoded_data)
+    return sms
+
+
+  def __onNewSmsUnsolicitedResult(self, urc_type, line, data):
+    """Unsolicited result handler storing new SMS (or their index) until read with {getNewSMS()}
+
+    Note: No command can be sent from this handler (a command may be in progress)
+
+    Keyword arguments:
+      urc_type -- (string) Unsolicited result type (+CMTI or +CMT)
+      line -- (string) Unsolicited result line
+      data -- (string) Additional line of data (content of the SMS for +CMT)
+    """
+    if urc_type == GSMTC35.eUnsolicitedResult.NEW_SMS:
+      # Format of the SMS depends on the SMS format used when it was received
+      self.__new_sms.append((line, data, self.__sms_format))
+      return
+
+    # Example: '+CMTI: "SM",3'
+    try:
+      self.__new_sms.append(int(line.split(",")[-1]))
+    except ValueError:
+      logging.error("Invalid new SMS indication \""+str(line)+"\"")
+
+
+  ############################### SMS SEND QUEUE ###############################
+  def startSmsSendQueue(self, max_queue_size=100, max_retries=3, retry_delay_sec=1, network_delay_sec=5,
+                        min_part_interval_sec=0):
+    """Start a background worker sending SMS/MMS added with {queueSMS()} one after the other
+
+    Keyword arguments:
+      max_queue_size -- (int, optional) Maximum number of SMS waiting to be sent (0 for no limit)
+      max_retries -- (int, optional) Number of times a part is sent again if the GSM module refused to send it ('ERROR' or '+CMS ERROR',
+                                     parts without answer are not sent again since they may have been sent)
+      retry_delay_sec -- (float, optional) Time to wait before sending a failed part again (doubled at each retry)
+      network_delay_sec -- (int, optional) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float, optional, default: no rate limit) Minimum time between sending of 2 parts (rate limit)
+
+    return: (bool) Worker started (False if already started)
+    """
+    with self.__lock:
+      if self.__sms_send_queue_worker is not None and self.__sms_send_queue_worker.is_alive():
+        logging.warning("SMS send queue is already started")
+        return False
+
+      send_queue = queue.Queue(maxsize=max_queue_size)
+      self.__sms_send_queue_worker = threading.Thread(target=self.__sendQueuedSms,
+                                                      args=(send_queue, max_retries, retry_delay_sec,
+                                                            network_delay_sec, min_part_interval_sec))
+      self.__sms_send_queue_worker.daemon = True
+      self.__sms_send_queue_worker.start()
+      with self.__sms_send_queue_lock:
+        self.__sms_send_queue = send_queue
+
+    return True
+
+
+  def queueSMS(self, phone_number, msg, force_text_mode=False, timeout_sec=0, get_status=False):
+    """Add SMS/MMS to the send queue (see {startSmsSendQueue()}) without waiting it to be sent
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send (sent as MMS if it does not fit in one SMS)
+      force_text_mode -- (bool, default: PDU mode used) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+      timeout_sec -- (float, optional, default: do not wait) Time to wait for a free place if the queue is full (None to wait forever)
+      get_status -- (bool, optional) Future result is the {sendSMSAndGetStatus()} result instead of the {sendSMSAndGetReferences()} result
+
+    return: (concurrent.futures.Future) Future result of the sending (see {sendSMSAndGetReferences()} result,
+            use 'add_done_callback()' to be notified), None if the queue is not started or full
+    """
+    future = concurrent.futures.Future()
+    # Queue can't be stopped while adding the SMS (SMS added after the end of the worker would never be sent)
+    with self.__sms_send_queue_lock:
+      send_queue = self.__sms_send_queue
+      if send_queue is None:
+        logging.error("SMS send queue is not started")
+        return None
+
+      try:
+        send_queue.put((future, phone_number, msg, force_text_mode, get_status), block=(timeout_sec != 0), timeout=timeout_sec)
+      except queue.Full:
+        logging.warning("SMS send queue is full, SMS to "+str(phone_number)+" is not sent")
+        return None
+
+    return future
+
+
+  def getSmsSendQueueSize(self):
+    """Get number of SMS/MMS waiting to be sent by the send queue (see {startSmsSendQueue()})
+
+    return: (int) Number of SMS waiting in the queue (SMS being sent is not included)
+    """
+    send_queue = self.__sms_send_queue
+    if send_queue is None:
+      return 0
+    return send_queue.qsize()
+
+
+  def stopSmsSendQueue(self, wait=True):
+    """Stop the send queue worker started with {startSmsSendQueue()}
+
+    Keyword arguments:
+      wait -- (bool, optional) Send all SMS of the queue before stopping (else they are cancelled)
+
+    return: (bool) Worker was running
+    """
+    # No new SMS can be added
+    with self.__sms_send_queue_lock:
+      send_queue = self.__sms_send_queue
+      worker = self.__sms_send_queue_worker
+      if send_queue is None or worker is None:
+        return False
+      self.__sms_send_queue = None
+
+    if not wait:
+      while True:
+        try:
+          queued_sms = send_queue.get_nowait()
+        except queue.Empty:
+          break
+        if queued_sms is not None:
+          queued_sms[0].cancel()
+
+    send_queue.put(None)
+    if worker is not threading.current_thread():
+      worker.join()
+    self.__sms_send_queue_worker = None
+
+    return True
+
+
+  def __sendQueuedSms(self, send_queue, max_retries, retry_delay_sec, network_delay_sec, min_part_interval_sec):
+    """Background worker sending SMS of the send queue (see {startSmsSendQueue()})
+
+    Keyword arguments:
+      send_queue -- (queue.Queue) SMS to send (future, phone number, message, force text mode, give sending status), None to stop the worker
+      max_retries -- (int) Number of times a part is sent again if the GSM module refused to send it
+      retry_delay_sec -- (float) Time to wait before sending a failed part again (doubled at each retry)
+      network_delay_sec -- (int) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float) Minimum time between sending of 2 parts (rate limit)
+    """
+    logging.debug("SMS send queue worker started")
+    while True:
+      queued_sms = send_queue.get()
+      if queued_sms is None:
+        break
+
+      future, phone_number, msg, force_text_mode, get_status = queued_sms
+      if not future.set_running_or_notify_cancel():
+        continue
+
+      try:
+        # GSM module is only locked during each AT command (other functions can be used between parts and retries)
+        with self.__lock:
+          all_parts = self.__getSmsPartsToSend(phone_number, msg, force_text_mode)
+          sms_format = self.__sms_format
+        if len(all_parts) > 0:
+          status, all_references = self.__sendSmsParts(all_parts, sms_format, network_delay_sec, min_part_interval_sec,
+                                                       max_retries, retry_delay_sec)
+        else:
+          status, all_references = GSMTC35.eSmsSendStatus.NOT_SENT, []
+        if get_status:
+          future.set_result((status, all_references))
+        else:
+          future.set_result((status == GSMTC35.eSmsSendStatus.SENT, all_references))
+      except Exception as e:
+        logging.error("Failed to send queued SMS to "+str(phone_number)+": "+str(e))
+        future.set_exception(e)
+    logging.debug("SMS send queue worker stopped")
+
+
   ############################### CALL FUNCTIONS ###############################
   def hangUpCall(self):
     """Stop current call (hang up)
@@ -2489,6 +3116,8 @@ class GSMTC35:
 
     return: (bool) PIN is correct
     """
+    # SIM information may change once the PIN is entered
+    self.invalidateCache()
     return self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CPIN="+str(pin),
                                         additional_timeout=10)
 
@@ -2501,6 +3130,7 @@ class GSMTC35:
 
     return: (bool) SIM PIN lock enabled
     """
+    self.invalidateCache()
     return self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CLCK=\"SC\",1,"
                                         +str(current_pin))
 
@@ -2513,6 +3143,7 @@ class GSMTC35:
 
     return: (bool) SIM PIN unlock enabled
     """
+    self.invalidateCache()
     return self.__sendCmdAndCheckResult(cmd=GSMTC35.__NORMAL_AT+"CLCK=\"SC\",0,"
                                         +str(current_pin))
 
@@ -2529,6 +3160,7 @@ class GSMTC35:
 
     return: (bool) SIM PIN edited
     """
+    self.invalidateCache()
     if not self.lockSimPin(old_pin):
       logging.error("Impossible to lock SIM card with PIN before changing PIN")
       return False
@@ -2537,6 +3169,210 @@ class GSMTC35:
                                         +str(old_pin)+"\",\""+str(new_pin)+"\"")
 
 
+  ################################### CACHE ####################################
+  def setCacheTimeToLive(self, time_to_live_sec):
+    """Keep results of requests that (almost) never change in memory instead of
+       asking them to the GSM module each time (manufacturer, model, revision,
+       IMEI, IMSI, list of operators and phonebook restrictions)
+
+    Note: The cache is disabled by default and is invalidated at each setup,
+          reboot and PIN related operation (use invalidateCache() in any other case)
+
+    Keyword arguments:
+      time_to_live_sec -- (float) Time (in sec) to keep a result in the cache, 0 to disable the cache, negative to never expire
+
+    return: (bool) Time to live changed
+    """
+    try:
+      time_to_live_sec = float(time_to_live_sec)
+    except (TypeError, ValueError):
+      logging.error("Invalid cache time to live \""+str(time_to_live_sec)+"\"")
+      return False
+
+    self.__cache_time_to_live_sec = time_to_live_sec
+    self.invalidateCache()
+    return True
+
+
+  def invalidateCache(self):
+    """Remove all results from the cache (next requests will be sent to the GSM module)"""
+    self.__cache.clear()
+
+
+  ########################### UNSOLICITED RESULTS ##############################
+  def addUnsolicitedResultHandler(self, urc_type, handler):
+    """Register a function called each time a specific unsolicited result is received
+
+    Note: Unsolicited results are received while a command is in progress,
+          with {processUnsolicitedResults()} or with the background listener
+          (see {startUnsolicitedResultListener()}) and only if enabled
+          (see {enableUnsolicitedResults()})
+
+    Keyword arguments:
+      urc_type -- (string) Unsolicited result type (see GSMTC35.eUnsolicitedResult)
+      handler -- (function(urc_type, line, data)) Function to call with the unsolicited result type,
+                 the unsolicited result line and the additional line of data (empty if not applicable)
+
+    return: (bool) Handler registered
+    """
+    if not urc_type in GSMTC35.__UNSOLICITED_RESULTS:
+      logging.error("Invalid unsolicited result type \""+str(urc_type)+"\"")
+      return False
+
+    if not callable(handler):
+      logging.error("Unsolicited result handler must be a function")
+      return False
+
+    with self.__lock:
+      self.__unsolicited_result_handlers.setdefault(urc_type, []).append(handler)
+
+    return True
+
+
+  def removeUnsolicitedResultHandler(self, urc_type, handler):
+    """Unregister a function previously registered with {addUnsolicitedResultHandler()}
+
+    Keyword arguments:
+      urc_type -- (string) Unsolicited result type (see GSMTC35.eUnsolicitedResult)
+      handler -- (function(urc_type, line, data)) Registered function
+
+    return: (bool) Handler unregistered
+    """
+    with self.__lock:
+      handlers = self.__unsolicited_result_handlers.get(urc_type, [])
+      if not handler in handlers:
+        logging.warning("Handler not registered for unsolicited result type \""+str(urc_type)+"\"")
+        return False
+      handlers.remove(handler)
+
+    return True
+
+
+  def enableUnsolicitedResults(self, call=True, sms=True, temperature=True):
+    """Ask the GSM module to send unsolicited results (disabled by default in {setup()})
+
+    Keyword arguments:
+      call -- (bool, optional) Send phone number of incoming calls (+CLIP)
+      sms -- (bool, optional) Send storage index of new SMS (+CMTI)
+      temperature -- (bool, optional) Send temperature warnings (^SCTM)
+
+    return: (bool) All requested unsolicited results enabled
+    """
+    all_enabled = True
+    if call and not self.__sendCmdAndCheckResult(GSMTC35.__NORMAL_AT+"CLIP=1"):
+      logging.error("Can't enable mode showing phone number when calling (CLIP command)")
+      all_enabled = False
+    if sms and not self.__sendCmdAndCheckResult(GSMTC35.__NORMAL_AT+"CNMI=1,1"):
+      logging.error("Can't enable mode showing received SMS (CNMI command)")
+      all_enabled = False
+    if temperature and not self.__sendCmdAndCheckResult(GSMTC35.__BASE_AT+"^SCTM=1"):
+      logging.error("Can't enable mode showing critical temperature (SCTM command)")
+      all_enabled = False
+
+    return all_enabled
+
+
+  def disableUnsolicitedResults(self):
+    """Ask the GSM module to not send unsolicited results anymore (default state after {setup()})
+
+    return: (bool) All unsolicited results disabled
+    """
+    return self.__disableAsynchronousTriggers()
+
+
+  def processUnsolicitedResults(self, waiting_time_sec=0):
+    """Send all unsolicited results received while no command was in progress to their handlers
+
+    Note: Other received lines are kept for the next command reading them
+
+    Keyword arguments:
+      waiting_time_sec -- (float, optional) Max time to wait new unsolicited results (0 to not block)
+
+    return: (int) Number of unsolicited results received
+    """
+    with self.__lock:
+      if not self.__serial.isOpen():
+        return 0
+
+      self.__current_cmd = ""
+      deadline = time.time() + waiting_time_sec
+      nb_of_urc = 0
+      other_lines = []
+      while True:
+        while self.__isLineAvailable():
+          line = self.__readRawLine()
+          if self.__dispatchUnsolicitedResult(line) == "":
+            if line != "":
+              other_lines.append(line)
+          elif self.__pending_unsolicited_result is None:
+            # Unsolicited result fully received (additional line included)
+            nb_of_urc += 1
+        # Stop waiting as soon as unsolicited results are fully received
+        if (nb_of_urc > 0 and self.__pending_unsolicited_result is None) \
+           or time.time() >= deadline or not self.__waitIncomingData(deadline):
+          break
+
+      # Lines not being unsolicited results are not for this function
+      if len(other_lines) > 0:
+        self.__rx_buffer[0:0] = "".join(line+"\r\n" for line in other_lines).encode()
+
+      return nb_of_urc
+
+
+  def startUnsolicitedResultListener(self, period_sec=0.05):
+    """Start a background thread sending unsolicited results to their handlers
+       even if no command is in progress
+
+    Keyword arguments:
+      period_sec -- (float, optional) Time between two checks of the serial port
+
+    return: (bool) Listener started (or already started)
+    """
+    with self.__lock:
+      if self.__unsolicited_result_listener is not None and self.__unsolicited_result_listener.is_alive():
+        return True
+
+      self.__unsolicited_result_listener_stop.clear()
+      self.__unsolicited_result_listener = threading.Thread(target=self.__listenUnsolicitedResults,
+                                                            args=(period_sec,))
+      self.__unsolicited_result_listener.daemon = True
+      self.__unsolicited_result_listener.start()
+
+    return True
+
+
+  def stopUnsolicitedResultListener(self):
+    """Stop the background thread started with {startUnsolicitedResultListener()}
+
+    return: (bool) Listener was running
+    """
+    listener = self.__unsolicited_result_listener
+    if listener is None:
+      return False
+
+    self.__unsolicited_result_listener_stop.set()
+    if listener is not threading.current_thread():
+      listener.join()
+    self.__unsolicited_result_listener = None
+
+    return True
+
+
+  def __listenUnsolicitedResults(self, period_sec):
+    """Background thread checking unsolicited results (see {startUnsolicitedResultListener()})
+
+    Keyword arguments:
+      period_sec -- (float) Time between two checks of the serial port
+    """
+    logging.debug("Unsolicited result listener started")
+    while not self.__unsolicited_result_listener_stop.wait(period_sec):
+      try:
+        self.processUnsolicitedResults()
+      except Exception as e:
+        logging.error("Failed to check unsolicited results: "+str(e))
+    logging.debug("Unsolicited result listener stopped")
+
+
   ################################# SLEEP MODE #################################
   def isInSleepMode(self):
     """Check if the GSM module is in sleep mode (if yes, nothing can be done
@@ -2600,20 +3436,27 @@ class GSMTC35:
     time_to_wait = 3600
     if max_additional_waiting_time_in_sec > 0:
       time_to_wait = max_additional_waiting_time_in_sec
-    data = self.__getNotEmptyLine(additional_timeout=time_to_wait)
+    data = ""
+    wakeup_type = ""
+    with self.__lock:
+      deadline = time.time() + self.__timeout_sec + time_to_wait
+      while len(data) <= 0 and self.__waitIncomingData(deadline):
+        data = self.__readRawLine()
+        # Unsolicited result waking up the module is also sent to its handlers
+        wakeup_type = self.__dispatchUnsolicitedResult(data)
 
     if len(data) > 0:
       # At least one character was received (it means sleep mode is not active anymore)
-      if len(data) >= 5:
-        wakeup_type = data[:5]
-        if wakeup_type == "+CMTI":
-          gsm_waked_up_by_sms = True
-        elif wakeup_type == "+CLIP" or wakeup_type == "RING":
-          gsm_waked_up_by_call = True
-        elif wakeup_type == "^SCTM":
-          gsm_waked_up_by_temperature = True
-        elif wakeup_type == "+CALA":
-          gsm_waked_up_by_alarm = True
+      if wakeup_type == GSMTC35.eUnsolicitedResult.NEW_SMS_INDICATION \
+         or wakeup_type == GSMTC35.eUnsolicitedResult.NEW_SMS:
+        gsm_waked_up_by_sms = True
+      elif wakeup_type == GSMTC35.eUnsolicitedResult.CALLER_ID \
+           or wakeup_type == GSMTC35.eUnsolicitedResult.RING:
+        gsm_waked_up_by_call = True
+      elif wakeup_type == GSMTC35.eUnsolicitedResult.TEMPERATURE:
+        gsm_waked_up_by_temperature = True
+      elif wakeup_type == GSMTC35.eUnsolicitedResult.ALARM:
+        gsm_waked_up_by_alarm = True
 
       # Set to asynchronous element to default state
       self.__disableAsynchronousTriggers()
@@ -3325,13 +4168,14 @@ def main(parsed_args = sys.argv[1:]):
         print("GSM module is not alive, can't get information")
         sys.exit(2)
       print("Is module alive: True")
-      print("GSM module Manufacturer ID: "+str(gsm.getManufacturerId()))
-      print("GSM module Model ID: "+str(gsm.getModelId()))
-      print("GSM module Revision ID: "+str(gsm.getRevisionId()))
-      print("Product serial number ID (IMEI): "+str(gsm.getIMEI()))
-      print("International Mobile Subscriber Identity (IMSI): "+str(gsm.getIMSI()))
-      print("Current operator: "+str(gsm.getOperatorName()))
-      sig_strength = gsm.getSignalStrength()
+      information = gsm.getInformation()
+      print("GSM module Manufacturer ID: "+str(information[GSMTC35.eInformation.MANUFACTURER_ID]))
+      print("GSM module Model ID: "+str(information[GSMTC35.eInformation.MODEL_ID]))
+      print("GSM module Revision ID: "+str(information[GSMTC35.eInformation.REVISION_ID]))
+      print("Product serial number ID (IMEI): "+str(information[GSMTC35.eInformation.IMEI]))
+      print("International Mobile Subscriber Identity (IMSI): "+str(information[GSMTC35.eInformation.IMSI]))
+      print("Current operator: "+str(information[GSMTC35.eInformation.OPERATOR_NAME]))
+      sig_strength = information[GSMTC35.eInformation.SIGNAL_STRENGTH]
       if sig_strength != -1:
         print("Signal strength: "+str(sig_strength)+"dBm")
       else:
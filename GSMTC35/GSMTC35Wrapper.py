@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Base of the GSM TC35 library front-ends (AsyncGSMTC35, PriorityGSMTC35):
+  Every public function of GSMTC35 is executed by the worker of the front-end
+  (only one function is executed at a time on the serial port of a module).
+
+  The worker is the only thread using the serial port: generator functions
+  (example: getNewSMS()) are fully read by the worker and give a list, and
+  functions starting other threads using the serial port can't be used.
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.+"
+__version__ = "1.0 (2019/11/16)"
+__status__ = "Usable for any project"
+
+import abc
+import functools
+import inspect
+import logging
+
+try:
+  from .GSMTC35 import GSMTC35
+except ImportError:
+  from GSMTC35 import GSMTC35
+
+class GSMTC35Wrapper(abc.ABC):
+  """Base GSM TC35 front-end class
+
+  Enums (eSMS, eCall, ...) are directly available (example: 'AsyncGSMTC35.eSMS').
+
+  Note: Generator functions give a list once the generator is fully read by the worker
+        (example: 'getNewSMS()' must not wait indefinitly, 'waiting_time_sec' can't be -1)
+  """
+  def __init__(self, gsm, executor):
+    """Initialize the GSM module front-end
+
+    Keyword arguments:
+      gsm -- (GSMTC35) GSMTC35 instance to use (must not be used outside of this class anymore)
+      executor -- (any executor with 'shutdown(wait)') Worker executing functions using {gsm}
+    """
+    self.__gsm = gsm
+    self.__executor = executor
+
+  def __getattr__(self, name):
+    """Get GSMTC35 enum or front-end version of GSMTC35 public function {name} (see {_wrapFunction()})"""
+    if name.startswith("_"):
+      raise AttributeError(name)
+
+    attribute = getattr(self.__gsm, name)
+    if inspect.isclass(attribute) or not callable(attribute):
+      return attribute
+
+    if inspect.isgeneratorfunction(attribute):
+      # Generator must be read by the worker (reading it uses the serial port)
+      generator_function = attribute
+      @functools.wraps(generator_function)
+      def getAllItems(*args, **kwargs):
+        return list(generator_function(*args, **kwargs))
+      attribute = getAllItems
+
+    return self._wrapFunction(name, attribute)
+
+  @abc.abstractmethod
+  def _wrapFunction(self, name, function):
+    """Get front-end version of a GSMTC35 public function
+
+    Keyword arguments:
+      name -- (string) Name of the GSMTC35 function
+      function -- (callable) GSMTC35 function (bound to the GSMTC35 instance)
+
+    return: (callable) Function executing {function} with the worker of the front-end
+    """
+
+  def getSynchronousInstance(self):
+    """Get GSMTC35 instance used by this class (must not be used while functions are in progress)
+
+    return: (GSMTC35) GSMTC35 instance
+    """
+    return self.__gsm
+
+  def startSmsSendQueue(self, *args, **kwargs):
+    """Not available: SMS send queue of GSMTC35 would use the serial port from another thread than the worker
+
+    return: (bool) False
+    """
+    logging.error("SMS send queue can't be used with "+type(self).__name__+" (SMS must be sent by its worker)")
+    return False
+
+  def startUnsolicitedResultListener(self, *args, **kwargs):
+    """Not available: Listener of GSMTC35 would use the serial port from another thread than the worker
+       (call 'processUnsolicitedResults()' regularly instead)
+
+    return: (bool) False
+    """
+    logging.error("Unsolicited result listener can't be used with "+type(self).__name__
+                  +" (call processUnsolicitedResults() regularly instead)")
+    return False
+
+  def shutdown(self, wait=True):
+    """Stop the worker of this GSM module (no function can be used after this call)
+
+    Note: The GSM session is not closed, call 'close()' first if needed
+
+    Keyword arguments:
+      wait -- (bool, optional) Wait end of all already requested functions
+    """
+    logging.debug("Stopping "+type(self).__name__+" worker")
+    self.__executor.shutdown(wait=wait)
+
+# Enums are available from the front-end classes themselves (and not only from instances)
+for _name, _attribute in vars(GSMTC35).items():
+  if inspect.isclass(_attribute) and not _name.startswith("_"):
+    setattr(GSMTC35Wrapper, _name, _attribute)
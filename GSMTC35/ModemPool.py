@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Pool of GSM modules of the GSM TC35 library: SMS are sent by the GSM module
+  having the least SMS waiting to be sent (each GSM module sends its SMS in
+  its own thread, see GSMTC35.startSmsSendQueue()).
+
+  GSM modules are regularly checked (alive and signal strength) and GSM
+  modules failing to send SMS are not used until they are healthy again
+  (SMS refused by a GSM module are sent by another GSM module, SMS which may
+  have been sent are never sent again). Only the health checker (started by
+  {setup()}) can set a GSM module healthy again.
+
+  Example of use:
+  '''
+  from GSMTC35.ModemPool import ModemPool
+
+  pool = ModemPool()
+  if pool.setup(["/dev/ttyUSB0", "/dev/ttyUSB1", "/dev/ttyUSB2"], _pin="1234") > 0:
+    future = pool.queueSMS("+33601020304", "Hello")
+    print("SMS sent: "+str(future.result()))
+  pool.close()
+  '''
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.+"
+__version__ = "1.0 (2019/11/13)"
+__status__ = "Usable for any project"
+
+import concurrent.futures
+import logging
+import threading
+
+try:
+  from .GSMTC35 import GSMTC35
+except ImportError:
+  from GSMTC35 import GSMTC35
+
+class ModemPool:
+  """Pool of GSM modules sending SMS (load balanced)"""
+  def __init__(self, min_signal_strength_dbm=-113, max_consecutive_failures=3, max_modem_attempts=2):
+    """Initialize the pool (no GSM module is used before {setup()})
+
+    Keyword arguments:
+      min_signal_strength_dbm -- (int, optional) Minimum signal strength of a healthy GSM module
+      max_consecutive_failures -- (int, optional) Number of SMS failing in a row before a GSM module is not used anymore
+      max_modem_attempts -- (int, optional) Number of GSM modules trying to send a SMS before considering it failed
+    """
+    self.__min_signal_strength_dbm = min_signal_strength_dbm
+    self.__max_consecutive_failures = max(1, max_consecutive_failures)
+    self.__max_modem_attempts = max(1, max_modem_attempts)
+    self.__lock = threading.RLock()
+    self.__modems = []
+    self.__health_checker = None
+    self.__health_checker_stop = threading.Event()
+
+  def setup(self, all_ports, max_queue_size=100, max_retries=3, retry_delay_sec=1, network_delay_sec=5,
+            min_part_interval_sec=0, health_check_period_sec=60, **setup_kwargs):
+    """Initialize all GSM modules (at the same time), start their SMS send queue and the health checker
+
+    Keyword arguments:
+      all_ports -- (list of string) Serial port name of each GSM module
+      max_queue_size -- (int, optional) Maximum number of SMS waiting to be sent by each GSM module (0 for no limit)
+      max_retries -- (int, optional) Number of times a part is sent again by the same GSM module if it failed
+      retry_delay_sec -- (float, optional) Time to wait before sending a failed part again (doubled at each retry)
+      network_delay_sec -- (int, optional) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float, optional, default: no rate limit) Minimum time between sending of 2 parts by each GSM module
+      health_check_period_sec -- (float, optional) Time between 2 health checks (0 to not start the health checker,
+                                 unhealthy GSM modules are then never used again except if {checkHealth()} is called)
+      setup_kwargs -- Other parameters of GSMTC35.setup() (example: '_pin="1234"')
+
+    return: (int) Number of initialized GSM modules (not initialized GSM modules are not used)
+    """
+    def setupModem(port):
+      gsm = GSMTC35()
+      if not gsm.setup(_port=port, **setup_kwargs):
+        logging.error("Failed to initialize GSM module of "+str(port))
+        return None
+      if not gsm.startSmsSendQueue(max_queue_size=max_queue_size, max_retries=max_retries,
+                                   retry_delay_sec=retry_delay_sec, network_delay_sec=network_delay_sec,
+                                   min_part_interval_sec=min_part_interval_sec):
+        gsm.close()
+        return None
+      return gsm
+
+    # Setup of a GSM module takes multiple seconds, all GSM modules are initialized at the same time
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(all_ports))) as executor:
+      all_gsm = list(executor.map(setupModem, all_ports))
+
+    with self.__lock:
+      for port, gsm in zip(all_ports, all_gsm):
+        if gsm is not None:
+          self.__modems.append({"port": str(port), "gsm": gsm, "healthy": True, "outstanding": 0,
+                                "consecutive_failures": 0, "sent": 0, "failed": 0,
+                                "checking": False, "sms_waiting_check": []})
+      nb_of_modems = len(self.__modems)
+
+    logging.debug(str(nb_of_modems)+" GSM modules in the pool")
+
+    # GSM modules which are not used anymore are only used again once checked
+    if nb_of_modems > 0 and health_check_period_sec > 0:
+      with self.__lock:
+        is_started = self.__health_checker is not None and self.__health_checker.is_alive()
+      if not is_started:
+        self.startHealthChecker(period_sec=health_check_period_sec)
+
+    return nb_of_modems
+
+  def close(self):
+    """Stop the health checker, cancel SMS not sent yet and close all GSM modules"""
+    self.stopHealthChecker()
+    with self.__lock:
+      all_modems = self.__modems
+      self.__modems = []
+      all_waiting_sms = [sms for modem in all_modems for sms in modem["sms_waiting_check"]]
+    for future, phone_number, msg, force_text_mode, excluded_ports in all_waiting_sms:
+      future.cancel()
+    for modem in all_modems:
+      modem["gsm"].close()
+
+  def queueSMS(self, phone_number, msg, force_text_mode=False):
+    """Send SMS/MMS with the healthy GSM module having the least SMS waiting to be sent (without waiting it to be sent)
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send (sent as MMS if it does not fit in one SMS)
+      force_text_mode -- (bool, default: PDU mode used) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+
+    return: (concurrent.futures.Future) Future result of the sending (see GSMTC35.sendSMSAndGetReferences() result),
+            None if no healthy GSM module can send it
+    """
+    future = concurrent.futures.Future()
+    if not self.__queueSMSToModem(future, phone_number, msg, force_text_mode, []):
+      return None
+    return future
+
+  def sendSMS(self, phone_number, msg, force_text_mode=False):
+    """Send SMS/MMS with the healthy GSM module having the least SMS waiting to be sent (and wait it to be sent)
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send (sent as MMS if it does not fit in one SMS)
+      force_text_mode -- (bool, default: PDU mode used) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+
+    return: (bool) SMS sent
+    """
+    future = self.queueSMS(phone_number, msg, force_text_mode)
+    if future is None:
+      return False
+
+    try:
+      return future.result()[0]
+    except Exception as e:
+      logging.error("Failed to send SMS to "+str(phone_number)+": "+str(e))
+      return False
+
+  def getModemsStatus(self):
+    """Get status of each GSM module of the pool
+
+    return: ([{'port': string, 'healthy': bool, 'outstanding': int, 'sent': int, 'failed': int}]) Status of each GSM module
+            ('outstanding' is the number of SMS waiting to be sent or being sent)
+    """
+    with self.__lock:
+      return [{"port": modem["port"], "healthy": modem["healthy"], "outstanding": modem["outstanding"],
+               "sent": modem["sent"], "failed": modem["failed"]} for modem in self.__modems]
+
+  def getNbOfHealthyModems(self):
+    """Get number of GSM modules used to send SMS
+
+    return: (int) Number of healthy GSM modules
+    """
+    with self.__lock:
+      return sum(1 for modem in self.__modems if modem["healthy"])
+
+  def checkHealth(self):
+    """Check all GSM modules (alive and signal strength), only healthy GSM modules are used to send SMS
+
+    Note: This is the only way for a GSM module which is not used anymore to be used again
+          (regularly called by the health checker started by {setup()})
+
+    Note: GSM modules sending SMS are not checked (the checks would be done between the AT commands
+          of the sending), SMS queued to a GSM module being checked are sent once it is checked
+
+    return: (int) Number of healthy GSM modules
+    """
+    with self.__lock:
+      all_modems = list(self.__modems)
+
+    # GSM modules are checked without locking the pool (SMS can be queued during the checks)
+    for modem in all_modems:
+      with self.__lock:
+        if modem["outstanding"] > 0:
+          logging.debug("GSM module of "+modem["port"]+" is not checked (SMS are being sent)")
+          continue
+        modem["checking"] = True
+
+      healthy = False
+      signal_strength = -1
+      try:
+        gsm = modem["gsm"]
+        signal_strength = gsm.getSignalStrength() if gsm.isAlive() else -1
+        healthy = (signal_strength != -1) and (signal_strength >= self.__min_signal_strength_dbm)
+      finally:
+        with self.__lock:
+          if healthy and not modem["healthy"]:
+            logging.warning("GSM module of "+modem["port"]+" is used again")
+          elif not healthy and modem["healthy"]:
+            logging.warning("GSM module of "+modem["port"]+" is not used anymore (signal strength: "+str(signal_strength)+" dBm)")
+          modem["healthy"] = healthy
+          if healthy:
+            modem["consecutive_failures"] = 0
+          modem["checking"] = False
+          all_waiting_sms = modem["sms_waiting_check"]
+          modem["sms_waiting_check"] = []
+          modem["outstanding"] -= len(all_waiting_sms)
+
+        # SMS queued during the check are sent by the best GSM module now
+        for future, phone_number, msg, force_text_mode, excluded_ports in all_waiting_sms:
+          if not self.__queueSMSToModem(future, phone_number, msg, force_text_mode, excluded_ports):
+            if future.set_running_or_notify_cancel():
+              future.set_result((False, []))
+
+    return self.getNbOfHealthyModems()
+
+  def startHealthChecker(self, period_sec=60):
+    """Check health of all GSM modules in background (see {checkHealth()})
+
+    Keyword arguments:
+      period_sec -- (float, optional) Time between 2 checks
+
+    return: (bool) Health checker started (False if already started)
+    """
+    with self.__lock:
+      if self.__health_checker is not None and self.__health_checker.is_alive():
+        logging.warning("Health checker is already started")
+        return False
+
+      self.__health_checker_stop.clear()
+      self.__health_checker = threading.Thread(target=self.__checkHealthPeriodically, args=(period_sec,))
+      self.__health_checker.daemon = True
+      self.__health_checker.start()
+
+    return True
+
+  def stopHealthChecker(self):
+    """Stop health checker started with {startHealthChecker()}
+
+    return: (bool) Health checker was running
+    """
+    with self.__lock:
+      health_checker = self.__health_checker
+      self.__health_checker = None
+    if health_checker is None:
+      return False
+
+    self.__health_checker_stop.set()
+    if health_checker is not threading.current_thread():
+      health_checker.join()
+
+    return True
+
+  def __checkHealthPeriodically(self, period_sec):
+    """Background worker checking health of all GSM modules (see {startHealthChecker()})
+
+    Keyword arguments:
+      period_sec -- (float) Time between 2 checks
+    """
+    logging.debug("Health checker started")
+    while not self.__health_checker_stop.wait(period_sec):
+      self.checkHealth()
+    logging.debug("Health checker stopped")
+
+  def __queueSMSToModem(self, future, phone_number, msg, force_text_mode, excluded_ports):
+    """Queue SMS to the healthy GSM module having the least SMS waiting to be sent
+
+    Keyword arguments:
+      future -- (concurrent.futures.Future) Future result of the sending
+      phone_number -- (string) Phone number
+      msg -- (unicode) Message to send
+      force_text_mode -- (bool) Force to use Text Mode instead of PDU mode
+      excluded_ports -- (list of string) Port of GSM modules which already failed to send this SMS
+
+    return: (bool) SMS queued
+    """
+    with self.__lock:
+      # GSM modules being checked are only used if no other GSM module can send the SMS
+      all_modems = sorted((modem for modem in self.__modems if modem["healthy"] and modem["port"] not in excluded_ports),
+                          key=lambda modem: (modem["checking"], modem["outstanding"]))
+      for modem in all_modems:
+        if modem["checking"]:
+          # Sending must not be done between the AT commands of the health check
+          modem["sms_waiting_check"].append((future, phone_number, msg, force_text_mode, excluded_ports))
+          modem["outstanding"] += 1
+          return True
+
+        modem_future = modem["gsm"].queueSMS(phone_number, msg, force_text_mode, get_status=True)
+        if modem_future is None:
+          # Queue of this GSM module is full
+          continue
+
+        modem["outstanding"] += 1
+        modem_future.add_done_callback(lambda modem_future, modem=modem:
+                                       self.__onSmsSent(modem, modem_future, future, phone_number, msg,
+                                                        force_text_mode, excluded_ports))
+        return True
+
+    logging.error("No GSM module can send SMS to "+str(phone_number))
+    return False
+
+  def __onSmsSent(self, modem, modem_future, future, phone_number, msg, force_text_mode, excluded_ports):
+    """Update GSM module health once it tried to send a SMS (and send SMS again with another GSM module if it was refused)
+
+    Note: SMS which may have been (partly) sent are not sent again (it would be received twice)
+
+    Keyword arguments:
+      modem -- (dict) GSM module which tried to send the SMS
+      modem_future -- (concurrent.futures.Future) Result of the sending by the GSM module (see GSMTC35.sendSMSAndGetStatus())
+      future -- (concurrent.futures.Future) Future result of the sending returned by {queueSMS()}
+      phone_number -- (string) Phone number
+      msg -- (unicode) Message to send
+      force_text_mode -- (bool) Force to use Text Mode instead of PDU mode
+      excluded_ports -- (list of string) Port of GSM modules which already failed to send this SMS
+    """
+    if modem_future.cancelled():
+      with self.__lock:
+        modem["outstanding"] -= 1
+      future.cancel()
+      return
+
+    error = modem_future.exception()
+    status, references = (GSMTC35.eSmsSendStatus.UNKNOWN, []) if error is not None else modem_future.result()
+    result = (status == GSMTC35.eSmsSendStatus.SENT, references)
+
+    with self.__lock:
+      modem["outstanding"] -= 1
+      if result[0]:
+        modem["sent"] += 1
+        modem["consecutive_failures"] = 0
+      else:
+        modem["failed"] += 1
+        modem["consecutive_failures"] += 1
+        if modem["healthy"] and modem["consecutive_failures"] >= self.__max_consecutive_failures:
+          logging.warning("GSM module of "+modem["port"]+" is not used anymore ("
+                          +str(modem["consecutive_failures"])+" SMS failed in a row)")
+          modem["healthy"] = False
+
+    if status == GSMTC35.eSmsSendStatus.NOT_SENT:
+      excluded_ports = excluded_ports + [modem["port"]]
+      if len(excluded_ports) < self.__max_modem_attempts:
+        logging.warning("GSM module of "+modem["port"]+" refused to send SMS to "+str(phone_number)+", trying another one")
+        if self.__queueSMSToModem(future, phone_number, msg, force_text_mode, excluded_ports):
+          return
+
+    if not future.set_running_or_notify_cancel():
+      return
+    if error is not None:
+      future.set_exception(error)
+    else:
+      future.set_result(result)
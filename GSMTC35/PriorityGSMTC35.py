@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Prioritized front-end of the GSM TC35 library: Every public function of
+  GSMTC35 is executed by one worker owning the GSM module, in order of
+  priority (example: hanging up a call is done before listing all SMS
+  requested before).
+
+  Functions can be called from any thread (multi-threaded servers, ...) and
+  either wait their result (same use as GSMTC35) or get a future result.
+
+  Example of use:
+  '''
+  from GSMTC35.PriorityGSMTC35 import PriorityGSMTC35
+
+  gsm = PriorityGSMTC35()
+  if gsm.setup(_port="COM3"):
+    all_sms = gsm.submit(PriorityGSMTC35.ePriority.LOW, gsm.getSynchronousInstance().getSMS)
+    print(gsm.hangUpCall()) # Executed before getting SMS (if not already in progress)
+    print(all_sms.result())
+    gsm.close()
+  gsm.shutdown()
+  '''
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.+"
+__version__ = "1.0 (2019/11/14)"
+__status__ = "Usable for any project"
+
+import concurrent.futures
+import functools
+import itertools
+import logging
+import queue
+import threading
+
+try:
+  from .GSMTC35 import GSMTC35
+  from .GSMTC35Wrapper import GSMTC35Wrapper
+except ImportError:
+  from GSMTC35 import GSMTC35
+  from GSMTC35Wrapper import GSMTC35Wrapper
+
+class PriorityExecutor:
+  """Worker executing functions in order of priority (then in order of call)"""
+  def __init__(self, stop_priority):
+    """Initialize the executor and start its worker
+
+    Keyword arguments:
+      stop_priority -- (int) Priority lower than the priority of all functions (used to stop the worker)
+    """
+    self.__stop_priority = stop_priority
+    self.__lock = threading.Lock()
+    self.__is_shutdown = False
+    self.__order = itertools.count()
+    self.__queue = queue.PriorityQueue()
+    self.__worker = threading.Thread(target=self.__executeAll)
+    self.__worker.daemon = True
+    self.__worker.start()
+
+  def submit(self, priority, function, *args, **kwargs):
+    """Execute function in the worker without waiting its result
+
+    Keyword arguments:
+      priority -- (int) Priority of the function (lowest value first)
+      function -- (callable) Function to execute
+      args, kwargs -- Parameters of {function}
+
+    return: (concurrent.futures.Future) Future result of {function}, None if the worker is stopped
+    """
+    future = concurrent.futures.Future()
+    with self.__lock:
+      if self.__is_shutdown:
+        logging.error("Worker is stopped, function is not executed")
+        return None
+      self.__queue.put((priority, next(self.__order), future, function, args, kwargs))
+
+    return future
+
+  def getNbOfPendingFunctions(self):
+    """Get number of functions waiting to be executed
+
+    return: (int) Number of functions waiting (function in progress is not included)
+    """
+    return self.__queue.qsize()
+
+  def shutdown(self, wait=True):
+    """Stop the worker (no function can be submitted after this call)
+
+    Keyword arguments:
+      wait -- (bool, optional) Execute all already submitted functions (else they are cancelled)
+    """
+    with self.__lock:
+      if self.__is_shutdown:
+        return
+      self.__is_shutdown = True
+
+      if not wait:
+        while True:
+          try:
+            future = self.__queue.get_nowait()[2]
+          except queue.Empty:
+            break
+          future.cancel()
+
+      self.__queue.put((self.__stop_priority, next(self.__order), None, None, None, None))
+
+    if wait and self.__worker is not threading.current_thread():
+      self.__worker.join()
+
+  def __executeAll(self):
+    """Worker executing all submitted functions (in order of priority)"""
+    logging.debug("Prioritized worker started")
+    while True:
+      priority, order, future, function, args, kwargs = self.__queue.get()
+      if future is None:
+        break
+
+      if not future.set_running_or_notify_cancel():
+        continue
+
+      try:
+        future.set_result(function(*args, **kwargs))
+      except Exception as e:
+        future.set_exception(e)
+    logging.debug("Prioritized worker stopped")
+
+class PriorityGSMTC35(GSMTC35Wrapper):
+  """Prioritized GSM TC35 class
+
+  All public functions of GSMTC35 are available with the same parameters and
+  results (executed by the worker with the priority of {DEFAULT_PRIORITIES}).
+  Enums (eSMS, eCall, ...) are directly available (example: 'PriorityGSMTC35.eSMS').
+
+  Note: SMS are sent by the worker too ({queueSMS()}), the send queue of
+        GSMTC35 ({startSmsSendQueue()}) can't be used.
+  """
+  class ePriority:
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+  @staticmethod
+  def ePriorityToString(data):
+    if data == PriorityGSMTC35.ePriority.HIGH:
+      return "HIGH"
+    elif data == PriorityGSMTC35.ePriority.NORMAL:
+      return "NORMAL"
+    elif data == PriorityGSMTC35.ePriority.LOW:
+      return "LOW"
+
+    return "UNDEFINED"
+
+  # Priority of GSMTC35 functions (other functions have a NORMAL priority)
+  DEFAULT_PRIORITIES = {
+    "hangUpCall": ePriority.HIGH,
+    "pickUpCall": ePriority.HIGH,
+    "isSomeoneCalling": ePriority.HIGH,
+    "isCallInProgress": ePriority.HIGH,
+    "getCurrentCallState": ePriority.HIGH,
+    "getSMS": ePriority.LOW,
+    "deleteSMS": ePriority.LOW,
+    "getPhonebookEntries": ePriority.LOW,
+    "getOperatorNames": ePriority.LOW,
+    "getNeighbourCells": ePriority.LOW
+  }
+
+  def __init__(self, gsm=None):
+    """Initialize the prioritized GSM module class and start its worker
+
+    Keyword arguments:
+      gsm -- (GSMTC35, optional) Already created GSMTC35 instance to use (must not be used outside of this class anymore)
+    """
+    self.__executor = PriorityExecutor(stop_priority=PriorityGSMTC35.ePriority.LOW + 1)
+    GSMTC35Wrapper.__init__(self, gsm if gsm is not None else GSMTC35(), self.__executor)
+
+  def _wrapFunction(self, name, function):
+    """Get prioritized version of GSMTC35 public function {name} (waiting its result)
+
+    Note: If the worker is stopped before the function is executed,
+          'concurrent.futures.CancelledError' is raised
+    """
+    priority = PriorityGSMTC35.DEFAULT_PRIORITIES.get(name, PriorityGSMTC35.ePriority.NORMAL)
+
+    @functools.wraps(function)
+    def prioritizedFunction(*args, **kwargs):
+      future = self.submit(priority, function, *args, **kwargs)
+      if future is None:
+        raise concurrent.futures.CancelledError("GSM module worker is stopped")
+      return future.result()
+
+    return prioritizedFunction
+
+  def submit(self, priority, function, *args, **kwargs):
+    """Execute any function using the GSM module without waiting its result
+
+    Note: Functions of same priority are executed in order of call
+
+    Keyword arguments:
+      priority -- (PriorityGSMTC35.ePriority) Priority of the function
+      function -- (callable) Function to execute (blocking function using the GSMTC35 instance)
+      args, kwargs -- Parameters of {function}
+
+    return: (concurrent.futures.Future) Future result of {function}, None if the worker is stopped
+    """
+    return self.__executor.submit(priority, function, *args, **kwargs)
+
+  def getNbOfPendingFunctions(self):
+    """Get number of functions waiting to be executed
+
+    return: (int) Number of functions waiting (function in progress is not included)
+    """
+    return self.__executor.getNbOfPendingFunctions()
+
+  def queueSMS(self, phone_number, msg, force_text_mode=False, priority=ePriority.NORMAL):
+    """Send SMS/MMS with the worker without waiting it to be sent (see GSMTC35.sendSMSAndGetReferences())
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      msg -- (unicode) Message to send (sent as MMS if it does not fit in one SMS)
+      force_text_mode -- (bool, default: PDU mode used) Force to use Text Mode instead of PDU mode (NOT RECOMMENDED)
+      priority -- (PriorityGSMTC35.ePriority, optional) Priority of the sending
+
+    return: (concurrent.futures.Future) Future result of the sending (see GSMTC35.sendSMSAndGetReferences() result),
+            None if the worker is stopped
+    """
+    return self.submit(priority, self.getSynchronousInstance().sendSMSAndGetReferences,
+                       phone_number, msg, force_text_mode)
+
+  def startSmsSendQueue(self, *args, **kwargs):
+    """Not available: SMS are sent by the worker of this class (see {queueSMS()})
+
+    return: (bool) False
+    """
+    logging.error("SMS send queue can't be used with PriorityGSMTC35 (use queueSMS() directly)")
+    return False
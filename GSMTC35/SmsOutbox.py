@@ -0,0 +1,360 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Persistent outbox of the GSM TC35 library: SMS to send are stored in a
+  SQLite database (WAL mode) and sent by a dispatcher using a GSM module.
+
+  If the process stops, SMS which were not sent are sent after restart
+  (the SMS being sent when the process stopped may be sent twice). SMS are
+  read from the database in small batches so that millions of SMS can be
+  waiting without being kept in memory.
+
+  SMS refused by the GSM module (nothing sent) are sent again later, SMS
+  failing once they may have been (partly) sent are marked as failed and
+  are never sent again automatically.
+
+  Example of use:
+  '''
+  from GSMTC35.GSMTC35 import GSMTC35
+  from GSMTC35.SmsOutbox import SmsOutbox
+
+  gsm = GSMTC35()
+  if gsm.setup(_port="COM3"):
+    outbox = SmsOutbox("outbox.db", gsm)
+    outbox.addSMS("+33601020304", "Hello")
+    outbox.startDispatcher()
+    (...)
+    outbox.stopDispatcher()
+    outbox.close()
+    gsm.close()
+  '''
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.+"
+__version__ = "1.0 (2019/11/12)"
+__status__ = "Usable for any project"
+
+import logging
+import sqlite3
+import threading
+import time
+
+try:
+  from .GSMTC35 import GSMTC35
+except ImportError:
+  from GSMTC35 import GSMTC35
+
+class SmsOutbox:
+  """Persistent outbox (SQLite database) of SMS to send with a GSM module"""
+  class eStatus:
+    PENDING = 0 # Waiting to be sent (or to be sent again after an attempt refused by the GSM module)
+    SENDING = 1 # Claimed by the dispatcher
+    SENT = 2
+    FAILED = 3 # All attempts refused, or failed once the SMS may have been (partly) sent
+
+  @staticmethod
+  def eStatusToString(data):
+    if data == SmsOutbox.eStatus.PENDING:
+      return "PENDING"
+    elif data == SmsOutbox.eStatus.SENDING:
+      return "SENDING"
+    elif data == SmsOutbox.eStatus.SENT:
+      return "SENT"
+    elif data == SmsOutbox.eStatus.FAILED:
+      return "FAILED"
+
+    return "UNDEFINED"
+
+  def __init__(self, db_filename, gsm=None):
+    """Open (and create if needed) the outbox database
+
+    Note: SMS claimed by a dispatcher which stopped before sending them are
+          sent again (only one dispatcher must use a database at a time)
+
+    Keyword arguments:
+      db_filename -- (string) SQLite database file
+      gsm -- (GSMTC35, optional) GSM module used to send SMS (needed to dispatch SMS)
+    """
+    self.__gsm = gsm
+    self.__lock = threading.Lock()
+    self.__dispatcher = None
+    self.__dispatcher_stop = threading.Event()
+    self.__new_sms = threading.Event()
+
+    # Transactions are explicitly started (isolation_level=None) to claim SMS atomically
+    self.__conn = sqlite3.connect(db_filename, isolation_level=None, check_same_thread=False)
+    self.__conn.execute("PRAGMA journal_mode=WAL")
+    self.__conn.execute("PRAGMA synchronous=NORMAL")
+    self.__conn.execute("""CREATE TABLE IF NOT EXISTS outbox (
+                             id                  INTEGER       PRIMARY KEY AUTOINCREMENT NOT NULL,
+                             phone_number        VARCHAR(30)   NOT NULL,
+                             content             TEXT          NOT NULL,
+                             status              INTEGER       NOT NULL DEFAULT 0,
+                             attempts            INTEGER       NOT NULL DEFAULT 0,
+                             message_references  TEXT,
+                             created_timestamp   INTEGER       NOT NULL,
+                             updated_timestamp   INTEGER       NOT NULL,
+                             next_attempt_timestamp INTEGER    NOT NULL DEFAULT 0
+                           )""")
+    # Outbox created before retry delays were added
+    all_columns = [column[1] for column in self.__conn.execute("PRAGMA table_info(outbox)")]
+    if "next_attempt_timestamp" not in all_columns:
+      self.__conn.execute("ALTER TABLE outbox ADD COLUMN next_attempt_timestamp INTEGER NOT NULL DEFAULT 0")
+    self.__conn.execute("CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, id)")
+
+    nb_of_interrupted_sms = self.__conn.execute("UPDATE outbox SET status = ? WHERE status = ?",
+                                                (SmsOutbox.eStatus.PENDING, SmsOutbox.eStatus.SENDING)).rowcount
+    if nb_of_interrupted_sms > 0:
+      logging.warning(str(nb_of_interrupted_sms)+" SMS claimed before the last stop will be sent")
+
+  def close(self):
+    """Stop the dispatcher (if started) and close the database"""
+    self.stopDispatcher()
+    with self.__lock:
+      self.__conn.close()
+
+  def addSMS(self, phone_number, content):
+    """Add SMS to send in the outbox
+
+    Keyword arguments:
+      phone_number -- (string) Phone number (can be local or international)
+      content -- (unicode) Message to send
+
+    return: (bool, int) SMS added, ID of the SMS in the outbox
+    """
+    if len(phone_number) <= 0 or len(content) <= 0:
+      logging.error("Message to send or phone number can't be empty")
+      return False, -1
+
+    now = int(time.time())
+    try:
+      with self.__lock:
+        sms_id = self.__conn.execute("""INSERT INTO outbox (phone_number, content, created_timestamp, updated_timestamp)
+                                        VALUES (?, ?, ?, ?)""", (str(phone_number), str(content), now, now)).lastrowid
+    except sqlite3.Error as e:
+      logging.error("Failed to add SMS to the outbox: "+str(e))
+      return False, -1
+
+    self.__new_sms.set()
+    return True, sms_id
+
+  def addManySMS(self, all_sms):
+    """Add multiple SMS to send in the outbox (in one transaction)
+
+    Keyword arguments:
+      all_sms -- (iterable of (string, unicode)) Phone number and message of each SMS to send
+
+    return: (bool, int) All SMS added (none are added if one is invalid), Number of added SMS
+    """
+    now = int(time.time())
+    def getRows():
+      for phone_number, content in all_sms:
+        if len(phone_number) <= 0 or len(content) <= 0:
+          raise ValueError("Message to send or phone number can't be empty")
+        yield (str(phone_number), str(content), now, now)
+
+    try:
+      with self.__lock:
+        self.__conn.execute("BEGIN IMMEDIATE")
+        try:
+          nb_of_sms = self.__conn.executemany("""INSERT INTO outbox (phone_number, content, created_timestamp, updated_timestamp)
+                                                 VALUES (?, ?, ?, ?)""", getRows()).rowcount
+          self.__conn.execute("COMMIT")
+        except Exception:
+          self.__conn.execute("ROLLBACK")
+          raise
+    except (sqlite3.Error, ValueError) as e:
+      logging.error("Failed to add SMS to the outbox: "+str(e))
+      return False, 0
+
+    self.__new_sms.set()
+    return True, nb_of_sms
+
+  def getSMS(self, sms_id):
+    """Get SMS of the outbox
+
+    Keyword arguments:
+      sms_id -- (int) ID of the SMS in the outbox
+
+    return: ({}) SMS with 'id', 'phone_number', 'content', 'status' (SmsOutbox.eStatus), 'attempts',
+            'message_references' (list of message reference of each part, empty if not sent),
+            'created_timestamp', 'updated_timestamp' and 'next_attempt_timestamp' (empty if not found)
+    """
+    with self.__lock:
+      row = self.__conn.execute("""SELECT id, phone_number, content, status, attempts, message_references, created_timestamp, updated_timestamp,
+                                          next_attempt_timestamp
+                                   FROM outbox WHERE id = ?""", (int(sms_id),)).fetchone()
+    if row is None:
+      return {}
+
+    sms_id, phone_number, content, status, attempts, message_references, created_timestamp, updated_timestamp, next_attempt_timestamp = row
+    return {"id": sms_id, "phone_number": phone_number, "content": content, "status": status, "attempts": attempts,
+            "message_references": [int(ref) for ref in message_references.split(",")] if message_references else [],
+            "created_timestamp": created_timestamp, "updated_timestamp": updated_timestamp,
+            "next_attempt_timestamp": next_attempt_timestamp}
+
+  def getNbOfSMS(self, status=eStatus.PENDING):
+    """Get number of SMS with a specific status
+
+    Keyword arguments:
+      status -- (SmsOutbox.eStatus, optional, default: PENDING) Status of the SMS to count
+
+    return: (int) Number of SMS
+    """
+    with self.__lock:
+      return self.__conn.execute("SELECT COUNT(*) FROM outbox WHERE status = ?", (status,)).fetchone()[0]
+
+  def dispatch(self, batch_size=50, max_attempts=3, network_delay_sec=5, min_part_interval_sec=0, retry_delay_sec=60):
+    """Claim a batch of pending SMS (ready to be sent) and send them with the GSM module
+
+    Keyword arguments:
+      batch_size -- (int, optional) Maximum number of SMS to claim and send
+      max_attempts -- (int, optional) Number of times a SMS refused by the GSM module is sent before being considered as failed
+      network_delay_sec -- (int, optional) Maximum network delay to add when waiting each part to be sent
+      min_part_interval_sec -- (float, optional, default: no rate limit) Minimum time between sending of 2 parts (rate limit)
+      retry_delay_sec -- (int, optional) Time to wait before sending a refused SMS again (doubled after each refused attempt)
+
+    return: (int) Number of SMS handled (sent or not)
+    """
+    if self.__gsm is None:
+      logging.error("No GSM module to send SMS")
+      return 0
+
+    all_sms = self.__claimSMS(batch_size)
+    nb_of_handled_sms = 0
+    try:
+      for sms_id, phone_number, content, attempts in all_sms:
+        if self.__dispatcher_stop.is_set():
+          break
+        self.__sendClaimedSMS(sms_id, phone_number, content, attempts, max_attempts, network_delay_sec, min_part_interval_sec,
+                              retry_delay_sec)
+        nb_of_handled_sms += 1
+    finally:
+      # SMS not handled can be claimed again
+      if nb_of_handled_sms < len(all_sms):
+        with self.__lock:
+          self.__conn.executemany("UPDATE outbox SET status = ? WHERE id = ? AND status = ?",
+                                  [(SmsOutbox.eStatus.PENDING, sms[0], SmsOutbox.eStatus.SENDING) for sms in all_sms[nb_of_handled_sms:]])
+
+    return nb_of_handled_sms
+
+  def __sendClaimedSMS(self, sms_id, phone_number, content, attempts, max_attempts, network_delay_sec, min_part_interval_sec,
+                       retry_delay_sec):
+    """Send a claimed SMS and store the result in the outbox
+
+    Note: SMS is only sent again later if the GSM module refused it (nothing was sent), a SMS which
+          may have been (partly) sent is marked as failed (sending it again could send it twice)
+
+    Keyword arguments:
+      sms_id -- (int) ID of the SMS in the outbox
+      phone_number -- (string) Phone number
+      content -- (unicode) Message to send
+      attempts -- (int) Number of previous attempts
+      max_attempts, network_delay_sec, min_part_interval_sec, retry_delay_sec -- See {dispatch()}
+    """
+    send_status, references = self.__gsm.sendSMSAndGetStatus(phone_number, content, network_delay_sec=network_delay_sec,
+                                                             min_part_interval_sec=min_part_interval_sec)
+    attempts += 1
+    now = int(time.time())
+    next_attempt_timestamp = now
+    if send_status == GSMTC35.eSmsSendStatus.SENT:
+      status = SmsOutbox.eStatus.SENT
+    elif send_status != GSMTC35.eSmsSendStatus.NOT_SENT:
+      logging.error("Failed to send SMS "+str(sms_id)+" to "+str(phone_number)+" (it may have been partly or fully sent, "
+                    +"it is not sent again)")
+      status = SmsOutbox.eStatus.FAILED
+    elif attempts >= max_attempts:
+      logging.error("Failed to send SMS "+str(sms_id)+" to "+str(phone_number)+" after "+str(attempts)+" attempt(s)")
+      status = SmsOutbox.eStatus.FAILED
+    else:
+      # Exponential backoff so that a failing SMS is not sent again and again
+      retry_delay_sec = int(retry_delay_sec * (2 ** (attempts - 1)))
+      logging.warning("GSM module refused to send SMS "+str(sms_id)+" to "+str(phone_number)+", it will be sent again in "
+                      +str(retry_delay_sec)+" second(s)")
+      status = SmsOutbox.eStatus.PENDING
+      next_attempt_timestamp = now + retry_delay_sec
+
+    with self.__lock:
+      self.__conn.execute("""UPDATE outbox SET status = ?, attempts = ?, message_references = ?, updated_timestamp = ?,
+                                               next_attempt_timestamp = ?
+                             WHERE id = ?""", (status, attempts, ",".join([str(ref) for ref in references]),
+                                               now, next_attempt_timestamp, sms_id))
+
+  def __claimSMS(self, batch_size):
+    """Claim the oldest pending SMS ready to be sent (they will not be claimed again except after restart)
+
+    Keyword arguments:
+      batch_size -- (int) Maximum number of SMS to claim
+
+    return: ([(int, string, unicode, int)]) ID, phone number, message and number of attempts of each claimed SMS
+    """
+    with self.__lock:
+      self.__conn.execute("BEGIN IMMEDIATE")
+      try:
+        all_sms = self.__conn.execute("""SELECT id, phone_number, content, attempts FROM outbox
+                                         WHERE status = ? AND next_attempt_timestamp <= ? ORDER BY id LIMIT ?""",
+                                      (SmsOutbox.eStatus.PENDING, int(time.time()), int(batch_size))).fetchall()
+        self.__conn.executemany("UPDATE outbox SET status = ? WHERE id = ?",
+                                [(SmsOutbox.eStatus.SENDING, sms[0]) for sms in all_sms])
+        self.__conn.execute("COMMIT")
+      except Exception:
+        self.__conn.execute("ROLLBACK")
+        raise
+    return all_sms
+
+  def startDispatcher(self, period_sec=1, batch_size=50, max_attempts=3, network_delay_sec=5, min_part_interval_sec=0,
+                      retry_delay_sec=60):
+    """Start a background thread sending all pending SMS (see {dispatch()})
+
+    Keyword arguments:
+      period_sec -- (float, optional) Maximum time between two checks of the outbox if no SMS is added with this instance
+      batch_size, max_attempts, network_delay_sec, min_part_interval_sec, retry_delay_sec -- See {dispatch()}
+
+    return: (bool) Dispatcher started (or already started)
+    """
+    if self.__dispatcher is not None and self.__dispatcher.is_alive():
+      return True
+
+    self.__dispatcher_stop.clear()
+    self.__dispatcher = threading.Thread(target=self.__dispatchAll,
+                                         args=(period_sec, batch_size, max_attempts, network_delay_sec, min_part_interval_sec,
+                                               retry_delay_sec))
+    self.__dispatcher.daemon = True
+    self.__dispatcher.start()
+
+    return True
+
+  def stopDispatcher(self):
+    """Stop the background thread started with {startDispatcher()} (SMS being sent is sent first)
+
+    return: (bool) Dispatcher was running
+    """
+    dispatcher = self.__dispatcher
+    if dispatcher is None:
+      return False
+
+    self.__dispatcher_stop.set()
+    self.__new_sms.set()
+    if dispatcher is not threading.current_thread():
+      dispatcher.join()
+    self.__dispatcher = None
+
+    return True
+
+  def __dispatchAll(self, period_sec, batch_size, max_attempts, network_delay_sec, min_part_interval_sec, retry_delay_sec):
+    """Background thread sending all pending SMS (see {startDispatcher()})"""
+    logging.debug("Outbox dispatcher started")
+    while not self.__dispatcher_stop.is_set():
+      self.__new_sms.clear()
+      try:
+        nb_of_sms = self.dispatch(batch_size, max_attempts, network_delay_sec, min_part_interval_sec, retry_delay_sec)
+      except Exception as e:
+        logging.error("Failed to dispatch SMS of the outbox: "+str(e))
+        nb_of_sms = 0
+      if nb_of_sms <= 0:
+        self.__new_sms.wait(period_sec)
+    logging.debug("Outbox dispatcher stopped")
@@ -0,0 +1,691 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  PDU (Protocol Data Unit) codec of the GSM TC35 library: GSM 03.38 alphabet,
+  7bit septets, User Data Header, SMS decoding and multipart SMS reassembly.
+
+  No serial connection is needed to use this module (decoding archived PDU,
+  decoding in worker processes, ...).
+
+  Example of use:
+  '''
+  from GSMTC35 import pdu
+
+  sms = pdu.decodeSms("07913396050046F6040B913306048216F1000091116010433040"
+                      "12C2F03C3D06DD40E2347D0E9A36A7A010")
+  if sms.isValid():
+    print(sms.phone_number+": "+sms.sms)
+    print(sms.toDict())
+
+  # Decode a lot of PDU SMS using all CPU
+  if __name__ == '__main__':
+    all_sms = pdu.decodeSmsList(archived_pdus, processes=None)
+  '''
+"""
+__author__ = 'Quentin Comte-Gaz'
+__email__ = "quentin@comte-gaz.com"
+__license__ = "MIT License"
+__copyright__ = "Copyright Quentin Comte-Gaz (2019)"
+__python_version__ = "3.+"
+__version__ = "1.0 (2019/11/10)"
+__status__ = "Usable for any project"
+
+import binascii
+import collections
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+############################ GSM 03.38 ALPHABET ###############################
+_GSM0338_BASE_TABLE = u"@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞ\x1bÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+_GSM0338_EXTRA_TABLE = u"````````````````````^```````````````````{}`````\\````````````[~]`|````````````````````````````````````€``````````````````````````"
+
+# Precomputed GSM 03.38 tables (character -> encoded septets, decoded septet -> character, valid characters)
+_GSM0338_ENCODING_TABLE = dict([(c, bytes([27, idx])) for idx, c in reversed(list(enumerate(_GSM0338_EXTRA_TABLE)))]
+                               + [(c, bytes([idx])) for idx, c in enumerate(_GSM0338_BASE_TABLE)])
+_GSM0338_DECODING_TABLE = dict(enumerate(_GSM0338_BASE_TABLE))
+_GSM0338_CHARACTERS = frozenset(_GSM0338_BASE_TABLE + _GSM0338_EXTRA_TABLE) - frozenset("`")
+
+# Swap both semi-octets of a byte (phone numbers and timestamps are stored as swapped semi-octets)
+_SEMI_OCTETS_SWAP_TABLE = bytes(bytearray(((byte & 0x0F) << 4) | (byte >> 4) for byte in range(256)))
+
+_INTERNATIONAL_PHONE_NUMBER_TYPE = 145
+
+def isGsm0338Compatible(plaintext):
+  """Check that the data can be encoded in GSM03.38 (extra table included)
+
+  Keyword arguments:
+    plaintext -- (string) Content to check if can be encoded into 7bit
+
+  return: (bool) Data can be encoded into 7Bit
+  """
+  try:
+    return _GSM0338_CHARACTERS.issuperset(str(plaintext))
+  except (UnicodeEncodeError, UnicodeDecodeError):
+    logging.debug("Unicode detected so data not 7bit compatible")
+    return False
+
+def encodeGsm0338(plaintext):
+  """Encode string in GSM 03.38 alphabet (characters not in the alphabet are ignored)
+
+  Keyword arguments:
+    plaintext -- (string) Content to encode
+
+  return: (bytes) One septet per byte
+  """
+  return b"".join([_GSM0338_ENCODING_TABLE.get(c, b"") for c in plaintext])
+
+def decodeGsm0338(septets):
+  """Decode GSM 03.38 alphabet into string
+
+  Keyword arguments:
+    septets -- (bytes) One septet per byte
+
+  return: (string) Decoded content
+  """
+  # Only the character following an escape (27) is in the extra table
+  parts = bytes(septets).split(b"\x1b")
+  result = [parts[0].decode("latin-1").translate(_GSM0338_DECODING_TABLE)]
+  for part in parts[1:]:
+    if len(part) > 0:
+      result.append(_GSM0338_EXTRA_TABLE[bytearray(part)[0]])
+      result.append(part[1:].decode("latin-1").translate(_GSM0338_DECODING_TABLE))
+
+  return "".join(result)
+
+################################# SEPTETS #####################################
+def packSeptets(septets, header=b""):
+  """Pack septets (7 bits) into octets (8 bits) with User Data Length
+
+  Keyword arguments:
+    septets -- (bytes) One septet per byte
+    header -- (bytes, optional) User Data Header (with its length byte) to add before the septets
+              (fill bits are added after it so that septets start on a septet boundary)
+
+  return: (bytearray) User Data Length (in septets, header and fill bits included) followed by User Data
+  """
+  header_septets = int(ceil(len(header) * 8 / 7.0))
+  result = bytearray([header_septets + len(septets)])
+  result += header
+
+  carry = 0
+  carry_bits = header_septets * 7 - len(header) * 8 # Fill bits
+  for septet in bytearray(septets):
+    carry |= septet << carry_bits
+    carry_bits += 7
+    if carry_bits >= 8:
+      result.append(carry & 0xFF)
+      carry >>= 8
+      carry_bits -= 8
+  if carry_bits > 0:
+    result.append(carry)
+
+  return result
+
+def unpackSeptets(data):
+  """Unpack septets (7 bits) from octets (8 bits)
+
+  Keyword arguments:
+    data -- (bytes) Packed septets
+
+  return: (bytearray) One septet per byte
+  """
+  septets = bytearray()
+  carry = carry_bits = 0
+  for byte in bytearray(data):
+    carry |= byte << carry_bits
+    carry_bits += 8
+    septets.append(carry & 0x7F)
+    carry >>= 7
+    carry_bits -= 7
+    if carry_bits == 7:
+      septets.append(carry)
+      carry = carry_bits = 0
+  return septets
+
+############################# USER DATA HEADER ################################
+# Information Element Identifiers of concatenated SMS (multipart SMS)
+IEI_CONCATENATED_SMS = 0x00 # 8 bit reference
+IEI_CONCATENATED_SMS_16BIT_REF = 0x08 # 16 bit reference
+
+def encodeUserDataHeader(information_elements):
+  """Encode User Data Header from its information elements
+
+  Keyword arguments:
+    information_elements -- ([(int, bytes)]) Information elements (IEI and IE data)
+
+  return: (bytes) User Data Header (with its length byte)
+  """
+  header = bytearray()
+  for iei, ie_data in information_elements:
+    header.append(iei)
+    header.append(len(ie_data))
+    header += ie_data
+  return bytes(bytearray([len(header)]) + header)
+
+def decodeUserDataHeader(header):
+  """Decode all information elements of a User Data Header
+
+  Note: Truncated information element is logged and ignored (for reliability)
+
+  Keyword arguments:
+    header -- (bytes) User Data Header (with its length byte)
+
+  return: ([(int, bytes)]) Information elements (IEI and IE data)
+  """
+  information_elements = []
+  if len(header) <= 0:
+    return information_elements
+
+  end = min(1 + header[0], len(header))
+  offset = 1
+  while offset + 2 <= end:
+    ie_length = header[offset+1]
+    if offset + 2 + ie_length > end:
+      logging.warning("Truncated information element in User Data Header")
+      break
+    information_elements.append((header[offset], bytes(header[offset+2:offset+2+ie_length])))
+    offset += 2 + ie_length
+
+  return information_elements
+
+def encodeConcatenationElement(ref_id, nb_of_parts, current_part, use_16bit_ref=True):
+  """Encode concatenated SMS information element (needed in each part of a multipart SMS)
+
+  Keyword arguments:
+    ref_id -- (int) Reference of the multipart SMS (same for all parts, [0:65535] for 16 bit reference, else [0:255])
+    nb_of_parts -- (int) Number of parts of the multipart SMS
+    current_part -- (int) Current part of the multipart SMS (first part is 1)
+    use_16bit_ref -- (bool, optional) Use 16 bit reference (less collisions) instead of 8 bit reference
+
+  return: ((int, bytes)) Information element (IEI and IE data)
+  """
+  if use_16bit_ref:
+    return IEI_CONCATENATED_SMS_16BIT_REF, bytes(bytearray([(ref_id >> 8) & 0xFF, ref_id & 0xFF, nb_of_parts, current_part]))
+  return IEI_CONCATENATED_SMS, bytes(bytearray([ref_id & 0xFF, nb_of_parts, current_part]))
+
+def decodeConcatenationElement(information_elements):
+  """Get multipart SMS information from the information elements of a User Data Header
+
+  Keyword arguments:
+    information_elements -- ([(int, bytes)]) Information elements (IEI and IE data)
+
+  return: ((int, int, int) or None) Reference, number of parts and current part (None if not multipart SMS)
+  """
+  for iei, ie_data in information_elements:
+    if iei == IEI_CONCATENATED_SMS and len(ie_data) == 3:
+      return ie_data[0], ie_data[1], ie_data[2]
+    if iei == IEI_CONCATENATED_SMS_16BIT_REF and len(ie_data) == 4:
+      return (ie_data[0] << 8) | ie_data[1], ie_data[2], ie_data[3]
+  return None
+
+class MultipartReferenceCounter(object):
+  """Allocate references of multipart SMS to send
+
+  A single counter (starting from a random reference) is shared by all phone
+  numbers so that parts of successive multipart SMS can't be mixed by the
+  receiver, without keeping any state for each phone number.
+  """
+  def __init__(self, use_16bit_ref=True):
+    """Initialize the reference counter
+
+    Keyword arguments:
+      use_16bit_ref -- (bool, optional) Allocate 16 bit references instead of 8 bit references
+    """
+    self.__max_ref_id = 0xFFFF if use_16bit_ref else 0xFF
+    self.__next_ref_id = random.randint(0, self.__max_ref_id)
+    self.__lock = threading.Lock()
+
+  def getNextReference(self):
+    """Allocate a reference for a new multipart SMS
+
+    return: (int) Reference of the multipart SMS
+    """
+    with self.__lock:
+      ref_id = self.__next_ref_id
+      self.__next_ref_id = (ref_id + 1) & self.__max_ref_id
+    return ref_id
+
+################################### SMS #######################################
+class SmsRecord(object):
+  """Decoded SMS
+
+  Only the following fields are stored (None if not available):
+    'phone_number', 'date', 'time', 'sms', 'sms_encoded', 'service_center_type',
+    'service_center_phone_number', 'phone_number_type', 'charset',
+    if message has an header: 'header_iei', 'header_ie_data' (first information element),
+      'header_elements' (all information elements)
+    if message is a multipart message (MMS): 'header_multipart_ref_id',
+      'header_multipart_current_part_nb', 'header_multipart_nb_of_part'
+    if message was read from a GSM module storage: 'index', 'status'
+
+  Note: Much lighter than a dictionary when a lot of SMS are kept in memory,
+        use {toDict()} to get the same format as dictionaries of GSMTC35 functions
+  """
+  __slots__ = ("index", "status", "service_center_type", "service_center_phone_number", "phone_number_type",
+               "phone_number", "date", "time", "charset", "header_iei", "header_ie_data", "header_elements",
+               "header_multipart_ref_id", "header_multipart_nb_of_part",
+               "header_multipart_current_part_nb", "sms", "sms_encoded")
+
+  def __init__(self):
+    for field in self.__slots__:
+      setattr(self, field, None)
+
+  def isValid(self):
+    """Check that all mandatory SMS fields are there
+
+    return: (bool) SMS has content, phone number, date, time and charset
+    """
+    return (self.sms is not None) and (self.phone_number is not None) and (self.date is not None) \
+           and (self.time is not None) and (self.charset is not None)
+
+  def toDict(self):
+    """Get available fields of the SMS (same format as GSMTC35 functions)
+
+    return: ({}) Available fields (see class description)
+    """
+    return dict([(field, getattr(self, field)) for field in self.__slots__ if getattr(self, field) is not None])
+
+  @staticmethod
+  def fromDict(data):
+    """Create SMS record from SMS dictionary (unknown fields are ignored)
+
+    Keyword arguments:
+      data -- ({}) SMS data (same format as {toDict()} result)
+
+    return: (SmsRecord) SMS record
+    """
+    record = SmsRecord()
+    for field in SmsRecord.__slots__:
+      if field in data:
+        setattr(record, field, data[field])
+    return record
+
+  def __eq__(self, other):
+    return isinstance(other, SmsRecord) and self.toDict() == other.toDict()
+
+  def __ne__(self, other):
+    return not self.__eq__(other)
+
+  def __repr__(self):
+    return "SmsRecord("+str(self.toDict())+")"
+
+def _decodeSemiOctets(data):
+  """Decode swapped semi-octets (phone number, timestamp, ...)
+
+  Keyword arguments:
+    data -- (memoryview) Encoded data
+
+  return: (string) Decoded data (potential fill semi-octet included)
+  """
+  return binascii.hexlify(bytes(data).translate(_SEMI_OCTETS_SWAP_TABLE)).decode().upper()
+
+def _decodePhoneNumber(data):
+  """Decode phone number stored as swapped semi-octets
+
+  Keyword arguments:
+    data -- (memoryview) Encoded phone number
+
+  return: (string) Phone number (without fill semi-octet)
+  """
+  phone_number = _decodeSemiOctets(data)
+  if phone_number.endswith("F"):
+    phone_number = phone_number[:-1]
+  return phone_number
+
+def decodeSms(pdu, decode_sms=True):
+  """Decode PDU SMS (as received from a GSM module)
+
+  Note: Invalid SMS is logged but does not throw (for reliability)
+
+  Keyword arguments:
+    pdu -- (string) PDU SMS (hexadecimal readable format)
+    decode_sms -- (bool, optional) Is it needed to decode SMS content even if charset is unknown?
+
+  return: (SmsRecord) Decoded SMS (use isValid() to check that all mandatory fields are there)
+  """
+  result = SmsRecord()
+
+  # Be sure message is of hexa type
+  try:
+    data = memoryview(binascii.unhexlify(pdu))
+  except (TypeError, ValueError):
+    logging.error("Can't decode PDU SMS because is not hexadecimal content: \""+str(pdu)+"\"")
+    return result
+
+  try:
+    _decodeSms(data, decode_sms, result)
+  except (ValueError, IndexError) as e:
+    logging.error("SMS is not valid, sms hexa content: \""+str(pdu)+"\": "+str(e))
+    return SmsRecord()
+
+  return result
+
+def _decodeSms(data, decode_sms, result):
+  """Decode PDU SMS fields one after the other
+
+  Keyword arguments:
+    data -- (memoryview) PDU SMS
+    decode_sms -- (bool) Is it needed to decode SMS content even if charset is unknown?
+    result -- (SmsRecord) Decoded SMS fields (filled even if an error occured)
+  """
+  # Service center data (type and phone number)
+  length_service_center = data[0]
+  if length_service_center > 0:
+    result.service_center_type = data[1]
+    result.service_center_phone_number = _decodePhoneNumber(data[2:1+length_service_center])
+  offset = 1 + length_service_center
+
+  # First byte
+  content_contains_header = (data[offset] & 0b1000000) != 0
+
+  # Sender Phone data (type and number)
+  length_sender_phone_number = data[offset+1]
+  result.phone_number_type = data[offset+2]
+  offset += 3
+  phone_number = _decodeSemiOctets(data[offset:offset+(length_sender_phone_number+1)//2])[:length_sender_phone_number]
+  if result.phone_number_type == _INTERNATIONAL_PHONE_NUMBER_TYPE:
+    phone_number = "+" + phone_number
+  result.phone_number = phone_number
+  offset += (length_sender_phone_number+1)//2
+
+  # Protocol ID / TP-PID (not used) and Data coding scheme / TP-DCS
+  data_coding_scheme = data[offset+1]
+  offset += 2
+
+  # Timestamp
+  timestamp = _decodeSemiOctets(data[offset:offset+7])
+  if len(timestamp) < 14:
+    raise IndexError("timestamp is not complete")
+  offset += 7
+  gmt = timestamp[12:14]
+  if int(gmt[1], 16) >= 8:
+    gmt_decoded = "GMT-"
+    gmt = gmt[0] + str(int(gmt[1], 16) - 8)
+  else:
+    gmt_decoded = "GMT+"
+  gmt_decoded += str(int(gmt, 10)/4)
+  result.date = timestamp[0:2] + "/" + timestamp[2:4] + "/" + timestamp[4:6]
+  result.time = timestamp[6:8] + ":" + timestamp[8:10] + ":" + timestamp[10:12] + " " + gmt_decoded
+
+  # Message content
+  message_length = data[offset]
+  offset += 1
+
+  # Charset
+  if (data_coding_scheme & 0xc0) == 0:
+    if data_coding_scheme & 0x20:
+      logging.error("Not possible to find correct encoding")
+      if decode_sms:
+        return
+      else:
+        charset = "unknown"
+    try:
+      charset = {0x00: '7bit', 0x04: '8bit', 0x08: 'utf16-be'}[data_coding_scheme & 0x0c]
+    except KeyError:
+      logging.error("Not possible to find correct encoding")
+      if decode_sms:
+        return
+      else:
+        charset = "unknown"
+  elif (data_coding_scheme & 0xf0) in (0xc0, 0xd0):
+    charset = '7bit'
+  elif (data_coding_scheme & 0xf0) == 0xe0:
+    charset = 'utf16-be'
+  elif (data_coding_scheme & 0xf0) == 0xf0:
+    charset = {0x00: '7bit', 0x04: '8bit'}[data_coding_scheme & 0x04]
+  else:
+    logging.error("Not possible to find correct encoding")
+    if decode_sms:
+      return
+    else:
+      charset = "unknown"
+
+  result.charset = charset
+
+  # SMS content header
+  header_length = 0
+  if content_contains_header:
+    header_length = data[offset]
+    information_elements = decodeUserDataHeader(data[offset:offset+1+header_length])
+    if len(information_elements) > 0:
+      result.header_iei, header_ie_data = information_elements[0]
+      result.header_ie_data = binascii.hexlify(header_ie_data).decode().upper()
+      result.header_elements = [(iei, binascii.hexlify(ie_data).decode().upper()) for iei, ie_data in information_elements]
+      # Add multipart information if there is a 'Concatenated short message' element (0x00 or 0x08)
+      concatenation = decodeConcatenationElement(information_elements)
+      if concatenation is not None:
+        result.header_multipart_ref_id, result.header_multipart_nb_of_part, result.header_multipart_current_part_nb = concatenation
+
+  # SMS Content
+  user_data = data[offset:]
+  logging.debug("Encoded "+str(charset)+" SMS content: "+binascii.hexlify(user_data).decode())
+  if charset == '7bit':  # Default Alphabet aka basic 7 bit coding - 03.38 S6.2.1
+    # Skip header (+ header size byte and fill bits) from the message
+    header_septets = 0
+    if content_contains_header:
+      header_septets = int(ceil((header_length+1) * 8 / 7.0))
+    septets = unpackSeptets(user_data)
+    sms = decodeGsm0338(septets[header_septets:min(message_length, 0xa0)])
+    sms_encoded = binascii.hexlify(sms.encode()).decode()
+  elif charset == '8bit':  # 8 bit coding is "user defined". S6.2.2
+    if content_contains_header:
+      user_data = user_data[header_length+1:]
+    sms = bytes(user_data).decode('latin-1')
+    sms_encoded = binascii.hexlify(user_data).decode()
+  elif charset == 'utf16-be':  # UTF-16 aka UCS2, S6.2.3
+    if content_contains_header:
+      user_data = user_data[header_length+1:]
+    sms = bytes(user_data).decode('utf-16be')
+    # Note: First byte is not in the encoded content if there is no header (kept for compatibility)
+    sms_encoded = binascii.hexlify(user_data if content_contains_header else user_data[1:]).decode()
+  else:
+    sms = ""
+    sms_encoded = binascii.hexlify(user_data).decode()
+
+  result.sms = sms
+  logging.debug("Decoded SMS content: "+sms)
+  result.sms_encoded = sms_encoded.upper()
+  logging.debug("Re-encoded SMS content: "+result.sms_encoded)
+
+def decodeSmsList(pdus, decode_sms=True, processes=0, chunk_size=500):
+  """Decode multiple PDU SMS, potentially in multiple processes
+
+  Note: Using multiple processes is only useful for a lot of SMS (at least
+        thousands) since PDU must be sent to the worker processes
+
+  Keyword arguments:
+    pdus -- (iterable of string) PDU SMS (hexadecimal readable format)
+    decode_sms -- (bool, optional) Is it needed to decode SMS content even if charset is unknown?
+    processes -- (int, optional) Number of worker processes (0 to decode in the current process, None for one process per CPU)
+    chunk_size -- (int, optional) Number of PDU SMS sent at once to a worker process
+
+  return: ([SmsRecord]) Decoded SMS (in the same order as {pdus})
+  """
+  if processes == 0:
+    return [decodeSms(pdu, decode_sms) for pdu in pdus]
+
+  if processes is None:
+    processes = os.cpu_count() or 1
+  chunk_size = max(int(chunk_size), 1)
+
+  result = []
+  pdus = iter(pdus)
+  with ProcessPoolExecutor(max_workers=processes) as executor:
+    # Only keep a few chunks in progress (all PDU may not fit in memory)
+    pending_chunks = collections.deque()
+    while True:
+      chunk = list(itertools.islice(pdus, chunk_size))
+      if len(chunk) <= 0:
+        break
+      pending_chunks.append(executor.submit(_decodeSmsChunk, chunk, decode_sms))
+      if len(pending_chunks) >= 2 * processes:
+        result.extend(pending_chunks.popleft().result())
+
+    while len(pending_chunks) > 0:
+      result.extend(pending_chunks.popleft().result())
+
+  return result
+
+def _decodeSmsChunk(pdus, decode_sms):
+  """Decode multiple PDU SMS (in a worker process)
+
+  Keyword arguments:
+    pdus -- ([string]) PDU SMS (hexadecimal readable format)
+    decode_sms -- (bool) Is it needed to decode SMS content even if charset is unknown?
+
+  return: ([SmsRecord]) Decoded SMS (in the same order as {pdus})
+  """
+  return [decodeSms(pdu, decode_sms) for pdu in pdus]
+
+############################### MULTIPART SMS #################################
+def _getSmsField(sms, field):
+  """Get field of SMS dictionary or SmsRecord (None if not available)"""
+  if isinstance(sms, dict):
+    return sms.get(field)
+  return getattr(sms, field, None)
+
+class MultipartSmsBuffer(object):
+  """Reassemble multipart SMS (MMS) received in multiple parts
+
+  Parts are kept (even between multiple {GSMTC35.getSMS()} calls) until all
+  parts of the SMS (same phone number, reference and number of parts) are
+  received or until the timeout is reached.
+
+  Note: Parts waiting in the buffer can be added again (they are only kept
+        once), but parts of returned SMS must not be added again (delete
+        them from the GSM module once they are stored, see {isPendingSms()})
+
+  Example of use:
+  '''
+  mms_buffer = pdu.MultipartSmsBuffer(timeout_sec=3600)
+  for sms in mms_buffer.addSms(gsm.getSMS()) + mms_buffer.popExpiredSms():
+    print(sms["phone_number"]+": "+sms["sms"])
+  '''
+  """
+  def __init__(self, timeout_sec=86400):
+    """Initialize the multipart SMS buffer
+
+    Keyword arguments:
+      timeout_sec -- (int, optional) Maximum time to wait missing parts of a multipart SMS (since its first part)
+    """
+    self.__timeout_sec = timeout_sec
+    # (phone number, ref id, nb of part) -> [timeout time, {part nb: SMS}] (ordered by timeout time)
+    self.__pending_sms = collections.OrderedDict()
+    self.__expired_sms = []
+    self.__lock = threading.Lock()
+
+  def addSms(self, all_sms):
+    """Add SMS to the buffer and get all complete SMS
+
+    Keyword arguments:
+      all_sms -- ([{}] or [SmsRecord]) SMS (as returned by {GSMTC35.getSMS()} or {decodeSms()})
+
+    return: ([{}] or [SmsRecord]) Complete SMS: SMS which are not multipart and
+            merged multipart SMS (content of all parts and data of the first part)
+    """
+    complete_sms = []
+    with self.__lock:
+      now = time.monotonic()
+      self.__evictExpiredSms(now)
+      for sms in all_sms:
+        ref_id = _getSmsField(sms, "header_multipart_ref_id")
+        nb_of_part = _getSmsField(sms, "header_multipart_nb_of_part")
+        current_part = _getSmsField(sms, "header_multipart_current_part_nb")
+        if (ref_id is None) or (nb_of_part is None) or (current_part is None) \
+           or (nb_of_part <= 1) or (current_part < 1) or (current_part > nb_of_part):
+          complete_sms.append(sms)
+          continue
+
+        key = (_getSmsField(sms, "phone_number"), ref_id, nb_of_part)
+        if not key in self.__pending_sms:
+          self.__pending_sms[key] = [now + self.__timeout_sec, {}]
+        parts = self.__pending_sms[key][1]
+        parts[current_part] = sms
+        if len(parts) == nb_of_part:
+          del self.__pending_sms[key]
+          complete_sms.append(MultipartSmsBuffer.__mergeParts(parts, nb_of_part))
+
+    return complete_sms
+
+  def popExpiredSms(self):
+    """Get (and forget) all multipart SMS which are still incomplete after the timeout
+
+    return: ([{}] or [SmsRecord]) Incomplete merged SMS (missing parts are ignored)
+    """
+    with self.__lock:
+      self.__evictExpiredSms(time.monotonic())
+      expired_sms = self.__expired_sms
+      self.__expired_sms = []
+    return expired_sms
+
+  def isPendingSms(self, sms):
+    """Check if a SMS part is kept in the buffer (waiting for missing parts)
+
+    Keyword arguments:
+      sms -- ({} or SmsRecord) SMS part (as returned by {GSMTC35.getSMS()} or {decodeSms()})
+
+    return: (bool) SMS part is in the buffer
+    """
+    key = (_getSmsField(sms, "phone_number"), _getSmsField(sms, "header_multipart_ref_id"),
+           _getSmsField(sms, "header_multipart_nb_of_part"))
+    with self.__lock:
+      return (key in self.__pending_sms) \
+             and (_getSmsField(sms, "header_multipart_current_part_nb") in self.__pending_sms[key][1])
+
+  def getNbOfPendingParts(self):
+    """Get number of SMS parts waiting for missing parts
+
+    return: (int) Number of SMS parts in the buffer
+    """
+    with self.__lock:
+      return sum(len(parts) for _, parts in self.__pending_sms.values())
+
+  def __evictExpiredSms(self, now):
+    """Move multipart SMS reaching timeout to expired SMS (lock must be taken)
+
+    Keyword arguments:
+      now -- (float) Current monotonic time
+    """
+    while len(self.__pending_sms) > 0:
+      key, (timeout_time, parts) = next(iter(self.__pending_sms.items()))
+      if timeout_time > now:
+        break
+      del self.__pending_sms[key]
+      logging.warning("Missing part(s) of multipart SMS "+str(key)+" after timeout, SMS will be incomplete")
+      self.__expired_sms.append(MultipartSmsBuffer.__mergeParts(parts, key[2]))
+
+  @staticmethod
+  def __mergeParts(parts, nb_of_part):
+    """Merge parts of a multipart SMS
+
+    Keyword arguments:
+      parts -- ({int: {} or SmsRecord}) Available parts of the SMS (part number -> SMS)
+      nb_of_part -- (int) Number of parts of the SMS
+
+    return: ({} or SmsRecord) SMS with data of the first available part and content of all available parts
+    """
+    all_parts = [parts[part_nb] for part_nb in range(1, nb_of_part + 1) if part_nb in parts]
+    content = {}
+    for field in ("sms", "sms_encoded"):
+      all_content = [_getSmsField(sms, field) for sms in all_parts]
+      if not None in all_content:
+        content[field] = "".join(all_content)
+
+    if isinstance(all_parts[0], dict):
+      merged_sms = dict(all_parts[0])
+      merged_sms.pop("header_multipart_current_part_nb", None)
+      merged_sms.update(content)
+    else:
+      merged_sms = SmsRecord.fromDict(all_parts[0].toDict())
+      merged_sms.header_multipart_current_part_nb = None
+      for field, value in content.items():
+        setattr(merged_sms, field, value)
+
+    return merged_sms
@@ -10,19 +10,67 @@ __email__ = "quentin@comte-gaz.com"
 __license__ = "MIT License"
 __copyright__ = "Copyright Quentin Comte-Gaz (2019)"
 __python_version__ = "3.+"
-__version__ = "1.0 (2019/10/08)"
+__version__ = "1.1 (2019/11/15)"
 __status__ = "Ready for production"
 
 import os
 import sqlite3
 import logging
+import queue
+import contextlib
 
 class InternalDB():
-  def __init__(self, db_filename):
-    """Initialize the internal database class"""
+  def __init__(self, db_filename, max_idle_connections=4):
+    """Initialize the internal database class
+
+    Keyword arguments:
+      db_filename -- (string) SQLite database file
+      max_idle_connections -- (int, optional) Maximum number of opened connections kept for next requests
+    """
     self.db_filename = db_filename
+    self.initialized = False
+    self.__idle_connections = queue.Queue(maxsize=max_idle_connections)
     self.createDatabaseIfNeeded()
 
+  def close(self):
+    """Close all opened connections (connections in use are closed once not used anymore)"""
+    while True:
+      try:
+        self.__idle_connections.get_nowait().close()
+      except queue.Empty:
+        break
+
+  def __openConnection(self):
+    """Open a new connection to the database (WAL mode: reading does not block writing)
+
+    return: (sqlite3.Connection) Opened connection
+    """
+    conn = sqlite3.connect(self.db_filename, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Database is still consistent after a crash, only last transactions may be lost after a power failure
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+  @contextlib.contextmanager
+  def __connection(self):
+    """Get a connection to the database (already opened if possible) in a transaction
+
+    Note: The transaction is committed at the end (rolled back if an exception occurred)
+    """
+    try:
+      conn = self.__idle_connections.get_nowait()
+    except queue.Empty:
+      conn = self.__openConnection()
+
+    try:
+      with conn:
+        yield conn
+    finally:
+      try:
+        self.__idle_connections.put_nowait(conn)
+      except queue.Full:
+        conn.close()
+
   def createDatabaseIfNeeded(self):
     """Create the database needed for the class to work (created at init but can be called again if failed)
 
@@ -32,7 +80,7 @@ class InternalDB():
     if not os.path.exists(self.db_filename):
       # Create the database
       try:
-        with sqlite3.connect(self.db_filename) as conn:
+        with self.__connection() as conn:
           logging.debug("Creating database at "+str(self.db_filename))
           schema = """CREATE TABLE sms (
                         id                INTEGER       PRIMARY KEY AUTOINCREMENT NOT NULL,
@@ -47,6 +95,15 @@ class InternalDB():
         logging.error("Failed to create database: "+str(e))
         return False
 
+    # Add indexes (also to databases created by previous versions)
+    try:
+      with self.__connection() as conn:
+        conn.execute("CREATE INDEX IF NOT EXISTS sms_phone_number_timestamp ON sms (phone_number, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS sms_timestamp ON sms (timestamp)")
+    except sqlite3.OperationalError as e:
+      logging.error("Failed to update database: "+str(e))
+      return False
+
     self.initialized = True
     return True
 
@@ -71,7 +128,7 @@ class InternalDB():
       return False
 
     try:
-      with sqlite3.connect(self.db_filename) as conn:
+      with self.__connection() as conn:
         conn.execute("""
           INSERT INTO sms
             (timestamp, received, phone_number, content)
@@ -86,6 +143,41 @@ class InternalDB():
 
     return True
 
+  def insertManySMS(self, all_sms):
+    """Insert multiple SMS in the database (in one transaction)
+
+    Keyword arguments:
+      all_sms -- ([{},]) All SMS to insert (with 'timestamp', 'received', 'phone_number', 'content', see {insertSMS()})
+
+    return: (bool, int) All SMS inserted in the database (none are inserted if failed), Number of inserted SMS
+    """
+    if not self.initialized:
+      logging.error("Class not initialized")
+      return False, 0
+
+    try:
+      rows = []
+      for sms in all_sms:
+        if not sms["content"]:
+          logging.warning("Empty SMS will not be stored in the database")
+          continue
+        rows.append((int(sms["timestamp"]), bool(sms["received"]), str(sms["phone_number"]), str(sms["content"])))
+
+      if len(rows) > 0:
+        with self.__connection() as conn:
+          conn.executemany("""
+            INSERT INTO sms
+              (timestamp, received, phone_number, content)
+            VALUES (?, ?, ?, ?)""", rows)
+    except (KeyError, ValueError) as e:
+      logging.error("Failed to prepare request: "+str(e))
+      return False, 0
+    except sqlite3.OperationalError as e:
+      logging.error("Failed to execute request: "+str(e))
+      return False, 0
+
+    return True, len(rows)
+
   def deleteSMS(self, sms_id=None, phone_number=None, before_timestamp=None):
     """Delete SMS from the database
 
@@ -103,7 +195,7 @@ class InternalDB():
       return False, 0
 
     try:
-      with sqlite3.connect(self.db_filename) as conn:
+      with self.__connection() as conn:
         # Base request
         request = "DELETE FROM sms"
         params = []
@@ -137,13 +229,17 @@ class InternalDB():
     logging.error("Unknown error")
     return False, []
 
-  def getSMS(self, phone_number=None, after_timestamp=None, limit=None):
-    """Get SMS from the database
+  def getSMS(self, phone_number=None, after_timestamp=None, limit=None, after_id=None):
+    """Get SMS from the database (ordered by timestamp, then by ID)
+
+    To get all SMS page by page, use 'timestamp' and 'id' of the last SMS of a page
+    as {after_timestamp} and {after_id} to get the next page.
 
     Keyword arguments:
       phone_number -- (string, optional) Only phone number to get
       after_timestamp -- (int, optional) Minimum timestamp
-      limit -- (int, optional) Max number of SMS to get (note: Not optimized since "ORDER BY" is not usable)
+      limit -- (int, optional) Max number of SMS to get
+      after_id -- (int, optional) Get only SMS after SMS {after_id} of timestamp {after_timestamp} (needs {after_timestamp})
 
     return: (bool, [{},]) Success, all SMS (with 'id', 'timestamp', 'received', 'phone_number', 'content')
     """
@@ -151,29 +247,34 @@ class InternalDB():
       logging.error("Class not initialized")
       return False, []
 
+    if (after_id is not None) and (after_timestamp is None):
+      logging.error("Timestamp of the SMS to get SMS after must be specified")
+      return False, []
+
     try:
-      with sqlite3.connect(self.db_filename) as conn:
+      with self.__connection() as conn:
         # Base request
         request = "SELECT id, timestamp, received, phone_number, content FROM sms"
+        conditions = []
         params = []
         # Potential conditions
-        if (phone_number is not None) or (after_timestamp is not None):
-          request += " WHERE"
-          if (phone_number is not None):
-            request += " phone_number = ?"
-            params.append(str(phone_number))
-          if (after_timestamp is not None):
-            if (phone_number is not None):
-              request += " AND"
-            request += " timestamp >= ?"
-            params.append(int(after_timestamp))
+        if (phone_number is not None):
+          conditions.append("phone_number = ?")
+          params.append(str(phone_number))
+        if (after_id is not None):
+          conditions.append("timestamp >= ? AND (timestamp > ? OR id > ?)")
+          params += [int(after_timestamp), int(after_timestamp), int(after_id)]
+        elif (after_timestamp is not None):
+          conditions.append("timestamp >= ?")
+          params.append(int(after_timestamp))
+        if len(conditions) > 0:
+          request += " WHERE " + " AND ".join(conditions)
+        # Order (read from the indexes, no sorting needed)
+        request += " ORDER BY timestamp, id"
         # Potential limit
         if limit is not None:
           request += " LIMIT ?"
           params.append(int(limit))
-        # Order
-        # Note: Order is not handled by default with sqlite3 package...
-        #request += " ORDER BY timestamp"
 
         # Do the SQLite request
         cursor = conn.cursor()
@@ -201,6 +302,42 @@ class InternalDB():
     logging.error("Unknown error")
     return False, []
 
+  def iterateSMS(self, phone_number=None, after_timestamp=None, limit=None, after_id=None, batch_size=500):
+    """Iterate over SMS from the database (ordered by timestamp, then by ID) without loading all of them in memory
+
+    SMS are read by batches of {batch_size} SMS (see {getSMS()} for other parameters).
+    Iteration stops (with an error logged) if the database can't be read anymore.
+
+    Keyword arguments:
+      phone_number -- (string, optional) Only phone number to get
+      after_timestamp -- (int, optional) Minimum timestamp
+      limit -- (int, optional) Max number of SMS to get
+      after_id -- (int, optional) Get only SMS after SMS {after_id} of timestamp {after_timestamp} (needs {after_timestamp})
+      batch_size -- (int, optional) Number of SMS read from the database at a time
+
+    return: (generator of {}) All SMS (with 'id', 'timestamp', 'received', 'phone_number', 'content')
+    """
+    remaining = limit
+    while (remaining is None) or (remaining > 0):
+      nb_of_sms_to_get = batch_size if remaining is None else min(batch_size, remaining)
+      res, all_sms = self.getSMS(phone_number=phone_number, after_timestamp=after_timestamp,
+                                 limit=nb_of_sms_to_get, after_id=after_id)
+      if not res:
+        logging.error("Failed to read all SMS from the database")
+        return
+
+      for sms in all_sms:
+        yield sms
+
+      if len(all_sms) < nb_of_sms_to_get:
+        return
+
+      # Next batch starts after the last SMS of this batch
+      after_timestamp = all_sms[-1]["timestamp"]
+      after_id = all_sms[-1]["id"]
+      if remaining is not None:
+        remaining -= len(all_sms)
+
 # ---- Launch example of use if script executed directly ----
 if __name__ == '__main__':
   logger = logging.getLogger()
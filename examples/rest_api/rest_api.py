@@ -8,7 +8,7 @@
    - Call (POST http://127.0.0.1:8080/api/call with header data 'phone_number' and optional 'hide_phone_number')
    - Hang up call (DELETE http://127.0.0.1:8080/api/call)
    - Pick up call (PUT http://127.0.0.1:8080/api/call)
-   - Get SMS/MMS (GET http://127.0.0.1:8080/api/sms with optional header data 'phone_number', 'after_timestamp' and 'limit')
+   - Get SMS/MMS (GET http://127.0.0.1:8080/api/sms with optional header data 'phone_number', 'after_timestamp', 'after_id', 'limit' and 'stream')
    - Send SMS/MMS (POST http://127.0.0.1:8080/api/sms with header data 'phone_number', 'content' and optional 'is_content_in_hexa_format')
    - Delete SMS/MMS (DELETE http://127.0.0.1:8080/api/sms with optional header data 'id', 'phone_number', 'before_timestamp')
    - Get module date (GET http://127.0.0.1:8080/api/date)
@@ -33,14 +33,19 @@ __version__ = "0.2 (2019/10/08)"
 __status__ = "Can be used for test but not for production (not fully secured)"
 
 
-from flask import Flask, request
+from flask import Flask, request, Response, stream_with_context
 from flask_restful import Resource, Api
 from flask_httpauth import HTTPBasicAuth
 
 from datetime import datetime
+import atexit
+import concurrent.futures
+import functools
+import threading
 import time
 import logging
 import binascii
+import json
 import serial
 
 # Import our internal database helper
@@ -51,6 +56,8 @@ import sys
 sys.path.append("../..")
 
 from GSMTC35 import GSMTC35
+from GSMTC35 import PriorityGSMTC35
+from GSMTC35 import pdu
 
 
 # ---- Config ----
@@ -58,6 +65,8 @@ pin = "1234"
 puk = "12345678"
 port = "COM8"
 api_database_filename = "sms.db"
+multipart_sms_timeout_sec = 24*3600
+max_sms_waiting_to_be_sent = 100
 http_port = 8080
 http_prefix = "/api"
 BASIC_AUTH_DATA = {
@@ -83,6 +92,11 @@ api = Api(app, prefix=http_prefix)
 
 api_database = InternalDB(api_database_filename)
 
+# Parts of multipart SMS waiting for their missing parts (kept between requests, and kept in the GSM module until stored)
+multipart_sms_buffer = pdu.MultipartSmsBuffer(timeout_sec=multipart_sms_timeout_sec)
+# SMS of the GSM module are stored by one request at a time
+sms_storage_lock = threading.Lock()
+
 # ---- Authentification (basic-auth) ----
 auth = HTTPBasicAuth()
 
@@ -102,22 +116,151 @@ def verify(username, password):
   return BASIC_AUTH_DATA.get(username) == password
 
 # ---- Base functions ----
+# GSM session shared by all requests (GSM module commands are executed one after the other, calls first)
+gsm_session = None
+gsm_session_lock = threading.Lock()
+
 def getGSM():
-  """Base function to get initialized GSM class
+  """Base function to get initialized GSM class (GSM module is initialized only if not already done)
 
-  return (bool, GSMTC35, string): success, GSM class, error explanation
+  return (bool, PriorityGSMTC35, string): success, GSM class, error explanation
   """
-  gsm = GSMTC35.GSMTC35()
-
-  try:
-    if not gsm.isInitialized():
-      if not gsm.setup(_port="COM8", _pin=pin, _puk=puk):
+  global gsm_session
+  with gsm_session_lock:
+    if gsm_session is not None:
+      return True, gsm_session, str("")
+
+    gsm = PriorityGSMTC35.PriorityGSMTC35()
+    try:
+      if not gsm.setup(_port=port, _pin=pin, _puk=puk):
+        gsm.shutdown()
         return False, gsm, str("Failed to initialize GSM/SIM")
+    except serial.serialutil.SerialException:
+      gsm.shutdown()
+      return False, gsm, str("Failed to connect to GSM module")
+
+    gsm_session = gsm
+
+  return True, gsm_session, str("")
+
+@atexit.register
+def closeGSM():
+  """Close the GSM session (a new one is initialized by the next request)"""
+  global gsm_session
+  with gsm_session_lock:
+    if gsm_session is not None:
+      try:
+        gsm_session.close()
+      except serial.serialutil.SerialException:
+        logging.warning("Failed to properly close GSM session")
+      gsm_session.shutdown(wait=False)
+      gsm_session = None
+
+def closeGSMOnError(function):
+  """Decorator closing the GSM session if the connection with the GSM module failed during a request"""
+  @functools.wraps(function)
+  def requestFunction(*args, **kwargs):
+    try:
+      return function(*args, **kwargs)
+    except serial.serialutil.SerialException:
+      logging.error("Connection with GSM module lost")
+      closeGSM()
+      return {"result": False, "error": "Connection with GSM module lost"}
+    except concurrent.futures.CancelledError:
+      # GSM session closed (by another request) before this request used the GSM module
+      return {"result": False, "error": "GSM session closed before the end of the request, please try again"}
+  return requestFunction
+
+# SMS queued by the requests and not sent yet (other functions waiting to be executed are not counted)
+nb_of_sms_waiting_to_be_sent = 0
+sms_waiting_lock = threading.Lock()
+
+def queueSMS(gsm, phone_number, content):
+  """Send SMS with the GSM session worker without waiting it to be sent (if not too many SMS are waiting)
+
+  Keyword arguments:
+    gsm -- (PriorityGSMTC35) Initialized GSM module
+    phone_number -- (str) Phone number
+    content -- (str) Content of the SMS
+
+  return (concurrent.futures.Future, string): Future result of the sending (None if not queued), error explanation
+  """
+  global nb_of_sms_waiting_to_be_sent
+  with sms_waiting_lock:
+    if nb_of_sms_waiting_to_be_sent >= max_sms_waiting_to_be_sent:
+      return None, str("Too many SMS waiting to be sent")
+    future = gsm.queueSMS(phone_number, content)
+    if future is None:
+      return None, str("GSM session closed before the end of the request, please try again")
+    nb_of_sms_waiting_to_be_sent += 1
+
+  def onSmsSent(future):
+    global nb_of_sms_waiting_to_be_sent
+    with sms_waiting_lock:
+      nb_of_sms_waiting_to_be_sent -= 1
+  future.add_done_callback(onSmsSent)
+
+  return future, str("")
+
+def getTimestamp(sms):
+  """Get UTC timestamp of a SMS given by GSMTC35 class
+
+  Keyword arguments:
+    sms -- ({}) SMS (see {GSMTC35.getSMS()})
+
+  return: (int) Timestamp of the SMS
+  """
+  return int(time.mktime(datetime.strptime(str(str(sms['date']) + " " + str(sms['time'].split(' ')[0])), "%y/%m/%d %H:%M:%S").timetuple()))
+
+def getMultipartKey(sms):
+  """Get the multipart SMS a SMS belongs to (same key as {pdu.MultipartSmsBuffer})
 
-  except serial.serialutil.SerialException:
-    return False, gsm, str("Failed to connect to GSM module")
+  Keyword arguments:
+    sms -- ({}) SMS (see {GSMTC35.getSMS()}, or multipart SMS given by {pdu.MultipartSmsBuffer})
+
+  return: ((str, int, int)) Phone number, reference and number of parts of the multipart SMS
+  """
+  return (sms['phone_number'], sms.get('header_multipart_ref_id'), sms.get('header_multipart_nb_of_part'))
+
+def storeGsmSMS(gsm):
+  """Store all SMS of the GSM module in the database and delete them from the GSM module
+
+  Parts of multipart SMS are kept in the GSM module until all parts are received
+  (or until the timeout is reached) so that they are not lost if the API is restarted.
+
+  Keyword arguments:
+    gsm -- (PriorityGSMTC35) Initialized GSM module
 
-  return True, gsm, str("")
+  return: (bool) All complete SMS stored
+  """
+  with sms_storage_lock:
+    all_gsm_sms = gsm.getSMS()
+
+    # Multipart SMS which will never be complete (their parts are still in the GSM module)
+    all_expired_sms = multipart_sms_buffer.popExpiredSms()
+    all_expired_keys = set(getMultipartKey(sms) for sms in all_expired_sms)
+    all_expired_parts = [sms for sms in all_gsm_sms if getMultipartKey(sms) in all_expired_keys]
+
+    # Other SMS (multipart SMS are stored once all parts are received)
+    all_other_sms = [sms for sms in all_gsm_sms if not getMultipartKey(sms) in all_expired_keys]
+    all_complete_sms = multipart_sms_buffer.addSms(all_other_sms) + all_expired_sms
+
+    # Insert all SMS into the database in one transaction
+    res, _ = api_database.insertManySMS([{"timestamp": getTimestamp(gsm_sms), "received": True,
+                                          "phone_number": gsm_sms['phone_number'],
+                                          "content": gsm_sms['sms_encoded']} for gsm_sms in all_complete_sms])
+    if not res:
+      # SMS are still in the GSM module, they will be stored by the next request
+      logging.warning("Failed to insert SMS into database")
+      return False
+
+    # Delete stored SMS from the module (SMS received since the SMS were read are not deleted)
+    for gsm_sms in all_expired_parts + all_other_sms:
+      if not multipart_sms_buffer.isPendingSms(gsm_sms):
+        if not gsm.deleteSMS(gsm_sms['index']):
+          logging.warning("Failed to delete stored SMS "+str(gsm_sms['index'])+" from the GSM module")
+
+  return True
 
 def checkBoolean(value):
   """Return a bool from a string (or bool)"""
@@ -126,7 +269,11 @@ def checkBoolean(value):
   return str(value).lower() == "true" or str(value) == "1"
 
 # ---- API class ----
-class Ping(Resource):
+class GSMResource(Resource):
+  """Resource using the GSM session"""
+  method_decorators = [closeGSMOnError]
+
+class Ping(GSMResource):
   """Are GSM module and PIN ready to work?"""
   @auth.login_required
   def get(self):
@@ -139,11 +286,15 @@ class Ping(Resource):
     """
     valid_gsm, gsm, error = getGSM()
     if valid_gsm:
-      return {"result": True, "status": gsm.isAlive()}
+      is_alive = gsm.isAlive()
+      if not is_alive:
+        # GSM module will be initialized again by the next request
+        closeGSM()
+      return {"result": True, "status": is_alive}
     else:
       return {"result": False, "error": error}
 
-class Date(Resource):
+class Date(GSMResource):
   """Get module internal date/Set module internal date to current date"""
   @auth.login_required
   def get(self):
@@ -178,7 +329,7 @@ class Date(Resource):
     else:
       return {"result": False, "error": error}
 
-class Call(Resource):
+class Call(GSMResource):
   """Call/Get call status/Pick up call/Hang up call"""
   @auth.login_required
   def get(self):
@@ -250,7 +401,7 @@ class Call(Resource):
     else:
       return {"result": False, "error": error}
 
-class Sms(Resource):
+class Sms(GSMResource):
   """Send SMS/Get SMS/Delete SMS"""
   @auth.login_required
   def get(self):
@@ -260,63 +411,44 @@ class Sms(Resource):
       - (str, optional, default: All phone number) 'phone_number': Specific phone number to get SMS from
       - (int, optional, default: All timestamp) 'after_timestamp': Minimum timestamp (UTC) to get SMS from
       - (int, optional, default: No limit) 'limit': Maximum number of SMS to get
+      - (int, optional, default: All SMS) 'after_id': Get only SMS after this SMS ID of timestamp 'after_timestamp'
+                                                     (to get next page: 'id' and 'timestamp' of the last SMS)
+      - (bool, optional, default: False) 'stream': Send SMS one by one (one JSON SMS per line) while they are read from the database
+
+    SMS are ordered by timestamp (then by ID).
 
     return (json):
       - (bool) 'result': Request worked?
       - (list of sms) 'sms': List of all found SMS
       - (str, optional) 'error': Error explanation if request failed
+    return (ndjson, if 'stream' is True and request worked):
+      - (sms) One found SMS per line (stream stops early if database can't be read anymore,
+              use 'after_timestamp' and 'after_id' of the last received SMS to get the remaining SMS)
     """
     _phone_number = request.headers.get('phone_number', default = None, type = str)
     _after_timestamp = request.headers.get('after_timestamp', default = None, type = int)
     _limit = request.headers.get('limit', default = None, type = int)
+    _after_id = request.headers.get('after_id', default = None, type = int)
+    _stream = request.headers.get('stream', default = "false", type = str)
+    _stream = checkBoolean(_stream)
+    if (_after_id is not None) and (_after_timestamp is None):
+      return {"result": False, "error": "Please specify the timestamp of the SMS to get SMS after (after_timestamp)"}
     valid_gsm, gsm, error = getGSM()
     if valid_gsm:
-      # Get all SMS from GSM module
-      all_gsm_sms = gsm.getSMS()
-      if all_gsm_sms:
-        # Insert all GSM module SMS into the database
-        all_mms = []
-        for gsm_sms in all_gsm_sms:
-          _timestamp = int(time.mktime(datetime.strptime(str(str(gsm_sms['date']) + " " + str(gsm_sms['time'].split(' ')[0])), "%y/%m/%d %H:%M:%S").timetuple()))
-          if ('header_multipart_ref_id' in gsm_sms) and ('header_multipart_current_part_nb' in gsm_sms) and ('header_multipart_nb_of_part' in gsm_sms):
-            all_mms.append(gsm_sms)
-          else:
-            if not api_database.insertSMS(timestamp=_timestamp, received=True, phone_number=gsm_sms['phone_number'], content=gsm_sms['sms_encoded']):
-              logging.warning("Failed to insert SMS into database")
-
-        # Try to merge multipart SMS into MMS before storing them into the database
-        while len(all_mms) > 0:
-          ref_id = all_mms[0]['header_multipart_ref_id']
-          nb_of_part = all_mms[0]['header_multipart_nb_of_part']
-          _timestamp = int(time.mktime(datetime.strptime(str(str(all_mms[0]['date']) + " " + str(all_mms[0]['time'].split(' ')[0])), "%y/%m/%d %H:%M:%S").timetuple()))
-          _phone_number = all_mms[0]['phone_number']
-          parts = {}
-          parts[int(all_mms[0]['header_multipart_current_part_nb'])] = all_mms[0]['sms_encoded']
-          all_mms.remove(all_mms[0])
-          all_sms_to_remove = []
-
-          for sms in all_mms:
-            if sms['header_multipart_ref_id'] == ref_id:
-              parts[int(sms['header_multipart_current_part_nb'])] = sms['sms_encoded']
-              all_sms_to_remove.append(sms)
-
-          for sms_to_remove in all_sms_to_remove:
-            all_mms.remove(sms_to_remove)
-
-          full_msg = ""
-          for current_part in range(nb_of_part):
-            try:
-              full_msg += parts[current_part+1]
-            except KeyError:
-              logging.warning("Missing part of the MMS... Missing part may be received later and will be stored as an other SMS!")
-
-          if not api_database.insertSMS(timestamp=_timestamp, received=True, phone_number=_phone_number, content=full_msg):
-            logging.warning("Failed to insert SMS into database")
-
-        # Delete all SMS from the module (because they are stored in the database)
-        gsm.deleteSMS()
+      # Store all SMS of the GSM module into the database
+      storeGsmSMS(gsm)
+
+      # Send all SMS following the right pattern while reading them (memory use does not depend on the number of SMS)
+      if _stream:
+        def generateSmsLines():
+          for db_sms in api_database.iterateSMS(phone_number=_phone_number, after_timestamp=_after_timestamp,
+                                                limit=_limit, after_id=_after_id):
+            yield json.dumps(db_sms) + "\n"
+        return Response(stream_with_context(generateSmsLines()), mimetype="application/x-ndjson")
+
       # Return all SMS following the right pattern
-      res, all_db_sms = api_database.getSMS(phone_number=_phone_number, after_timestamp=_after_timestamp, limit=_limit)
+      res, all_db_sms = api_database.getSMS(phone_number=_phone_number, after_timestamp=_after_timestamp,
+                                            limit=_limit, after_id=_after_id)
       if res:
         return {"result": True, "sms": all_db_sms}
       else:
@@ -352,7 +484,11 @@ class Sms(Resource):
           _content = bytearray.fromhex(_content).decode('utf-8')
         except (AttributeError, UnicodeEncodeError, UnicodeDecodeError):
           return {"result": False, "error": "Failed to decode content"}
-      status_send_sms = gsm.sendSMS(_phone_number, _content)
+      # SMS are sent by the GSM session worker (calls are handled first)
+      future, error = queueSMS(gsm, _phone_number, _content)
+      if future is None:
+        return {"result": False, "error": error}
+      status_send_sms = future.result()[0]
       if status_send_sms:
         if not api_database.insertSMS(timestamp=int(time.time()), received=False,
                                       phone_number=str(_phone_number),
@@ -384,7 +520,7 @@ class Sms(Resource):
     else:
       return {"result": False, "error": "Failed to delete all SMS from database"}
 
-class Info(Resource):
+class Info(GSMResource):
   """Get information on module or SIM"""
   @auth.login_required
   def get(self):
@@ -406,6 +542,8 @@ class Info(Resource):
                           - 'accumulated_call_meter': Get accumulated call meter (in home units)
                           - 'max_accumulated_call_meter': Get max accumulated call meter (in home units)
                           - 'temperature_status': Get module temperature status (True=critical, False=OK)
+                          - 'summary': Get manufacturer, model, revision, IMEI, IMSI, current used operator
+                                       and signal strength (in dBm) with only one request to the module
 
     return (json):
       - (bool) 'result': Request worked?
@@ -464,6 +602,8 @@ class Info(Resource):
           return {"result": False, "error": "Failed to get max accumulated call meter"}
       elif _request == 'temperature_status':
         response = gsm.isTemperatureCritical()
+      elif _request == 'summary':
+        response = gsm.getInformation()
       else:
         return {"result": False, "error": "Invalid request parameter"}
 
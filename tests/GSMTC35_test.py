@@ -8,10 +8,16 @@
 
 import unittest
 from GSMTC35 import GSMTC35
+from GSMTC35 import AsyncGSMTC35
+from GSMTC35 import PriorityGSMTC35
+from GSMTC35 import pdu
 import logging
+import asyncio
+import concurrent.futures
 import re
 import datetime
 import time
+import threading
 import sys
 
 # Python 2.7/3  (Mock)
@@ -88,7 +94,7 @@ class MockSerial:
     MockSerial.__timestamp_begin_delay = None
 
   def __init__(self, port="", baudrate="", parity="", stopbits="", bytesize="", timeout=""):
-    return
+    self.timeout = timeout
 
   def inWaiting(self):
     """Fake serial.inWaiting function
@@ -129,6 +135,11 @@ class MockSerial:
             fake_delay = (int(MockSerial.__read_write[0]['wait_ms'])/1000) - ((1000*time.time() - MockSerial.__timestamp_begin_delay)/1000)
 
           if fake_delay > 0:
+            if isinstance(self.timeout, (int, float)) and fake_delay > self.timeout:
+              # Serial port timeout reached before the data is sent
+              logging.debug("Fake serial port timeout of "+str(self.timeout)+" seconds reached before sending data")
+              time.sleep(self.timeout)
+              return b''
             logging.debug("Fake serial port delay of "+str(fake_delay)+" seconds in progress before sending data")
             time.sleep(fake_delay)
 
@@ -346,9 +357,8 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS=24\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
+      {'IN': b'AT+CMGS=24\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
       {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -359,9 +369,8 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS=24\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
+      {'IN': b'AT+CMGS=24\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
       {'OUT': b'ERROR\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -382,9 +391,8 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS=24\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
+      {'IN': b'AT+CMGS=24\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
       {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -395,9 +403,8 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS=24\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
+      {'IN': b'AT+CMGS=24\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'^0001[0-9A-F]{2}0B913306010203[0-9A-F]{2}00000CD4F29C0E6A97E7F3F0B90C', 'mode': 'regex'},
       {'OUT': b'ERROR\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -417,7 +424,7 @@ class TestGSMTC35(unittest.TestCase):
     # --sendTextModeSMS
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'Test message\x1a'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'Test message\x1a'}, {'OUT': b'OK\r\n'},
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -427,7 +434,7 @@ class TestGSMTC35(unittest.TestCase):
 
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'Test message\x1a'}, {'OUT': b'ERROR\r\n'},
+      {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'Test message\x1a'}, {'OUT': b'ERROR\r\n'},
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -449,7 +456,6 @@ class TestGSMTC35(unittest.TestCase):
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -474,7 +480,6 @@ class TestGSMTC35(unittest.TestCase):
       {'OUT': b'+CMGL: 9,0,,39\r\n'},
       {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
       {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CMGD=9\r\n'}, {'OUT': b'ERROR\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
@@ -500,7 +505,6 @@ class TestGSMTC35(unittest.TestCase):
       {'OUT': b'+CMGL: 9,0,,39\r\n'},
       {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
       {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -526,7 +530,6 @@ class TestGSMTC35(unittest.TestCase):
       {'OUT': b'+CMGL: 9,0,,39\r\n'},
       {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
       {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -636,13 +639,10 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CGMM\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CGMR\r\n'}, {'OUT': b'FAKE_REVISION\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CIMI\r\n'}, {'OUT': b'FAKE_IMSI\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+COPS=3,0\r\n'}, {'OUT': b'OK\r\n'}, {'IN': b'AT+COPS?\r\n'}, {'OUT': b'+COPS: 0,1,\"FAKE_OPERATOR\"\r\n'}, {'OUT': b'OK\r\n'},
-      {'IN': b'AT+CSQ\r\n'}, {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CGMI;+CGMM;+CGMR;+CGSN;+CIMI;+COPS=3,0;+COPS?;+CSQ\r\n'},
+      {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'FAKE_REVISION\r\n'},
+      {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'FAKE_IMSI\r\n'}, {'OUT': b'+COPS: 0,1,\"FAKE_OPERATOR\"\r\n'},
+      {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CCLK?\r\n'}, {'OUT': b'+CCLK: 11/12/13,14:15:16\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT^SLCD\r\n'}, {'OUT': b'^SLCD: 12:34:56\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+COPN\r\n'}, {'OUT': b'+COPN: 1,\"FAKE1\"\r\n'}, {'OUT': b'+COPN: 2,\"FAKE 2\"\r\n'}, {'OUT': b'+COPN: 3,\"Fake Three\"\r\n'}, {'OUT': b'+COPN: DUMMY_ERROR\r\n'},{'OUT': b'DUMMY_ERROR\r\n'}, {'OUT': b'OK\r\n'},
@@ -688,6 +688,7 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup() + [
       {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CGMI;+CGMM;+CGMR;+CGSN;+CIMI;+COPS=3,0;+COPS?;+CSQ\r\n'}, {'OUT': b'ERROR\r\n'},
       {'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CGMM\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'OK\r\n'},
       {'IN': b'AT+CGMR\r\n'}, {'OUT': b'FAKE_REVISION\r\n'}, {'OUT': b'OK\r\n'},
@@ -1141,6 +1142,57 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock([{'IN': b'AT\r\n'}])
     self.assertFalse(gsm.isAlive())
 
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_wait_incoming_data(self):
+    logging.debug("test_all_wait_incoming_data")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    # Answer must be handled as soon as it is received (no polling delay in the library,
+    # only the fake serial port delay is allowed to sleep)
+    real_sleep = time.sleep
+    library_sleeps = []
+    def spySleep(delay):
+      if sys._getframe(1).f_globals.get("__name__") == GSMTC35.__name__:
+        library_sleeps.append(delay)
+      real_sleep(delay)
+
+    with patch('time.sleep', new=spySleep):
+      MockSerial.initializeMock([{'IN': b'AT\r\n'}, {'OUT': b'OK\r\n', 'wait_ms': 20}])
+      start_time = time.time()
+      self.assertTrue(gsm.isAlive())
+      self.assertLess(time.time() - start_time, 1)
+
+      MockSerial.initializeMock([{'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n', 'wait_ms': 10}, {'OUT': b'OK\r\n', 'wait_ms': 10}])
+      start_time = time.time()
+      self.assertEqual(str(gsm.getManufacturerId()), "FAKE_MANUFACTURER")
+      self.assertLess(time.time() - start_time, 1)
+    self.assertEqual(library_sleeps, [])
+
+    # Timeout must still be respected if nothing is received
+    MockSerial.initializeMock([{'IN': b'AT\r\n'}])
+    start_time = time.time()
+    self.assertFalse(gsm.isAlive())
+    self.assertGreaterEqual(time.time() - start_time, 2)
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_read_line(self):
+    logging.debug("test_all_read_line")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    # Multiple lines received at once and lines split in multiple chunks
+    MockSerial.initializeMock([{'IN': b'AT+COPN\r\n'},
+                               {'OUT': b'+COPN: 1,"Operator 1"\r\n+COPN: 2,"Operator 2"\r\n+COPN: 3,"Oper'},
+                               {'OUT': b'ator 3"\r'}, {'OUT': b'\n+COPN: 4,"Operator 4"\r\nOK\r\n'}])
+    self.assertEqual(gsm.getOperatorNames(), ["Operator 1", "Operator 2", "Operator 3", "Operator 4"])
+
+    # Incomplete line is not considered as a line (even if it contains the expected data)
+    MockSerial.initializeMock([{'IN': b'AT\r\n'}, {'OUT': b'\r\nOK'}])
+    self.assertFalse(gsm.isAlive())
+
   @patch('serial.Serial', new=MockSerial)
   def test_all_get_manufacturer_id(self):
     logging.debug("test_all_get_manufacturer_id")
@@ -1283,6 +1335,158 @@ class TestGSMTC35(unittest.TestCase):
     MockSerial.initializeMock([{'IN': b'AT+CSQ\r\n'}, {'OUT': b'ERROR\r\n'}])
     self.assertEqual(gsm.getSignalStrength(), -1)
 
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_get_information(self):
+    logging.debug("test_all_get_information")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    all_information = {GSMTC35.GSMTC35.eInformation.MANUFACTURER_ID: "FAKE_MANUFACTURER",
+                       GSMTC35.GSMTC35.eInformation.MODEL_ID: "FAKE_MODEL",
+                       GSMTC35.GSMTC35.eInformation.REVISION_ID: "FAKE_REVISION",
+                       GSMTC35.GSMTC35.eInformation.IMEI: "FAKE_IMEI",
+                       GSMTC35.GSMTC35.eInformation.IMSI: "FAKE_IMSI",
+                       GSMTC35.GSMTC35.eInformation.OPERATOR_NAME: "FAKE_OPERATOR",
+                       GSMTC35.GSMTC35.eInformation.SIGNAL_STRENGTH: 7}
+
+    # All information in one request
+    MockSerial.initializeMock([{'IN': b'AT+CGMI;+CGMM;+CGMR;+CGSN;+CIMI;+COPS=3,0;+COPS?;+CSQ\r\n'},
+                               {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'FAKE_REVISION\r\n'},
+                               {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'FAKE_IMSI\r\n'}, {'OUT': b'+COPS: 0,1,\"FAKE_OPERATOR\"\r\n'},
+                               {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getInformation(), all_information)
+
+    # Specific information in one request (answers with prefix are found whatever their order)
+    MockSerial.initializeMock([{'IN': b'AT+CSQ;+CGSN;+COPS=3,0;+COPS?\r\n'},
+                               {'OUT': b'+COPS: 0,1,\"FAKE_OPERATOR\"\r\n'}, {'OUT': b'+CSQ: 99,99\r\n'},
+                               {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getInformation([GSMTC35.GSMTC35.eInformation.SIGNAL_STRENGTH,
+                                         GSMTC35.GSMTC35.eInformation.IMEI,
+                                         GSMTC35.GSMTC35.eInformation.OPERATOR_NAME]),
+                     {GSMTC35.GSMTC35.eInformation.SIGNAL_STRENGTH: -1,
+                      GSMTC35.GSMTC35.eInformation.IMEI: "FAKE_IMEI",
+                      GSMTC35.GSMTC35.eInformation.OPERATOR_NAME: "FAKE_OPERATOR"})
+
+    # Chained commands failed (or unexpected answers), information requested one after the other
+    sequential_requests = [{'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+CGMM\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+CGMR\r\n'}, {'OUT': b'FAKE_REVISION\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+CIMI\r\n'}, {'OUT': b'FAKE_IMSI\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+COPS=3,0\r\n'}, {'OUT': b'OK\r\n'}, {'IN': b'AT+COPS?\r\n'}, {'OUT': b'+COPS: 0,1,\"FAKE_OPERATOR\"\r\n'}, {'OUT': b'OK\r\n'},
+                           {'IN': b'AT+CSQ\r\n'}, {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'}]
+    MockSerial.initializeMock([{'IN': b'AT+CGMI;+CGMM;+CGMR;+CGSN;+CIMI;+COPS=3,0;+COPS?;+CSQ\r\n'}, {'OUT': b'ERROR\r\n'}]
+                              + sequential_requests)
+    self.assertEqual(gsm.getInformation(), all_information)
+
+    MockSerial.initializeMock([{'IN': b'AT+CGMI;+CGMM;+CGMR;+CGSN;+CIMI;+COPS=3,0;+COPS?;+CSQ\r\n'},
+                               {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'}]
+                              + sequential_requests)
+    self.assertEqual(gsm.getInformation(), all_information)
+
+    MockSerial.initializeMock([{'IN': b'AT+CGMI;+CGMM\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'},
+                               {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'UNEXPECTED\r\n'}, {'OUT': b'OK\r\n'}]
+                              + sequential_requests[:6])
+    self.assertEqual(gsm.getInformation([GSMTC35.GSMTC35.eInformation.MANUFACTURER_ID,
+                                         GSMTC35.GSMTC35.eInformation.MODEL_ID]),
+                     {GSMTC35.GSMTC35.eInformation.MANUFACTURER_ID: "FAKE_MANUFACTURER",
+                      GSMTC35.GSMTC35.eInformation.MODEL_ID: "FAKE_MODEL"})
+
+    # Information requested one after the other
+    MockSerial.initializeMock(sequential_requests)
+    self.assertEqual(gsm.getInformation(pipelined=False), all_information)
+
+    # Invalid information
+    MockSerial.initializeMock([])
+    self.assertEqual(gsm.getInformation(["INVALID"]), {})
+    self.assertEqual(gsm.getInformation([]), {})
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_cache(self):
+    logging.debug("test_all_cache")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    self.assertFalse(gsm.setCacheTimeToLive("INVALID"))
+    self.assertTrue(gsm.setCacheTimeToLive(-1))
+
+    # Results are only requested once
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+COPN\r\n'}, {'OUT': b'+COPN: 1,\"FAKE1\"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBS="SM"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=?\r\n'}, {'OUT': b'+CPBR: (1-250),20,14\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=1,250\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=1,250\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+    self.assertEqual(gsm.getOperatorNames(), ["FAKE1"])
+    self.assertEqual(gsm.getOperatorNames(), ["FAKE1"])
+    self.assertEqual(gsm.getPhonebookEntries("SM"), [])
+    self.assertEqual(gsm.getPhonebookEntries(), [])
+
+    # Phonebook restrictions are kept for each phonebook
+    MockSerial.initializeMock([{'IN': b'AT+CPBS="ME"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=?\r\n'}, {'OUT': b'+CPBR: (1-100),20,14\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=1,100\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBS="SM"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CPBR=1,250\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getPhonebookEntries("ME"), [])
+    self.assertEqual(gsm.getPhonebookEntries("SM"), [])
+
+    # Only information not in the cache are requested
+    MockSerial.initializeMock([{'IN': b'AT+CGMI;+CSQ\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'},
+                               {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CSQ\r\n'}, {'OUT': b'+CSQ: 60,USELESS\r\n'}, {'OUT': b'OK\r\n'}])
+    information = [GSMTC35.GSMTC35.eInformation.MANUFACTURER_ID, GSMTC35.GSMTC35.eInformation.IMEI,
+                   GSMTC35.GSMTC35.eInformation.SIGNAL_STRENGTH]
+    expected_information = {GSMTC35.GSMTC35.eInformation.MANUFACTURER_ID: "FAKE_MANUFACTURER",
+                            GSMTC35.GSMTC35.eInformation.IMEI: "FAKE_IMEI",
+                            GSMTC35.GSMTC35.eInformation.SIGNAL_STRENGTH: 7}
+    self.assertEqual(gsm.getInformation(information), expected_information)
+    self.assertEqual(gsm.getInformation(information), expected_information)
+
+    # Invalid results are not kept in the cache
+    MockSerial.initializeMock([{'IN': b'AT+CIMI\r\n'}, {'OUT': b'ERROR\r\n'},
+                               {'IN': b'AT+CIMI\r\n'}, {'OUT': b'FAKE_IMSI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getIMSI(), "")
+    self.assertEqual(gsm.getIMSI(), "FAKE_IMSI")
+    self.assertEqual(gsm.getIMSI(), "FAKE_IMSI")
+
+    # Cache is invalidated with PIN operations
+    MockSerial.initializeMock([{'IN': b'AT+CPIN=1234\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.enterPin("1234"))
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+
+    # Cache can be invalidated manually
+    gsm.invalidateCache()
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+
+    # Results expire
+    self.assertTrue(gsm.setCacheTimeToLive(0.1))
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+    time.sleep(0.2)
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+
+    # Cache is invalidated with a new setup
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup()
+                              + [{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+
+    # Cache disabled
+    self.assertTrue(gsm.setCacheTimeToLive(0))
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+    self.assertEqual(gsm.getIMEI(), "FAKE_IMEI")
+
   @patch('serial.Serial', new=MockSerial)
   def test_all_get_operator_names(self):
     logging.debug("test_all_get_operator_names")
@@ -1851,6 +2055,116 @@ class TestGSMTC35(unittest.TestCase):
                                {'IN': b'AT+CPWD="SC","1234","4321"\r\n'}, {'OUT': b'ERROR\r\n'}])
     self.assertFalse(gsm.changePin(old_pin="1234", new_pin="4321"))
 
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_unsolicited_results(self):
+    logging.debug("test_all_unsolicited_results")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    received = []
+    def handler(urc_type, line, data):
+      received.append((urc_type, line, data))
+    def failingHandler(urc_type, line, data):
+      raise ValueError("Failing handler")
+
+    self.assertFalse(gsm.addUnsolicitedResultHandler("+INVALID", handler))
+    self.assertFalse(gsm.addUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, "not a function"))
+    for urc_type in [GSMTC35.GSMTC35.eUnsolicitedResult.RING, GSMTC35.GSMTC35.eUnsolicitedResult.CALLER_ID,
+                     GSMTC35.GSMTC35.eUnsolicitedResult.NEW_SMS_INDICATION, GSMTC35.GSMTC35.eUnsolicitedResult.NEW_SMS,
+                     GSMTC35.GSMTC35.eUnsolicitedResult.TEMPERATURE]:
+      self.assertTrue(gsm.addUnsolicitedResultHandler(urc_type, handler))
+    self.assertTrue(gsm.addUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, failingHandler))
+
+    MockSerial.initializeMock([{'IN': b'AT+CLIP=1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CNMI=1,1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT^SCTM=1\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.enableUnsolicitedResults())
+
+    MockSerial.initializeMock([{'IN': b'AT+CLIP=1\r\n'}, {'OUT': b'ERROR\r\n'}])
+    self.assertFalse(gsm.enableUnsolicitedResults(sms=False, temperature=False))
+
+    # Answered command does not hide unsolicited results of the same type anymore
+    MockSerial.initializeMock([{'IN': b'AT^SCTM=1\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.enableUnsolicitedResults(call=False, sms=False))
+    MockSerial.initializeMock([{'OUT': b'^SCTM: 1\r\n'}, {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.isAlive())
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.TEMPERATURE, "^SCTM: 1", "")])
+
+    # Status report is sent in one line in text mode
+    del received[:]
+    self.assertTrue(gsm.addUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.STATUS_REPORT, handler))
+    MockSerial.initializeMock([{'OUT': b'+CDS: 6,12,"+33601020304",145,"19/11/16,10:10:10+04","19/11/16,10:10:12+04",0\r\nRING\r\n'}])
+    self.assertEqual(gsm.processUnsolicitedResults(waiting_time_sec=0.1), 2)
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.STATUS_REPORT,
+                                 '+CDS: 6,12,"+33601020304",145,"19/11/16,10:10:10+04","19/11/16,10:10:12+04",0', ""),
+                                (GSMTC35.GSMTC35.eUnsolicitedResult.RING, "RING", "")])
+    self.assertTrue(gsm.removeUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.STATUS_REPORT, handler))
+    del received[:]
+
+    # Unsolicited result received while a command is in progress
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'+CMTI: "SM",3\r\n'},
+                               {'OUT': b'FAKE_IMEI\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(str(gsm.getIMEI()), "FAKE_IMEI")
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.NEW_SMS_INDICATION, '+CMTI: "SM",3', "")])
+
+    # Answer of the command in progress is not an unsolicited result
+    del received[:]
+    MockSerial.initializeMock([{'IN': b'AT^SCTM?\r\n'}, {'OUT': b'^SCTM: DUMMY,1,OTHER_DUMMY\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.isTemperatureCritical())
+    self.assertEqual(received, [])
+
+    # Unsolicited results received while no command is in progress (with multiline unsolicited result)
+    MockSerial.initializeMock([{'OUT': b'RING\r\n+CLIP: "+33601020304",145\r\n+CMT: ,24\r\n'},
+                               {'OUT': b'07913366003000F0040B913366\r\n^SCTM: 1\r\n'}])
+    self.assertEqual(gsm.processUnsolicitedResults(waiting_time_sec=0.1), 4)
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.RING, "RING", ""),
+                                (GSMTC35.GSMTC35.eUnsolicitedResult.CALLER_ID, '+CLIP: "+33601020304",145', ""),
+                                (GSMTC35.GSMTC35.eUnsolicitedResult.NEW_SMS, "+CMT: ,24", "07913366003000F0040B913366"),
+                                (GSMTC35.GSMTC35.eUnsolicitedResult.TEMPERATURE, "^SCTM: 1", "")])
+
+    MockSerial.initializeMock([])
+    self.assertEqual(gsm.processUnsolicitedResults(), 0)
+
+    # Unsolicited results deleted before a command are sent to the handlers
+    del received[:]
+    MockSerial.initializeMock([{'OUT': b'RING\r\nOLD DATA\r\n'},
+                               {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.isAlive())
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.RING, "RING", "")])
+
+    # Unsolicited result partly received before a command is not lost
+    del received[:]
+    MockSerial.initializeMock([{'OUT': b'+CMT: ,24\r\n0791336600'},
+                               {'IN': b'AT\r\n'}, {'OUT': b'3000F0040B913366\r\nOK\r\n'}])
+    self.assertTrue(gsm.isAlive())
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.NEW_SMS, "+CMT: ,24", "07913366003000F0040B913366")])
+
+    # Background listener
+    del received[:]
+    self.assertTrue(gsm.startUnsolicitedResultListener(period_sec=0.01))
+    self.assertTrue(gsm.startUnsolicitedResultListener(period_sec=0.01))
+    MockSerial.initializeMock([{'OUT': b'RING\r\n', 'wait_ms': 50}])
+    start_time = time.time()
+    while len(received) <= 0 and time.time() - start_time < 2:
+      time.sleep(0.01)
+    self.assertTrue(gsm.stopUnsolicitedResultListener())
+    self.assertFalse(gsm.stopUnsolicitedResultListener())
+    self.assertEqual(received, [(GSMTC35.GSMTC35.eUnsolicitedResult.RING, "RING", "")])
+
+    # Unregister handlers
+    self.assertTrue(gsm.removeUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, handler))
+    self.assertFalse(gsm.removeUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, handler))
+    del received[:]
+    MockSerial.initializeMock([{'OUT': b'RING\r\n'}])
+    self.assertEqual(gsm.processUnsolicitedResults(), 1)
+    self.assertEqual(received, [])
+
+    MockSerial.initializeMock([{'IN': b'AT+CLIP=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CNMI=0,0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT^SCTM=0\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.disableUnsolicitedResults())
+
   @patch('serial.Serial', new=MockSerial)
   def test_all_is_in_sleep_mode(self):
     logging.debug("test_all_is_in_sleep_mode")
@@ -2035,48 +2349,42 @@ class TestGSMTC35(unittest.TestCase):
 
     # One part 7 bit SMS with extended alphabet
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=36\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'IN': b'AT+CMGS=36\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example €", network_delay_sec=0))
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=36\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'ERROR\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=36\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example €", network_delay_sec=0))
 
     # Multipart 7 bit SMS with extended alphabet
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=140\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000091050003[0-9A-F]{2}02019A75363D0D0FCBE9A01B489CA683A6CD29A88C0FB7E1EC32685376B95C2E97CBE572B9402E97CBE572B95C2E17C8E572B95C2E97CBE502B95C2E97CBE572B95C2097CBE572B95C2E970BE472B95C2E97CBE572815C2E97CBE572B95C2E90CBE572B95C2E97CB0572B95C2E97CBE572B9402E97CBE572B95C2E\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=33\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000016050003[0-9A-F]{2}02025C2097CBE572B95C2E97ABE82402\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000092060804[0-9A-F]{4}0201CD3A9B9E8687E574D00D244ED341D3E61454C687DB707619B429BB5C2E97CBE572B95C2097CBE572B95C2E970BE472B95C2E97CBE572815C2E97CBE572B95C2E90CBE572B95C2E97CB0572B95C2E97CBE572B9402E97CBE572B95C2E17C8E572B95C2E97CBE502B95C2E97CBE572B95C2097CBE572B95C2E17\x1a$', 'mode': 'regex'},
+                               {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000017060804[0-9A-F]{4}02022E90CBE572B95C2E97CB55741201\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Multipart 7 bit SMS example €.......... .......... .......... .......... .......... .......... .......... .......... .......... .......... ..........END", network_delay_sec=0))
 
     # One part 7 bit SMS with base alphabet
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=34\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example", network_delay_sec=0))
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=34\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'ERROR\r\n'}])
-    self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example", network_delay_sec=0))
+    # No multipart reference is allocated for one part SMS
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    with patch.object(pdu.MultipartReferenceCounter, 'getNextReference', return_value=0x1234) as get_next_reference:
+      self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example", network_delay_sec=0))
+      self.assertEqual(get_next_reference.call_count, 0)
 
     # Multipart 7 bit SMS with base alphabet
     # This test also check robustness of the lib when receiving dirty char without end of line
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=140\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000091050003[0-9A-F]{2}02019A75363D0D0FCBE9A01B489CA683A6CD29A88C0FB7E1EC32C8E572B95C2E97CBE502B95C2E97CBE572B95C2097CBE572B95C2E970BE472B95C2E97CBE572815C2E97CBE572B95C2E90CBE572B95C2E97CB0572B95C2E97CBE572B9402E97CBE572B95C2E17C8E572B95C2E97CBE502B95C2E97CBE572B95C20\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'InvalidChar'}, {'OUT': b'', 'wait_ms': 3000}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=31\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000014050003[0-9A-F]{2}02025C2E97CBE572B95CAEA29308\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'', 'wait_ms': 3000}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
-    self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Multipart 7 bit SMS example .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... ..........END", network_delay_sec=0))
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n> '}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F400009206080412340201CD3A9B9E8687E574D00D244ED341D3E61454C687DB707619E472B95C2E97CBE572815C2E97CBE572B95C2E90CBE572B95C2E97CB0572B95C2E97CBE572B9402E97CBE572B95C2E17C8E572B95C2E97CBE502B95C2E97CBE572B95C2097CBE572B95C2E970BE472B95C2E97CBE572815C2E97CBE572B95C2E10\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'InvalidChar'}, {'OUT': b'', 'wait_ms': 1000}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000015060804123402022E97CBE572B95C2E57D14904\x1a$', 'mode': 'regex'},
+                               {'OUT': b'', 'wait_ms': 1000}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    with patch.object(pdu.MultipartReferenceCounter, 'getNextReference', return_value=0x1234) as get_next_reference:
+      self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Multipart 7 bit SMS example .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... ..........END", network_delay_sec=0))
+      self.assertEqual(get_next_reference.call_count, 1)
 
   @patch('serial.Serial', new=MockSerial)
   def test_failed_send_sms_7bit(self):
@@ -2087,14 +2395,12 @@ class TestGSMTC35(unittest.TestCase):
 
     # Error sent by GSM
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=36\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'IN': b'AT+CMGS=36\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F400001AC2F03C3D06DD40E2341D346D4E41657CB80D6797419B32\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 59\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'}])
     self.assertFalse(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example €", network_delay_sec=0))
 
     # Impossible to write data to serial port
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=36\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=36\r\n'}])
     self.assertFalse(gsm.sendSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example €", network_delay_sec=0))
 
     # Send empty SMS
@@ -2118,24 +2424,19 @@ class TestGSMTC35(unittest.TestCase):
 
     # One part UCS2 SMS
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=45\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'IN': b'AT+CMGS=45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Not 7bit char: °", network_delay_sec=0))
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=45\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'ERROR\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Not 7bit char: °", network_delay_sec=0))
 
     # Multipart UCS2 SMS
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=153\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F400088C050003[0-9A-F]{2}0201004E006F00740020003700620069007400200063006800610072003A002000B0002E002E002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=37\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000818050003[0-9A-F]{2}0202002E002E002E002E002E002E0045004E0044\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=152\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>\r\n'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F400088B060804[0-9A-F]{4}0201004E006F00740020003700620069007400200063006800610072003A002000B0002E002E002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E002E0020002E002E002E\x1a$', 'mode': 'regex'},
+                               {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=40\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0041[0-9A-F]{2}0B913306010203F400081B060804[0-9A-F]{4}0202002E002E002E002E002E002E002E0045004E0044\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Not 7bit char: °.......... ........ ........ ........ ........ ..........END", network_delay_sec=0))
 
   @patch('serial.Serial', new=MockSerial)
@@ -2146,9 +2447,8 @@ class TestGSMTC35(unittest.TestCase):
     self.assertTrue(gsm.setup(_port="COM_FAKE"))
 
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS=45\r\n'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'IN': b'AT+CMGS=45\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000820004E006F00740020003700620069007400200063006800610072003A002000B0\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'}])
     self.assertFalse(gsm.sendSMS(phone_number="+33601020304", msg="Not 7bit char: °"))
 
   @patch('serial.Serial', new=MockSerial)
@@ -2160,34 +2460,181 @@ class TestGSMTC35(unittest.TestCase):
 
     # One 7 bits SMS: wanted to use PDU mode but not possible so using text mode (fallback)
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'ERROR\r\n'},
-                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Text mode SMS", network_delay_sec=0))
 
     # One 7 bits SMS in text mode (< 70 bytes)
-    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Text mode SMS", network_delay_sec=0, force_text_mode=True))
 
     # One 7 bits SMS in text mode (> 70 bytes)
-    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode SMS .......... .......... .......... .......... .......... .......... ..........\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode SMS .......... .......... .......... .......... .......... .......... ..........\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Text mode SMS .......... .......... .......... .......... .......... .......... ..........", network_delay_sec=0, force_text_mode=True))
 
     # Multiple 7 bits SMS (NOT MMS because not possible) in text mode
-    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode multiple SMS .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... .......\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^...\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode multiple SMS .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... .......\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^...\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Text mode multiple SMS .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... ..........", network_delay_sec=0, force_text_mode=True))
 
     # Multiple UCS2 SMS (NOT MMS because not possible) in text mode
-    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode multiple SMS\xc2\xb0 .......... .......... .......... .......... ..\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^........ ..........\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode multiple SMS\xc2\xb0 .......... .......... .......... .......... ..\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^........ ..........\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertTrue(gsm.sendSMS(phone_number="+33601020304", msg="Text mode multiple SMS° .......... .......... .......... .......... .......... ..........", network_delay_sec=0, force_text_mode=True))
 
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_send_sms_and_get_references(self):
+    logging.debug("test_all_send_sms_and_get_references")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    first_part = {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000092060804[0-9A-F]{4}0201CD3A9B9E8687E574D00D244ED341D3E61454C687DB707619E472B95C2E97CBE572815C2E97CBE572B95C2E90CBE572B95C2E97CB0572B95C2E97CBE572B9402E97CBE572B95C2E17C8E572B95C2E97CBE502B95C2E97CBE572B95C2097CBE572B95C2E970BE472B95C2E97CBE572815C2E97CBE572B95C2E10\x1a$', 'mode': 'regex'}
+    second_part = {'IN': b'^0041[0-9A-F]{2}0B913306010203F4000015060804[0-9A-F]{4}02022E97CBE572B95C2E57D14904\x1a$', 'mode': 'regex'}
+    msg = "Multipart 7 bit SMS example .......... .......... .......... .......... .......... .......... .......... .......... .......... .......... ..........END"
+
+    # Multipart 7 bit SMS (next part sent as soon as the previous one is accepted)
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, first_part,
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 12\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, second_part,
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 13\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetReferences(phone_number="+33601020304", msg=msg), (True, [12, 13]))
+
+    # Rate limited parts
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, first_part,
+                               {'OUT': b'+CMGS: 14\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, second_part,
+                               {'OUT': b'+CMGS: 15\r\n'}, {'OUT': b'OK\r\n'}])
+    start_time = time.time()
+    self.assertEqual(gsm.sendSMSAndGetReferences(phone_number="+33601020304", msg=msg, min_part_interval_sec=0.3), (True, [14, 15]))
+    self.assertTrue(time.time() - start_time >= 0.3)
+
+    # Second part failed
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, first_part,
+                               {'OUT': b'+CMGS: 16\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, second_part,
+                               {'OUT': b'ERROR\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetReferences(phone_number="+33601020304", msg=msg), (False, [16]))
+
+    # Sending status (SMS refused before any part is sent can be sent again, partly sent SMS can't)
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'+CMS ERROR: 331\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetStatus(phone_number="+33601020304", msg=msg),
+                     (GSMTC35.GSMTC35.eSmsSendStatus.NOT_SENT, []))
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, first_part,
+                               {'OUT': b'+CMGS: 18\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'+CMS ERROR: 331\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetStatus(phone_number="+33601020304", msg=msg),
+                     (GSMTC35.GSMTC35.eSmsSendStatus.UNKNOWN, [18]))
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=141\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, first_part,
+                               {'OUT': b'+CMGS: 19\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=32\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, second_part,
+                               {'OUT': b'+CMGS: 20\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetStatus(phone_number="+33601020304", msg=msg),
+                     (GSMTC35.GSMTC35.eSmsSendStatus.SENT, [19, 20]))
+
+    # Text mode
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 17\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.sendSMSAndGetReferences(phone_number="+33601020304", msg="Text mode SMS", force_text_mode=True), (True, [17]))
+
+    # Invalid parameters
+    MockSerial.initializeMock([])
+    self.assertEqual(gsm.sendSMSAndGetReferences(phone_number="+33601020304", msg=""), (False, []))
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_sms_send_queue(self):
+    logging.debug("test_all_sms_send_queue")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    sms_to_send = {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'}
+
+    # Queue not started
+    MockSerial.initializeMock([])
+    self.assertEqual(gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example"), None)
+    self.assertFalse(gsm.stopSmsSendQueue())
+
+    # Failed part is sent again
+    self.assertTrue(gsm.startSmsSendQueue(max_queue_size=1, max_retries=1, retry_delay_sec=0, network_delay_sec=0))
+    self.assertFalse(gsm.startSmsSendQueue())
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMS ERROR: 500\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'OUT': b'\r\n'}, {'OUT': b'+CMGS: 5\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'OK\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertEqual(future.result(timeout=10), (True, [5]))
+
+    # Too many failures
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send, {'OUT': b'ERROR\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send, {'OUT': b'+CMS ERROR: 500\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertEqual(future.result(timeout=10), (False, []))
+
+    # Queue is full while the module is sending a SMS (back-pressure)
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'OUT': b'+CMGS: 6\r\n', 'wait_ms': 1000}, {'OUT': b'OK\r\n'}])
+    sent_sms = []
+    first_future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    first_future.add_done_callback(lambda future: sent_sms.append(future.result()))
+    while gsm.getSmsSendQueueSize() > 0:
+      time.sleep(0.01)
+    second_future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertNotEqual(second_future, None)
+    self.assertEqual(gsm.getSmsSendQueueSize(), 1)
+    self.assertEqual(gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example"), None)
+    self.assertTrue(second_future.cancel())
+    self.assertEqual(first_future.result(timeout=10), (True, [6]))
+    self.assertEqual(sent_sms, [(True, [6])])
+
+    # Queued SMS are cancelled if not waited
+    self.assertTrue(gsm.stopSmsSendQueue(wait=False))
+    self.assertEqual(gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example"), None)
+    self.assertEqual(gsm.getSmsSendQueueSize(), 0)
+
+    # Part without answer is not sent again (it may have been sent)
+    self.assertTrue(gsm.startSmsSendQueue(max_retries=1, retry_delay_sec=2, network_delay_sec=0))
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertEqual(future.result(timeout=10), (False, []))
+    self.assertTrue(gsm.isAlive())
+
+    # GSM module can be used while waiting to send a refused part again
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send, {'OUT': b'ERROR\r\n'},
+                               {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'OUT': b'+CMGS: 7\r\n'}, {'OUT': b'OK\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    time.sleep(0.5)
+    self.assertTrue(gsm.isAlive())
+    self.assertFalse(future.done())
+    self.assertEqual(future.result(timeout=10), (True, [7]))
+    self.assertTrue(gsm.stopSmsSendQueue())
+
+    # Part refused before the prompt is sent again (content was not written)
+    self.assertTrue(gsm.startSmsSendQueue(max_retries=3, retry_delay_sec=0, network_delay_sec=0))
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'+CMS ERROR: 331\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, sms_to_send,
+                               {'OUT': b'+CMGS: 8\r\n'}, {'OUT': b'OK\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertEqual(future.result(timeout=10), (True, [8]))
+
+    # Sending status of queued SMS
+    MockSerial.initializeMock([{'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'+CMS ERROR: 331\r\n'}] * 4)
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example", get_status=True)
+    self.assertEqual(future.result(timeout=10), (GSMTC35.GSMTC35.eSmsSendStatus.NOT_SENT, []))
+    self.assertTrue(gsm.stopSmsSendQueue())
+
   @patch('serial.Serial', new=MockSerial)
   def test_failed_send_sms_text_mode(self):
     logging.debug("test_failed_send_sms_text_mode")
@@ -2196,8 +2643,8 @@ class TestGSMTC35(unittest.TestCase):
     self.assertTrue(gsm.setup(_port="COM_FAKE"))
 
     MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'ERROR\r\n'},
-                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
-                               {'OUT': b'\r\n'}, {'OUT': b'>'}, {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'}])
+                               {'IN': b'AT+CMGS="+33601020304"\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'}, {'IN': b'^Text mode SMS\x1a$', 'mode': 'regex'},
+                               {'OUT': b'\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'ERROR\r\n'}])
     self.assertFalse(gsm.sendSMS(phone_number="+33601020304", msg="Text mode SMS", network_delay_sec=0))
 
   @patch('serial.Serial', new=MockSerial)
@@ -2211,98 +2658,88 @@ class TestGSMTC35(unittest.TestCase):
                                {'IN': b'AT+CMGL=0\r\n'},
                                {'OUT': b'+CMGL: 9,0,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.UNREAD_SMS, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC UNREAD', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=1\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=1\r\n'},
                                {'OUT': b'+CMGL: 9,1,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.READ_SMS, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC READ', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=2\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=2\r\n'},
                                {'OUT': b'+CMGL: 9,2,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.UNSENT_SMS, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'STO UNSENT', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=3\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=3\r\n'},
                                {'OUT': b'+CMGL: 9,3,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.SENT_SMS, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'STO SENT', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,0,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.ALL_SMS, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC UNREAD', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,0,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=-546, waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC UNREAD', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,0,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type="4", waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC UNREAD', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=3\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=3\r\n'},
                                {'OUT': b'+CMGL: 9,3,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type="3", waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'STO SENT', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,ALL,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'ALL', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,REC READ,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC READ', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,4,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'ALL', 'time': '10:37:32 GMT+1.0'}])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 9,UNDEFINED,,39\r\n'},
                                {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [{'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'ALL', 'time': '10:37:32 GMT+1.0'}])
 
+    # SMS record instead of dictionary
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
+                               {'OUT': b'+CMGL: 9,0,,39\r\n'},
+                               {'OUT': b'07911326040011F5240B911326880736F40000111081017323401654747A0E4ACF41F4329E0E6A97E7F3F0B90C9201\r\n'},
+                               {'OUT': b'+CMGL: 10,0,,39\r\n'},
+                               {'OUT': b'NOT_A_VALID_PDU\r\n'},
+                               {'OUT': b'OK\r\n'}])
+    all_sms = gsm.getSMS(waiting_time_sec=0, use_sms_record=True)
+    self.assertEqual(len(all_sms), 1)
+    self.assertTrue(isinstance(all_sms[0], pdu.SmsRecord))
+    self.assertEqual((all_sms[0].index, all_sms[0].status, all_sms[0].sms), (9, 'REC UNREAD', 'This is text message 2'))
+    self.assertEqual(all_sms[0].toDict(), {'charset': '7bit', 'date': '11/01/18', 'index': 9, 'phone_number': '+31628870634', 'phone_number_type': 145, 'service_center_phone_number': '31624000115', 'service_center_type': 145, 'sms': 'This is text message 2', 'sms_encoded': '546869732069732074657874206D6573736167652032', 'status': 'REC UNREAD', 'time': '10:37:32 GMT+1.0'})
+
   @patch('serial.Serial', new=MockSerial)
   def test_all_get_sms_text_mode(self):
     logging.debug("test_all_get_sms_text_mode")
@@ -2364,6 +2801,21 @@ class TestGSMTC35(unittest.TestCase):
                       ]
                     )
 
+    # SMS record instead of dictionary
+    MockSerial.initializeMock([{'IN': b'AT+CMGL="ALL"\r\n'},
+                               {'OUT': b'+CMGL: 1,"REC UNREAD","+31628870634",,"11/01/09,10:26:26+04"\r\n'},
+                               {'OUT': b'This is text message 1\r\n'},
+                               {'OUT': b'OK\r\n'}])
+    all_sms = gsm.getSMS(force_text_mode=True, waiting_time_sec=0, use_sms_record=True)
+    self.assertEqual(len(all_sms), 1)
+    self.assertTrue(isinstance(all_sms[0], pdu.SmsRecord))
+    self.assertEqual(all_sms[0].toDict(),
+                     {
+                       'charset': 'TC35TextModeInconsistentCharset', 'date': '11/01/09', 'index': 1,
+                       'phone_number': '+31628870634', 'sms': 'This is text message 1', 'status': 'REC UNREAD',
+                       'time': '10:26:26+04'
+                     })
+
   @patch('serial.Serial', new=MockSerial)
   def test_success_get_sms_7bit_8bit_ucs2(self):
     logging.debug("test_success_get_sms_7bit_8bit_ucs2")
@@ -2397,8 +2849,7 @@ class TestGSMTC35(unittest.TestCase):
                                # TODO: I have no example of 8 bit SMS, feel free to send it to me if you have one !
                                # 8 bit extended SMS
                                # TODO: I have no example of 8 bit MMS, feel free to send it to me if you have one !
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'ERROR\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(sms_type=GSMTC35.GSMTC35.eSMS.UNREAD_SMS, waiting_time_sec=0),
                      [
                        {
@@ -2415,7 +2866,7 @@ class TestGSMTC35(unittest.TestCase):
                        },
                        {'index': 3, 'status': 'REC UNREAD', 'service_center_type': 145,
                          'service_center_phone_number': '33695000638', 'phone_number_type': 145, 'phone_number': '+33604028611', 'date': '19/11/06',
-                         'time': '01:36:31 GMT+1.0', 'charset': '7bit', 'header_iei': 0, 'header_ie_data': '320201', 'header_multipart_ref_id': 50,
+                         'time': '01:36:31 GMT+1.0', 'charset': '7bit', 'header_iei': 0, 'header_ie_data': '320201', 'header_elements': [(0, '320201')], 'header_multipart_ref_id': 50,
                          'header_multipart_nb_of_part': 2, 'header_multipart_current_part_nb': 1,
                          'sms': 'Extended 7 bit SMS (MMS) !!!!!! .................. .................... ...................... .................. ............................ ..........',
                          'sms_encoded': '457874656E64656420372062697420534D5320284D4D532920212121212121202E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E202E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E202E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E202E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E202E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E2E202E2E2E2E2E2E2E2E2E2E'
@@ -2423,7 +2874,7 @@ class TestGSMTC35(unittest.TestCase):
                        {
                          'index': 4, 'status': 'REC UNREAD', 'service_center_type': 145, 'service_center_phone_number': '33695000638',
                          'phone_number_type': 145, 'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:36:32 GMT+1.0',
-                         'charset': '7bit', 'header_iei': 0, 'header_ie_data': '320202', 'header_multipart_ref_id': 50,
+                         'charset': '7bit', 'header_iei': 0, 'header_ie_data': '320202', 'header_elements': [(0, '320202')], 'header_multipart_ref_id': 50,
                          'header_multipart_nb_of_part': 2, 'header_multipart_current_part_nb': 2,
                          'sms': '....ENDSecond part here',
                          'sms_encoded': '2E2E2E2E454E445365636F6E6420706172742068657265'
@@ -2437,28 +2888,24 @@ class TestGSMTC35(unittest.TestCase):
                        {
                          'index': 5, 'status': 'REC UNREAD', 'service_center_type': 145, 'service_center_phone_number': '33695000636', 'phone_number_type': 145,
                          'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:37:39 GMT+1.0', 'charset': 'utf16-be', 'header_iei': 0,
-                         'header_ie_data': '330201', 'header_multipart_ref_id': 51, 'header_multipart_nb_of_part': 2, 'header_multipart_current_part_nb': 1,
+                         'header_ie_data': '330201', 'header_elements': [(0, '330201')], 'header_multipart_ref_id': 51, 'header_multipart_nb_of_part': 2, 'header_multipart_current_part_nb': 1,
                          'sms': 'Extended UCS2 SMS (MMS) |°.°| ............................. .......',
                          'sms_encoded': '0045007800740065006E0064006500640020005500430053003200200053004D005300200028004D004D005300290020007C00B0002E00B0007C0020002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E002E0020002E002E002E002E002E002E002E'
                        },
                        {
                          'index': 6, 'status': 'REC UNREAD', 'service_center_type': 145, 'service_center_phone_number': '33695000636', 'phone_number_type': 145,
-                         'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:37:40 GMT+1.0', 'charset': 'utf16-be', 'header_iei': 0, 'header_ie_data': '330202',
+                         'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:37:40 GMT+1.0', 'charset': 'utf16-be', 'header_iei': 0, 'header_ie_data': '330202', 'header_elements': [(0, '330202')],
                          'header_multipart_ref_id': 51, 'header_multipart_nb_of_part': 2, 'header_multipart_current_part_nb': 2,
                          'sms': 'ENDSecond part here °=° !',
                          'sms_encoded': '0045004E0044005300650063006F006E00640020007000610072007400200068006500720065002000B0003D00B000200021'
                        }
                      ])
 
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0),[])
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'ERROR\r\n'}])
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0),[])
 
 
@@ -2474,22 +2921,18 @@ class TestGSMTC35(unittest.TestCase):
                                {'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 1,0,,35\r\n'},
                                {'OUT': b'NOT HEXA *snif*\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
 
     # PDU not valid
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'+CMGL: 1,0,,35\r\n'},
                                {'OUT': b'96456465A465A56BA46DFABABABAADAB96456465A465A56BA46DFABABABAADAB\r\n'},
-                               {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'}])
+                               {'OUT': b'OK\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
 
     # Basic error
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                {'OUT': b'ERROR\r\n'}])
     self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
 
@@ -2520,7 +2963,6 @@ class TestGSMTC35(unittest.TestCase):
                                {'OUT': b'+CMGL: 6,0,,75\r\n'},
                                {'OUT': b'07913396050036F6440B913306048216F1000891116010730440380500033302020045004E0044005300650063006F006E00640020007000610072007400200068006500720065002000B0003D00B000200021\r\n'},
                                {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
                                {'IN': b'AT+CMGD=1\r\n'}, {'OUT': b'OK\r\n'},
                                {'IN': b'AT+CMGD=3\r\n'}, {'OUT': b'OK\r\n'},
                                {'IN': b'AT+CMGD=4\r\n'}, {'OUT': b'OK\r\n'},
@@ -2530,8 +2972,7 @@ class TestGSMTC35(unittest.TestCase):
     self.assertTrue(gsm.deleteSMS())
 
     # Error while deleting sms will try to delete others
-    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGL=4\r\n'},
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'},
                                # 7 bit normal SMS
                                {'OUT': b'+CMGL: 1,0,,35\r\n'},
                                {'OUT': b'07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010\r\n'},
@@ -2549,7 +2990,6 @@ class TestGSMTC35(unittest.TestCase):
                                {'OUT': b'+CMGL: 6,0,,75\r\n'},
                                {'OUT': b'07913396050036F6440B913306048216F1000891116010730440380500033302020045004E0044005300650063006F006E00640020007000610072007400200068006500720065002000B0003D00B000200021\r\n'},
                                {'OUT': b'OK\r\n'},
-                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
                                {'IN': b'AT+CMGD=1\r\n'}, {'OUT': b'OK\r\n'},
                                {'IN': b'AT+CMGD=3\r\n'}, {'OUT': b'ERROR\r\n'},
                                {'IN': b'AT+CMGD=4\r\n'}, {'OUT': b'OK\r\n'},
@@ -2558,6 +2998,271 @@ class TestGSMTC35(unittest.TestCase):
                                {'IN': b'AT+CMGD=6\r\n'}, {'OUT': b'OK\r\n'}])
     self.assertFalse(gsm.deleteSMS())
 
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_sms_format(self):
+    logging.debug("test_all_sms_format")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    # SMS format is only changed when needed
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL="ALL"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL="ALL"\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+    self.assertEqual(gsm.getSMS(force_text_mode=True, waiting_time_sec=0), [])
+    self.assertEqual(gsm.getSMS(force_text_mode=True, waiting_time_sec=0), [])
+
+    # Failing to change SMS format keeps the previous one
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'ERROR\r\n'},
+                               {'IN': b'AT+CMGL="ALL"\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+
+    # SMS format must be set again after manufacturer state
+    MockSerial.initializeMock([{'IN': b'AT&F0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.setModuleToManufacturerState())
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+
+    # PDU session (text mode never used)
+    MockSerial.initializeMock([
+      {'IN': b'AT+IPR=0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'ATE0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'ATV1\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CMEE=0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CPIN?\r\n'}, {'OUT': b'+CPIN: READY\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CLIP=0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CNMI=0,0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT^SCTM=0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+      {'IN': b'AT+IPR=115200\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.setup(_port="COM_FAKE", _pdu_session=True))
+    MockSerial.initializeMock([{'IN': b'AT+CMGL=4\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getSMS(waiting_time_sec=0), [])
+    MockSerial.initializeMock([])
+    self.assertEqual(gsm.getSMS(force_text_mode=True, waiting_time_sec=0), [])
+    self.assertFalse(gsm.sendSMS(phone_number="+33601020304", msg="Text mode SMS", network_delay_sec=0, force_text_mode=True))
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_read_sms(self):
+    logging.debug("test_all_read_sms")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGR=1\r\n'}, {'OUT': b'+CMGR: 1,,35\r\n'},
+                               {'OUT': b'07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010\r\n'},
+                               {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.readSMS(1),
+                     {
+                       'index': 1, 'status': 'REC READ', 'service_center_type': 145, 'service_center_phone_number': '33695000646', 'phone_number_type': 145,
+                       'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:34:03 GMT+1.0', 'charset': '7bit',
+                       'sms': 'Basic 7 bits SMS !',
+                       'sms_encoded': '42617369632037206269747320534D532021'
+                     })
+
+    # 7 bit SMS with 7 bytes header (no fill bits)
+    MockSerial.initializeMock([{'IN': b'AT+CMGR=4\r\n'}, {'OUT': b'+CMGR: 1,,50\r\n'},
+                               {'OUT': b'07913396050066F6440B913306048216F10000911160104330402206080412340201D0B09C0EBAA7E96850CCD612A7E92079D95C9697DDE332\r\n'},
+                               {'OUT': b'OK\r\n'}])
+    sms = gsm.readSMS(4)
+    self.assertEqual(sms['sms'], 'Part with 16-bit reference')
+    self.assertEqual((sms['header_elements'], sms['header_multipart_ref_id'], sms['header_multipart_nb_of_part'], sms['header_multipart_current_part_nb']),
+                     ([(8, '12340201')], 0x1234, 2, 1))
+
+    # No SMS at this index
+    MockSerial.initializeMock([{'IN': b'AT+CMGR=2\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.readSMS(2), {})
+
+    # Invalid SMS
+    MockSerial.initializeMock([{'IN': b'AT+CMGR=3\r\n'}, {'OUT': b'+CMGR: 1,,35\r\n'}, {'OUT': b'INVALID\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.readSMS(3), {})
+
+    # PDU mode not available
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'ERROR\r\n'}])
+    self.assertEqual(gsm.readSMS(1), {})
+
+    self.assertEqual(gsm.readSMS("INVALID"), {})
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_get_new_sms(self):
+    logging.debug("test_all_get_new_sms")
+    gsm = GSMTC35.GSMTC35()
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+
+    MockSerial.initializeMock([{'IN': b'AT+CNMI=1,1\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.enableNewSmsIndication())
+
+    # No new SMS
+    MockSerial.initializeMock([])
+    self.assertEqual(list(gsm.getNewSMS()), [])
+
+    # New SMS indication received during a command then while waiting new SMS
+    MockSerial.initializeMock([{'IN': b'AT\r\n'}, {'OUT': b'+CMTI: "SM",1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGR=1\r\n'}, {'OUT': b'+CMGR: 0,,35\r\n'},
+                               {'OUT': b'07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010\r\n'},
+                               {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGD=1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'OUT': b'+CMTI: "SM",2\r\n', 'wait_ms': 100},
+                               {'IN': b'AT+CMGR=2\r\n'}, {'OUT': b'+CMGR: 0,,63\r\n'},
+                               {'OUT': b'07913396050046F4040B913306048216F10008911160104345402C004200610073006900630020005500430053003200200053004D0053002000210020007C00B0002E00B0007C\r\n'},
+                               {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGD=2\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.isAlive())
+    new_sms = gsm.getNewSMS(waiting_time_sec=1, delete_sms=True)
+    self.assertEqual(next(new_sms)["sms"], "Basic 7 bits SMS !")
+    start_time = time.time()
+    self.assertEqual(next(new_sms)["sms"], "Basic UCS2 SMS ! |°.°|")
+    self.assertLess(time.time() - start_time, 0.5)
+
+    # New SMS directly sent by the GSM module (PDU mode and text mode)
+    MockSerial.initializeMock([{'IN': b'AT+CNMI=1,2\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.enableNewSmsIndication(direct_delivery=True))
+    MockSerial.initializeMock([{'OUT': b'+CMT: ,35\r\n07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010\r\n'},
+                               {'OUT': b'+CMT: "Alice",35\r\n07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010\r\n'},
+                               {'OUT': b'+CMT: ,35\r\nINVALID\r\n'}])
+    pdu_sms = {
+      'index': -1, 'status': 'REC UNREAD', 'service_center_type': 145, 'service_center_phone_number': '33695000646', 'phone_number_type': 145,
+      'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:34:03 GMT+1.0', 'charset': '7bit',
+      'sms': 'Basic 7 bits SMS !',
+      'sms_encoded': '42617369632037206269747320534D532021'
+    }
+    self.assertEqual(list(gsm.getNewSMS(waiting_time_sec=0.2)), [pdu_sms, pdu_sms])
+
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=1\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGL="ALL"\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertEqual(gsm.getSMS(force_text_mode=True, waiting_time_sec=0), [])
+    MockSerial.initializeMock([{'OUT': b'+CMT: "+33601020304",,"19/11/09,10:10:10+04"\r\nText mode SMS\r\n'}])
+    self.assertEqual(list(gsm.getNewSMS(waiting_time_sec=0.2)),
+                     [
+                       {
+                         'index': -1, 'status': 'REC UNREAD', 'phone_number': '+33601020304', 'date': '19/11/09', 'time': '10:10:10+04',
+                         'sms': 'Text mode SMS', 'charset': 'TC35TextModeInconsistentCharset'
+                       }
+                     ])
+
+    MockSerial.initializeMock([{'IN': b'AT+CNMI=0,0\r\n'}, {'OUT': b'OK\r\n'}])
+    self.assertTrue(gsm.disableNewSmsIndication())
+    MockSerial.initializeMock([{'OUT': b'+CMTI: "SM",3\r\n'}])
+    self.assertEqual(list(gsm.getNewSMS()), [])
+
+    MockSerial.initializeMock([{'IN': b'AT+CNMI=1,1\r\n'}, {'OUT': b'ERROR\r\n'}])
+    self.assertFalse(gsm.enableNewSmsIndication())
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_async_gsm(self):
+    logging.debug("test_all_async_gsm")
+    gsm = AsyncGSMTC35.AsyncGSMTC35()
+    self.assertEqual(AsyncGSMTC35.AsyncGSMTC35.eSMS.ALL_SMS, GSMTC35.GSMTC35.eSMS.ALL_SMS)
+    self.assertEqual(gsm.eCall, GSMTC35.GSMTC35.eCall)
+    with self.assertRaises(AttributeError):
+      gsm._GSMTC35__sendLine
+
+    async def useGsm():
+      MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+      self.assertTrue(await gsm.setup(_port="COM_FAKE"))
+      self.assertTrue(gsm.getSynchronousInstance().isInitialized())
+
+      # Event loop is not blocked while waiting for the GSM module
+      # (a blocked event loop would only get back control once the answer is received)
+      MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n', 'wait_ms': 1500}, {'OUT': b'OK\r\n'},
+                                 {'IN': b'AT\r\n'}, {'OUT': b'OK\r\n'}])
+      imei_task = asyncio.ensure_future(gsm.getIMEI())
+      await asyncio.sleep(0.01)
+      self.assertFalse(imei_task.done())
+      self.assertEqual(str(await imei_task), "FAKE_IMEI")
+      self.assertTrue(await gsm.isAlive())
+
+      # Functions are executed in order of call
+      MockSerial.initializeMock([{'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'},
+                                 {'IN': b'AT+CGMM\r\n'}, {'OUT': b'FAKE_MODEL\r\n'}, {'OUT': b'OK\r\n'}])
+      self.assertEqual(await asyncio.gather(gsm.getManufacturerId(), gsm.getModelId()),
+                       ["FAKE_MANUFACTURER", "FAKE_MODEL"])
+
+      # Generators are read by the worker thread (not by the event loop)
+      handler_threads = []
+      def handler(urc_type, line, data):
+        handler_threads.append(threading.current_thread())
+      self.assertTrue(await gsm.addUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, handler))
+      self.assertFalse(gsm.startUnsolicitedResultListener())
+      MockSerial.initializeMock([{'OUT': b'RING\r\n'}])
+      self.assertEqual(await gsm.getNewSMS(), [])
+      self.assertEqual(len(handler_threads), 1)
+      self.assertNotEqual(handler_threads[0], threading.current_thread())
+
+    asyncio.run(useGsm())
+    gsm.shutdown()
+
+  @patch('serial.Serial', new=MockSerial)
+  def test_all_priority_gsm(self):
+    logging.debug("test_all_priority_gsm")
+    gsm = PriorityGSMTC35.PriorityGSMTC35()
+    self.assertEqual(PriorityGSMTC35.PriorityGSMTC35.eSMS.ALL_SMS, GSMTC35.GSMTC35.eSMS.ALL_SMS)
+    self.assertEqual(PriorityGSMTC35.PriorityGSMTC35.ePriorityToString(PriorityGSMTC35.PriorityGSMTC35.ePriority.HIGH), "HIGH")
+    with self.assertRaises(AttributeError):
+      gsm._GSMTC35__sendLine
+
+    MockSerial.initializeMock(MockSerial.getDefaultConfigForSetup())
+    self.assertTrue(gsm.setup(_port="COM_FAKE"))
+    self.assertTrue(gsm.getSynchronousInstance().isInitialized())
+
+    # Hang up is executed before other functions waiting to be executed
+    MockSerial.initializeMock([{'IN': b'AT+CGSN\r\n'}, {'OUT': b'FAKE_IMEI\r\n', 'wait_ms': 300}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CHUP\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CGMI\r\n'}, {'OUT': b'FAKE_MANUFACTURER\r\n'}, {'OUT': b'OK\r\n'}])
+    imei = gsm.submit(PriorityGSMTC35.PriorityGSMTC35.ePriority.NORMAL, gsm.getSynchronousInstance().getIMEI)
+    time.sleep(0.1)
+    manufacturer = gsm.submit(PriorityGSMTC35.PriorityGSMTC35.ePriority.LOW, gsm.getSynchronousInstance().getManufacturerId)
+    self.assertEqual(gsm.getNbOfPendingFunctions(), 1)
+    self.assertTrue(gsm.hangUpCall())
+    self.assertEqual(str(imei.result()), "FAKE_IMEI")
+    self.assertEqual(manufacturer.result(), "FAKE_MANUFACTURER")
+
+    # SMS are sent by the worker (send queue of GSMTC35 can't be used)
+    self.assertFalse(gsm.startSmsSendQueue())
+    MockSerial.initializeMock([{'IN': b'AT+CMGF=0\r\n'}, {'OUT': b'OK\r\n'},
+                               {'IN': b'AT+CMGS=34\r\n'}, {'OUT': b'\r\n'}, {'OUT': b'>'},
+                               {'IN': b'^0001[0-9A-F]{2}0B913306010203F4000017C2F03C3D06DD40E2341D346D4E41657CB80D679701\x1a$', 'mode': 'regex'},
+                               {'OUT': b'+CMGS: 5\r\n'}, {'OUT': b'OK\r\n'}])
+    future = gsm.queueSMS(phone_number="+33601020304", msg="Basic 7 bit SMS example")
+    self.assertEqual(future.result(timeout=10), (True, [5]))
+
+    # Serial port is only used by the worker (generators are read by the worker, no other thread can be started)
+    self.assertFalse(gsm.startUnsolicitedResultListener())
+    handler_threads = []
+    def handler(urc_type, line, data):
+      handler_threads.append(threading.current_thread())
+    self.assertTrue(gsm.addUnsolicitedResultHandler(GSMTC35.GSMTC35.eUnsolicitedResult.RING, handler))
+    MockSerial.initializeMock([{'OUT': b'RING\r\n'}])
+    self.assertEqual(gsm.getNewSMS(), [])
+    self.assertEqual(len(handler_threads), 1)
+    self.assertNotEqual(handler_threads[0], threading.current_thread())
+
+    # Functions waiting to be executed are cancelled if the worker is stopped without waiting
+    MockSerial.initializeMock([{'IN': b'AT\r\n'}, {'OUT': b'OK\r\n', 'wait_ms': 300}])
+    is_alive = gsm.submit(PriorityGSMTC35.PriorityGSMTC35.ePriority.NORMAL, gsm.getSynchronousInstance().isAlive)
+    time.sleep(0.1)
+    model = gsm.submit(PriorityGSMTC35.PriorityGSMTC35.ePriority.NORMAL, gsm.getSynchronousInstance().getModelId)
+    gsm.shutdown(wait=False)
+    self.assertTrue(model.cancelled())
+    self.assertTrue(is_alive.result())
+    self.assertEqual(gsm.submit(PriorityGSMTC35.PriorityGSMTC35.ePriority.HIGH, gsm.getSynchronousInstance().isAlive), None)
+    with self.assertRaises(concurrent.futures.CancelledError):
+      gsm.isAlive()
+
 if __name__ == '__main__':
   logger = logging.getLogger()
   logger.setLevel(logging.DEBUG)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Automatic test of the pool of GSM modules of the GSMTC35 library (no serial port needed)
+"""
+
+import unittest
+from unittest.mock import patch
+from GSMTC35.GSMTC35 import GSMTC35
+from GSMTC35.ModemPool import ModemPool
+import concurrent.futures
+import logging
+import time
+
+class FakeGSMTC35:
+  """Simulate a GSM module (SMS are sent when {sendAllQueuedSms()} is called)"""
+  eSmsSendStatus = GSMTC35.eSmsSendStatus
+  all_instances = {}
+  failing_ports = []
+  unknown_result_ports = []
+  weak_signal_ports = []
+  on_health_check = None
+
+  def __init__(self):
+    self.port = ""
+    self.queued_sms = []
+    self.sent_sms = []
+    self.closed = False
+
+  def setup(self, _port, **kwargs):
+    self.port = _port
+    FakeGSMTC35.all_instances[_port] = self
+    return _port != "not_connected"
+
+  def startSmsSendQueue(self, **kwargs):
+    return True
+
+  def queueSMS(self, phone_number, msg, force_text_mode=False, get_status=False):
+    future = concurrent.futures.Future()
+    self.queued_sms.append((future, phone_number, msg))
+    return future
+
+  def sendAllQueuedSms(self):
+    all_sms = self.queued_sms
+    self.queued_sms = []
+    for future, phone_number, msg in all_sms:
+      future.set_running_or_notify_cancel()
+      if self.port in FakeGSMTC35.failing_ports:
+        future.set_result((GSMTC35.eSmsSendStatus.NOT_SENT, []))
+      elif self.port in FakeGSMTC35.unknown_result_ports:
+        self.sent_sms.append((phone_number, msg))
+        future.set_result((GSMTC35.eSmsSendStatus.UNKNOWN, []))
+      else:
+        self.sent_sms.append((phone_number, msg))
+        future.set_result((GSMTC35.eSmsSendStatus.SENT, [len(self.sent_sms)]))
+
+  def isAlive(self):
+    if FakeGSMTC35.on_health_check is not None:
+      FakeGSMTC35.on_health_check(self)
+    return self.port not in FakeGSMTC35.failing_ports
+
+  def getSignalStrength(self):
+    return -111 if self.port in FakeGSMTC35.weak_signal_ports else -71
+
+  def close(self):
+    for future, phone_number, msg in self.queued_sms:
+      future.cancel()
+    self.closed = True
+
+class TestModemPool(unittest.TestCase):
+  """Test pool of GSM modules"""
+  def setUp(self):
+    FakeGSMTC35.all_instances = {}
+    FakeGSMTC35.failing_ports = []
+    FakeGSMTC35.unknown_result_ports = []
+    FakeGSMTC35.weak_signal_ports = []
+    FakeGSMTC35.on_health_check = None
+
+  @patch('GSMTC35.ModemPool.GSMTC35', new=FakeGSMTC35)
+  def test_load_balancing(self):
+    logging.debug("test_load_balancing")
+    pool = ModemPool()
+    self.assertEqual(pool.setup(["COM1", "not_connected", "COM2"]), 2)
+    modem_1 = FakeGSMTC35.all_instances["COM1"]
+    modem_2 = FakeGSMTC35.all_instances["COM2"]
+
+    # Health checker is started by default
+    self.assertFalse(pool.startHealthChecker())
+
+    # SMS are distributed to the GSM module having the least SMS waiting
+    all_futures = [pool.queueSMS("+33601020304", "SMS "+str(i)) for i in range(3)]
+    self.assertEqual([len(modem_1.queued_sms), len(modem_2.queued_sms)], [2, 1])
+    modem_1.sendAllQueuedSms()
+    all_futures.append(pool.queueSMS("+33601020304", "SMS 3"))
+    self.assertEqual([len(modem_1.queued_sms), len(modem_2.queued_sms)], [1, 1])
+    self.assertEqual(pool.getModemsStatus(), [
+      {"port": "COM1", "healthy": True, "outstanding": 1, "sent": 2, "failed": 0},
+      {"port": "COM2", "healthy": True, "outstanding": 1, "sent": 0, "failed": 0}])
+    modem_1.sendAllQueuedSms()
+    modem_2.sendAllQueuedSms()
+    self.assertEqual([future.result() for future in all_futures],
+                     [(True, [1]), (True, [1]), (True, [2]), (True, [3])])
+
+    pool.close()
+    self.assertTrue(modem_1.closed and modem_2.closed)
+    self.assertEqual(pool.queueSMS("+33601020304", "Not sent"), None)
+    self.assertFalse(pool.sendSMS("+33601020304", "Not sent"))
+
+  @patch('GSMTC35.ModemPool.GSMTC35', new=FakeGSMTC35)
+  def test_failing_modem(self):
+    logging.debug("test_failing_modem")
+    pool = ModemPool(min_signal_strength_dbm=-100, max_consecutive_failures=2, max_modem_attempts=2)
+    self.assertEqual(pool.setup(["COM1", "COM2"], health_check_period_sec=0), 2)
+    modem_1 = FakeGSMTC35.all_instances["COM1"]
+    modem_2 = FakeGSMTC35.all_instances["COM2"]
+
+    # SMS failing with one GSM module are sent by another one
+    FakeGSMTC35.failing_ports = ["COM1"]
+    all_futures = [pool.queueSMS("+33601020304", "SMS "+str(i)) for i in range(4)]
+    modem_1.sendAllQueuedSms()
+    self.assertEqual(pool.getNbOfHealthyModems(), 1)
+    self.assertEqual(len(modem_2.queued_sms), 4)
+    modem_2.sendAllQueuedSms()
+    self.assertEqual(sorted(modem_2.sent_sms), [("+33601020304", "SMS "+str(i)) for i in range(4)])
+    self.assertTrue(all(future.result()[0] for future in all_futures))
+
+    # Failing GSM module is not used anymore
+    future = pool.queueSMS("+33601020304", "SMS 4")
+    self.assertEqual(len(modem_1.queued_sms), 0)
+    modem_2.sendAllQueuedSms()
+    self.assertEqual(future.result(), (True, [5]))
+
+    # SMS fails if all GSM modules failed
+    FakeGSMTC35.failing_ports = ["COM1", "COM2"]
+    future = pool.queueSMS("+33601020304", "SMS 5")
+    modem_2.sendAllQueuedSms()
+    self.assertEqual(future.result(), (False, []))
+
+    # Health checks
+    self.assertEqual(pool.checkHealth(), 0)
+    FakeGSMTC35.failing_ports = []
+    FakeGSMTC35.weak_signal_ports = ["COM2"]
+    self.assertEqual(pool.checkHealth(), 1)
+    self.assertEqual([modem["healthy"] for modem in pool.getModemsStatus()], [True, False])
+    self.assertTrue(pool.startHealthChecker(period_sec=0.01))
+    self.assertFalse(pool.startHealthChecker())
+    self.assertTrue(pool.stopHealthChecker())
+    self.assertFalse(pool.stopHealthChecker())
+
+    # SMS queued to a GSM module being checked is queued once it is checked
+    all_futures = []
+    def queueSMSDuringCheck(gsm):
+      all_futures.append(pool.queueSMS("+33601020304", "Queued during check"))
+      self.assertEqual(len(gsm.queued_sms), 0)
+    FakeGSMTC35.on_health_check = queueSMSDuringCheck
+    self.assertEqual(pool.checkHealth(), 1)
+    FakeGSMTC35.on_health_check = None
+    self.assertEqual([len(modem_1.queued_sms), len(modem_2.queued_sms)], [2, 0])
+
+    # GSM module sending SMS is not checked
+    FakeGSMTC35.failing_ports = ["COM1"]
+    self.assertEqual(pool.checkHealth(), 1)
+    self.assertEqual([modem["healthy"] for modem in pool.getModemsStatus()], [True, False])
+    FakeGSMTC35.failing_ports = []
+    modem_1.sendAllQueuedSms()
+    self.assertTrue(all(future.result()[0] for future in all_futures))
+
+    # SMS which may have been sent is not sent by another GSM module
+    FakeGSMTC35.weak_signal_ports = []
+    self.assertEqual(pool.checkHealth(), 2)
+    FakeGSMTC35.unknown_result_ports = ["COM1"]
+    future = pool.queueSMS("+33601020304", "Unknown result")
+    modem_1.sendAllQueuedSms()
+    self.assertEqual(future.result(), (False, []))
+    self.assertEqual(len(modem_2.queued_sms), 0)
+    FakeGSMTC35.unknown_result_ports = []
+
+    # Health checker uses GSM modules again once they are healthy
+    FakeGSMTC35.weak_signal_ports = ["COM2"]
+    self.assertEqual(pool.checkHealth(), 1)
+    FakeGSMTC35.weak_signal_ports = []
+    self.assertTrue(pool.startHealthChecker(period_sec=0.01))
+    deadline = time.time() + 2
+    while pool.getNbOfHealthyModems() < 2 and time.time() < deadline:
+      time.sleep(0.01)
+    self.assertEqual(pool.getNbOfHealthyModems(), 2)
+
+    # SMS not sent yet are cancelled when pool is closed
+    future = pool.queueSMS("+33601020304", "SMS 6")
+    pool.close()
+    self.assertTrue(future.cancelled())
+
+if __name__ == '__main__':
+  logger = logging.getLogger()
+  logger.setLevel(logging.DEBUG)
+  unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Automatic test of the persistent SMS outbox of the GSMTC35 library (no serial port needed)
+"""
+
+import unittest
+from unittest.mock import patch
+from GSMTC35.GSMTC35 import GSMTC35
+from GSMTC35.SmsOutbox import SmsOutbox
+import logging
+import os
+import sqlite3
+import shutil
+import tempfile
+import time
+
+class FakeGSM:
+  """Simulate GSMTC35.sendSMSAndGetStatus() (refused or failing with unknown result for specific phone numbers)"""
+  def __init__(self, failing_phone_numbers=(), unknown_phone_numbers=()):
+    self.failing_phone_numbers = failing_phone_numbers
+    self.unknown_phone_numbers = unknown_phone_numbers
+    self.sent_sms = []
+
+  def sendSMSAndGetStatus(self, phone_number, msg, force_text_mode=False, network_delay_sec=5, min_part_interval_sec=0):
+    if phone_number in self.failing_phone_numbers:
+      return GSMTC35.eSmsSendStatus.NOT_SENT, []
+    self.sent_sms.append((phone_number, msg))
+    if phone_number in self.unknown_phone_numbers:
+      return GSMTC35.eSmsSendStatus.UNKNOWN, [len(self.sent_sms)]
+    return GSMTC35.eSmsSendStatus.SENT, [len(self.sent_sms)]
+
+class TestSmsOutbox(unittest.TestCase):
+  """Test persistent SMS outbox (SQLite database)"""
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.db_filename = os.path.join(self.directory, "outbox.db")
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_dispatch(self):
+    logging.debug("test_dispatch")
+    gsm = FakeGSM(failing_phone_numbers=("+33605060708",))
+    outbox = SmsOutbox(self.db_filename, gsm)
+
+    self.assertEqual(outbox.addSMS("+33601020304", "First"), (True, 1))
+    self.assertEqual(outbox.addSMS("", "Invalid"), (False, -1))
+    self.assertEqual(outbox.addManySMS([("+33601020304", "Second"), ("+33605060708", "Failing"), ("+33601020304", "Third")]), (True, 3))
+    self.assertEqual(outbox.addManySMS([("+33601020304", "Not added"), ("+33601020304", "")]), (False, 0))
+    self.assertEqual(outbox.getNbOfSMS(), 4)
+
+    # Oldest SMS are sent first, failing SMS is sent again later (60 seconds then 120 seconds later)
+    now = int(time.time())
+    with patch('time.time', return_value=now):
+      self.assertEqual(outbox.dispatch(batch_size=3, max_attempts=3, retry_delay_sec=60), 3)
+    self.assertEqual(gsm.sent_sms, [("+33601020304", "First"), ("+33601020304", "Second")])
+    self.assertEqual(outbox.getNbOfSMS(SmsOutbox.eStatus.SENT), 2)
+    sms = outbox.getSMS(2)
+    self.assertEqual((sms["status"], sms["attempts"], sms["message_references"]), (SmsOutbox.eStatus.SENT, 1, [2]))
+    sms = outbox.getSMS(3)
+    self.assertEqual((sms["status"], sms["attempts"], sms["message_references"], sms["next_attempt_timestamp"]),
+                     (SmsOutbox.eStatus.PENDING, 1, [], now + 60))
+
+    with patch('time.time', return_value=now + 59):
+      self.assertEqual(outbox.dispatch(batch_size=3, max_attempts=3, retry_delay_sec=60), 1)
+    self.assertEqual(gsm.sent_sms[-1], ("+33601020304", "Third"))
+    with patch('time.time', return_value=now + 60):
+      self.assertEqual(outbox.dispatch(batch_size=3, max_attempts=3, retry_delay_sec=60), 1)
+    self.assertEqual(outbox.getSMS(3)["next_attempt_timestamp"], now + 180)
+    with patch('time.time', return_value=now + 179):
+      self.assertEqual(outbox.dispatch(batch_size=3, max_attempts=3, retry_delay_sec=60), 0)
+    with patch('time.time', return_value=now + 180):
+      self.assertEqual(outbox.dispatch(batch_size=3, max_attempts=3, retry_delay_sec=60), 1)
+    self.assertEqual(outbox.getSMS(3)["attempts"], 3)
+    self.assertEqual(outbox.getSMS(3)["status"], SmsOutbox.eStatus.FAILED)
+    self.assertEqual(SmsOutbox.eStatusToString(outbox.getSMS(3)["status"]), "FAILED")
+    self.assertEqual(outbox.dispatch(), 0)
+    self.assertEqual(outbox.getSMS(10), {})
+
+    # SMS which may have been (partly) sent is not sent again
+    gsm.unknown_phone_numbers = ("+33609080706",)
+    self.assertEqual(outbox.addSMS("+33609080706", "Multipart SMS with unknown result"), (True, 5))
+    self.assertEqual(outbox.dispatch(max_attempts=3, retry_delay_sec=0), 1)
+    sms = outbox.getSMS(5)
+    self.assertEqual((sms["status"], sms["attempts"], sms["message_references"]), (SmsOutbox.eStatus.FAILED, 1, [4]))
+    self.assertEqual(outbox.dispatch(max_attempts=3, retry_delay_sec=0), 0)
+    self.assertEqual(gsm.sent_sms[-1], ("+33609080706", "Multipart SMS with unknown result"))
+    outbox.close()
+
+    # Nothing can be sent without GSM module
+    outbox = SmsOutbox(self.db_filename)
+    outbox.addSMS("+33601020304", "Not sent")
+    self.assertEqual(outbox.dispatch(), 0)
+    self.assertEqual(outbox.getNbOfSMS(), 1)
+    outbox.close()
+
+  def test_resume_after_stop(self):
+    logging.debug("test_resume_after_stop")
+    outbox = SmsOutbox(self.db_filename)
+    outbox.addManySMS([("+33601020304", "SMS "+str(i)) for i in range(5)])
+
+    # Simulate a process stopped while SMS were claimed
+    with_claimed_sms = SmsOutbox(self.db_filename)
+    with_claimed_sms._SmsOutbox__claimSMS(2)
+    self.assertEqual(outbox.getNbOfSMS(SmsOutbox.eStatus.SENDING), 2)
+    with_claimed_sms.close()
+    outbox.close()
+
+    gsm = FakeGSM()
+    outbox = SmsOutbox(self.db_filename, gsm)
+    self.assertEqual(outbox.getNbOfSMS(SmsOutbox.eStatus.PENDING), 5)
+    self.assertEqual(outbox.getNbOfSMS(SmsOutbox.eStatus.SENDING), 0)
+
+    # Background dispatcher
+    self.assertTrue(outbox.startDispatcher(period_sec=0.05, batch_size=2))
+    self.assertTrue(outbox.startDispatcher())
+    outbox.addSMS("+33601020304", "SMS 5")
+    deadline = time.time() + 10
+    while outbox.getNbOfSMS(SmsOutbox.eStatus.SENT) < 6 and time.time() < deadline:
+      time.sleep(0.01)
+    self.assertTrue(outbox.stopDispatcher())
+    self.assertFalse(outbox.stopDispatcher())
+    self.assertEqual(gsm.sent_sms, [("+33601020304", "SMS "+str(i)) for i in range(6)])
+    outbox.close()
+
+  def test_outbox_without_retry_delay(self):
+    logging.debug("test_outbox_without_retry_delay")
+    # Outbox created before retry delays were added
+    conn = sqlite3.connect(self.db_filename)
+    conn.execute("""CREATE TABLE outbox (
+                      id                  INTEGER       PRIMARY KEY AUTOINCREMENT NOT NULL,
+                      phone_number        VARCHAR(30)   NOT NULL,
+                      content             TEXT          NOT NULL,
+                      status              INTEGER       NOT NULL DEFAULT 0,
+                      attempts            INTEGER       NOT NULL DEFAULT 0,
+                      message_references  TEXT,
+                      created_timestamp   INTEGER       NOT NULL,
+                      updated_timestamp   INTEGER       NOT NULL
+                    )""")
+    conn.execute("INSERT INTO outbox (phone_number, content, created_timestamp, updated_timestamp) VALUES ('+33601020304', 'Old', 0, 0)")
+    conn.commit()
+    conn.close()
+
+    gsm = FakeGSM()
+    outbox = SmsOutbox(self.db_filename, gsm)
+    self.assertEqual(outbox.getSMS(1)["next_attempt_timestamp"], 0)
+    self.assertEqual(outbox.dispatch(), 1)
+    self.assertEqual(gsm.sent_sms, [("+33601020304", "Old")])
+    outbox.close()
+
+if __name__ == '__main__':
+  logger = logging.getLogger()
+  logger.setLevel(logging.DEBUG)
+  unittest.main()
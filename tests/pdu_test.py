@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+  Automatic test of the PDU codec of the GSMTC35 library (no serial port needed)
+"""
+
+import unittest
+from GSMTC35 import pdu
+import logging
+
+class TestPdu(unittest.TestCase):
+  """Test PDU codec (GSM 03.38 alphabet, septets and SMS decoding)"""
+
+  def test_gsm0338(self):
+    logging.debug("test_gsm0338")
+    self.assertTrue(pdu.isGsm0338Compatible("Basic 7 bit sms with extended table €[]"))
+    self.assertFalse(pdu.isGsm0338Compatible(u"Not 7 bit 你好"))
+    self.assertFalse(pdu.isGsm0338Compatible("Filler of the extended table `"))
+
+    self.assertEqual(pdu.encodeGsm0338("@A€"), b"\x00\x41\x1b\x65")
+    self.assertEqual(pdu.encodeGsm0338(u"Ignored 你"), pdu.encodeGsm0338("Ignored "))
+    self.assertEqual(pdu.decodeGsm0338(b"\x00\x41\x1b\x65"), "@A€")
+    self.assertEqual(pdu.decodeGsm0338(b"\x41\x1b"), "A")
+
+    text = "Hello {world} [with] ~extended^ |characters| \\ €"
+    self.assertEqual(pdu.decodeGsm0338(pdu.encodeGsm0338(text)), text)
+
+  def test_septets(self):
+    logging.debug("test_septets")
+    # 8 septets in 7 bytes
+    self.assertEqual(pdu.packSeptets(b"\x7F\x00\x7F\x00\x7F\x00\x7F\x00"), bytearray(b"\x08\x7F\xC0\x1F\xF0\x07\xFC\x01"))
+    self.assertEqual(pdu.unpackSeptets(b"\x7F\xC0\x1F\xF0\x07\xFC\x01"), bytearray(b"\x7F\x00\x7F\x00\x7F\x00\x7F\x00"))
+
+    septets = pdu.encodeGsm0338("Hello world !")
+    packed = pdu.packSeptets(septets)
+    self.assertEqual(packed[0], len(septets))
+    self.assertEqual(pdu.unpackSeptets(packed[1:])[:len(septets)], bytearray(septets))
+
+    # 6 bytes header: 1 fill bit (7 septets)
+    header = b"\x05\x00\x03\x01\x02\x01"
+    packed = pdu.packSeptets(septets, header)
+    self.assertEqual(packed[0], 7 + len(septets))
+    self.assertEqual(bytes(packed[1:7]), header)
+    self.assertEqual(pdu.unpackSeptets(packed[1:])[7:7+len(septets)], bytearray(septets))
+
+    # 7 bytes header: no fill bit (8 septets)
+    header = b"\x06\x08\x04\x12\x34\x02\x01"
+    packed = pdu.packSeptets(septets, header)
+    self.assertEqual(packed[0], 8 + len(septets))
+    self.assertEqual(pdu.unpackSeptets(packed[1:])[8:8+len(septets)], bytearray(septets))
+
+  def test_user_data_header(self):
+    logging.debug("test_user_data_header")
+    # Multiple information elements
+    header = pdu.encodeUserDataHeader([pdu.encodeConcatenationElement(0x1234, 3, 2), (0x24, b"\x01")])
+    self.assertEqual(header, b"\x09\x08\x04\x12\x34\x03\x02\x24\x01\x01")
+    self.assertEqual(pdu.decodeUserDataHeader(header), [(8, b"\x12\x34\x03\x02"), (0x24, b"\x01")])
+    self.assertEqual(pdu.decodeConcatenationElement(pdu.decodeUserDataHeader(header)), (0x1234, 3, 2))
+
+    # 8 bit reference (after an other information element)
+    header = pdu.encodeUserDataHeader([(0x24, b"\x01"), pdu.encodeConcatenationElement(0x1234, 3, 2, use_16bit_ref=False)])
+    self.assertEqual(header, b"\x08\x24\x01\x01\x00\x03\x34\x03\x02")
+    self.assertEqual(pdu.decodeConcatenationElement(pdu.decodeUserDataHeader(header)), (0x34, 3, 2))
+
+    # Not multipart, empty and truncated header
+    self.assertEqual(pdu.decodeConcatenationElement(pdu.decodeUserDataHeader(b"\x03\x24\x01\x01")), None)
+    self.assertEqual(pdu.decodeUserDataHeader(b""), [])
+    self.assertEqual(pdu.decodeUserDataHeader(b"\x00"), [])
+    self.assertEqual(pdu.decodeUserDataHeader(b"\x08\x24\x01\x01\x08\x04\x12"), [(0x24, b"\x01")])
+
+    # References are allocated one after the other (whatever the phone number)
+    counter = pdu.MultipartReferenceCounter()
+    first_ref_id = counter.getNextReference()
+    self.assertEqual(counter.getNextReference(), (first_ref_id + 1) & 0xFFFF)
+    self.assertEqual(counter.getNextReference(), (first_ref_id + 2) & 0xFFFF)
+    counter = pdu.MultipartReferenceCounter(use_16bit_ref=False)
+    self.assertTrue(all(0 <= counter.getNextReference() <= 0xFF for _ in range(300)))
+
+  def test_decode_sms(self):
+    logging.debug("test_decode_sms")
+    # 7 bit SMS
+    sms = pdu.decodeSms("07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010")
+    self.assertTrue(sms.isValid())
+    self.assertEqual(sms.phone_number, "+33604028611")
+    self.assertEqual(sms.sms, "Basic 7 bits SMS !")
+    self.assertEqual(sms.header_iei, None)
+    self.assertEqual(sms.toDict(),
+                     {
+                       'service_center_type': 145, 'service_center_phone_number': '33695000646', 'phone_number_type': 145,
+                       'phone_number': '+33604028611', 'date': '19/11/06', 'time': '01:34:03 GMT+1.0', 'charset': '7bit',
+                       'sms': 'Basic 7 bits SMS !',
+                       'sms_encoded': '42617369632037206269747320534D532021'
+                     })
+
+    # Multipart 7 bit SMS (with header)
+    sms = pdu.decodeSms("07913396050036F8440B913306048216F10000911160106323401E0500033202025C2E97ABE8244ECBE3B79B0C8287E57410BA2C2F03")
+    self.assertTrue(sms.isValid())
+    self.assertEqual(sms.sms, "....ENDSecond part here")
+    self.assertEqual((sms.header_multipart_ref_id, sms.header_multipart_nb_of_part, sms.header_multipart_current_part_nb), (50, 2, 2))
+
+    # Multipart UCS2 SMS (with header)
+    sms = pdu.decodeSms("07913396050036F6440B913306048216F1000891116010730440380500033302020045004E0044005300650063006F006E00640020007000610072007400200068006500720065002000B0003D00B000200021")
+    self.assertTrue(sms.isValid())
+    self.assertEqual(sms.charset, "utf16-be")
+    self.assertEqual(sms.sms, u"ENDSecond part here °=° !")
+    self.assertEqual(sms.header_ie_data, "330202")
+    self.assertEqual(sms.header_elements, [(0, "330202")])
+
+    # Multipart 7 bit SMS with 16 bit reference (no fill bits)
+    other_sms = pdu.decodeSms("07913396050066F6440B913306048216F10000911160104330402206080412340201D0B09C0EBAA7E96850CCD612A7E92079D95C9697DDE332")
+    self.assertEqual(other_sms.sms, "Part with 16-bit reference")
+    self.assertEqual((other_sms.header_iei, other_sms.header_elements), (8, [(8, "12340201")]))
+    self.assertEqual((other_sms.header_multipart_ref_id, other_sms.header_multipart_nb_of_part, other_sms.header_multipart_current_part_nb),
+                     (0x1234, 2, 1))
+
+    # Same SMS are equal
+    self.assertEqual(pdu.decodeSms("07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010"),
+                     pdu.decodeSms("07913396050046f6040b913306048216f100009111601043304012c2f03c3d06dd40e2347d0e9a36a7a010"))
+    self.assertNotEqual(sms, pdu.SmsRecord())
+
+    # Record from dictionary (with GSM module fields)
+    sms_data = sms.toDict()
+    sms_data.update({'index': 3, 'status': 'REC READ', 'unknown_field': 1})
+    record = pdu.SmsRecord.fromDict(sms_data)
+    self.assertEqual((record.index, record.status, record.sms), (3, 'REC READ', u"ENDSecond part here °=° !"))
+    del sms_data['unknown_field']
+    self.assertEqual(record.toDict(), sms_data)
+
+  def test_decode_invalid_sms(self):
+    logging.debug("test_decode_invalid_sms")
+    # Not hexadecimal
+    sms = pdu.decodeSms("NOT_HEXA")
+    self.assertFalse(sms.isValid())
+    self.assertEqual(sms.toDict(), {})
+
+    # Incomplete
+    sms = pdu.decodeSms("07913396050046F6040B913306048216F1000091116010")
+    self.assertFalse(sms.isValid())
+    self.assertEqual(sms, pdu.SmsRecord())
+
+    # Unknown charset
+    invalid_charset_sms = "07913396050046F6040B913306048216F1002C9111601043304012C2F03C3D06DD40E2347D0E9A36A7A010"
+    self.assertFalse(pdu.decodeSms(invalid_charset_sms).isValid())
+    sms = pdu.decodeSms(invalid_charset_sms, decode_sms=False)
+    self.assertTrue(sms.isValid())
+    self.assertEqual(sms.charset, "unknown")
+    self.assertEqual(sms.sms, "")
+    self.assertEqual(sms.sms_encoded, "C2F03C3D06DD40E2347D0E9A36A7A010")
+
+  def test_decode_sms_list(self):
+    logging.debug("test_decode_sms_list")
+    pdus = ["07913396050046F6040B913306048216F100009111601043304012C2F03C3D06DD40E2347D0E9A36A7A010",
+            "NOT_HEXA",
+            "07913396050036F8440B913306048216F10000911160106323401E0500033202025C2E97ABE8244ECBE3B79B0C8287E57410BA2C2F03",
+            "07913396050036F6440B913306048216F1000891116010730440380500033302020045004E0044005300650063006F006E00640020007000610072007400200068006500720065002000B0003D00B000200021"] * 5
+    expected_sms = [pdu.decodeSms(encoded_sms) for encoded_sms in pdus]
+
+    self.assertEqual(pdu.decodeSmsList(pdus), expected_sms)
+    self.assertEqual(pdu.decodeSmsList(iter(pdus), processes=2, chunk_size=3), expected_sms)
+    self.assertEqual(pdu.decodeSmsList(pdus, processes=None), expected_sms)
+    self.assertEqual(pdu.decodeSmsList([], processes=2), [])
+
+  def test_multipart_sms_buffer(self):
+    logging.debug("test_multipart_sms_buffer")
+    def part(phone_number, ref_id, nb_of_part, current_part, content):
+      return {'phone_number': phone_number, 'header_multipart_ref_id': ref_id, 'header_multipart_nb_of_part': nb_of_part,
+              'header_multipart_current_part_nb': current_part, 'sms': content, 'sms_encoded': content.encode().hex()}
+
+    mms_buffer = pdu.MultipartSmsBuffer()
+    single_sms = {'phone_number': '+33601020304', 'sms': 'Single'}
+    self.assertEqual(mms_buffer.addSms([single_sms, part('+33601020304', 1, 3, 2, 'B'), part('+33601020304', 1, 3, 1, 'A'),
+                                        part('+33605060708', 1, 3, 3, 'Other phone')]),
+                     [single_sms])
+    self.assertEqual(mms_buffer.getNbOfPendingParts(), 3)
+    self.assertTrue(mms_buffer.isPendingSms(part('+33601020304', 1, 3, 2, 'B')))
+    self.assertFalse(mms_buffer.isPendingSms(part('+33601020304', 1, 3, 3, 'C')))
+    self.assertFalse(mms_buffer.isPendingSms(single_sms))
+
+    # Parts already in the buffer can be added again
+    self.assertEqual(mms_buffer.addSms([part('+33601020304', 1, 3, 2, 'B')]), [])
+    self.assertEqual(mms_buffer.getNbOfPendingParts(), 3)
+
+    # Missing part received later (with other SMS of the same reference but different number of parts)
+    self.assertEqual(mms_buffer.addSms([part('+33601020304', 1, 2, 1, 'Other MMS'), part('+33601020304', 1, 3, 3, 'C')]),
+                     [{'phone_number': '+33601020304', 'header_multipart_ref_id': 1, 'header_multipart_nb_of_part': 3,
+                       'sms': 'ABC', 'sms_encoded': '414243'}])
+    self.assertEqual(mms_buffer.getNbOfPendingParts(), 2)
+    self.assertEqual(mms_buffer.popExpiredSms(), [])
+
+    # SMS records (decoded from PDU)
+    last_part = pdu.decodeSms("07913396050036F8440B913306048216F10000911160106323401E0500033202025C2E97ABE8244ECBE3B79B0C8287E57410BA2C2F03")
+    first_part = pdu.SmsRecord.fromDict(last_part.toDict())
+    first_part.header_multipart_current_part_nb = 1
+    first_part.sms = "First part"
+    first_part.sms_encoded = "4669727374"
+    self.assertEqual(mms_buffer.addSms([last_part]), [])
+    merged_sms = mms_buffer.addSms([first_part])
+    self.assertEqual(len(merged_sms), 1)
+    self.assertTrue(isinstance(merged_sms[0], pdu.SmsRecord))
+    self.assertEqual(merged_sms[0].sms, "First part....ENDSecond part here")
+    self.assertEqual(merged_sms[0].header_multipart_current_part_nb, None)
+    self.assertEqual(last_part.sms, "....ENDSecond part here")
+
+    # Incomplete SMS after timeout
+    mms_buffer = pdu.MultipartSmsBuffer(timeout_sec=0)
+    self.assertEqual(mms_buffer.addSms([part('+33601020304', 2, 3, 3, 'C'), part('+33601020304', 2, 3, 1, 'A')]), [])
+    self.assertEqual(mms_buffer.popExpiredSms(),
+                     [{'phone_number': '+33601020304', 'header_multipart_ref_id': 2, 'header_multipart_nb_of_part': 3,
+                       'sms': 'AC', 'sms_encoded': '4143'}])
+    self.assertEqual(mms_buffer.getNbOfPendingParts(), 0)
+    self.assertEqual(mms_buffer.popExpiredSms(), [])
+
+if __name__ == '__main__':
+  logger = logging.getLogger()
+  logger.setLevel(logging.DEBUG)
+  unittest.main()